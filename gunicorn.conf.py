@@ -0,0 +1,27 @@
+# Konfigurasi gunicorn: `gunicorn -c gunicorn.conf.py run:app`
+#
+# preload_app memuat aplikasi (impor, template, mapper) sekali di master lalu
+# fork ke worker, sehingga halaman memori itu dibagi copy-on-write.
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+preload_app = True
+
+
+def when_ready(server):
+    # Pindahkan objek yang sudah ada ke generasi permanen agar GC di worker
+    # tidak menyentuh (dan menyalin) halaman memori milik master.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Koneksi DB tidak boleh dibagi antar proses: buang pool warisan master
+    from nemukerja.extensions import db
+
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,25 @@
+"""Add composite index for the company applications inbox
+
+Revision ID: a1f3c9d2b7e4
+Revises: 4c82fad6a67d
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1f3c9d2b7e4'
+down_revision = '4c82fad6a67d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_index('ix_applications_job_status_applied', ['id_job', 'status', 'applied_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_job_status_applied')
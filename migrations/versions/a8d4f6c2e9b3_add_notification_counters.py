@@ -0,0 +1,34 @@
+"""Add per-user unread notification counters
+
+Revision ID: a8d4f6c2e9b3
+Revises: f2c6a8e4b1d7
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d4f6c2e9b3'
+down_revision = 'f2c6a8e4b1d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_counters',
+    sa.Column('id_user', sa.Integer(), nullable=False),
+    sa.Column('unread', sa.Integer(), nullable=False, server_default=sa.text('0')),
+    sa.PrimaryKeyConstraint('id_user')
+    )
+
+    # Isi awal dari notifikasi yang sudah ada; selanjutnya dijaga aplikasi (notify.py)
+    op.execute(
+        "INSERT INTO notification_counters (id_user, unread) "
+        "SELECT id_user, COUNT(*) FROM notifications WHERE COALESCE(is_read, 0) = 0 GROUP BY id_user"
+    )
+
+
+def downgrade():
+    op.drop_table('notification_counters')
@@ -0,0 +1,30 @@
+"""Add CV preview columns to applicants
+
+Revision ID: b5e1c9d7f3a2
+Revises: a8d4f6c2e9b3
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e1c9d7f3a2'
+down_revision = 'a8d4f6c2e9b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('applicants', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cv_preview_text', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('cv_preview_thumb', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.add_column(sa.Column('cv_preview_at', sa.TIMESTAMP(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('applicants', schema=None) as batch_op:
+        batch_op.drop_column('cv_preview_at')
+        batch_op.drop_column('cv_preview_thumb')
+        batch_op.drop_column('cv_preview_text')
@@ -0,0 +1,29 @@
+"""Add responded_at to applications
+
+Revision ID: b7d2e4f8c1a9
+Revises: a1f3c9d2b7e4
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e4f8c1a9'
+down_revision = 'a1f3c9d2b7e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('responded_at', sa.TIMESTAMP(), nullable=True))
+
+    # Lamaran lama yang sudah diputuskan: updated_at adalah perkiraan terbaik waktu respons
+    op.execute("UPDATE applications SET responded_at = updated_at WHERE status <> 'Pending'")
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_column('responded_at')
@@ -0,0 +1,67 @@
+"""Add daily rollup tables, closed_at and timestamp indexes for rollups
+
+Revision ID: c3e8a5b1d6f2
+Revises: b7d2e4f8c1a9
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a5b1d6f2'
+down_revision = 'b7d2e4f8c1a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('dimension_key', sa.String(length=255), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('metric', 'dimension', 'dimension_key', 'day', name='uq_daily_rollups_series_day')
+    )
+    op.create_table('rollup_watermarks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('closed_at', sa.TIMESTAMP(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_job_listings_closed_at'), ['closed_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_job_listings_posted_at'), ['posted_at'], unique=False)
+
+    # Lowongan yang sudah tertutup: updated_at adalah perkiraan terbaik waktu penutupan
+    op.execute("UPDATE job_listings SET closed_at = updated_at WHERE is_open = 0")
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_applications_applied_at'), ['applied_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_applications_responded_at'), ['responded_at'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_created_at'))
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_applications_responded_at'))
+        batch_op.drop_index(batch_op.f('ix_applications_applied_at'))
+
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_job_listings_posted_at'))
+        batch_op.drop_index(batch_op.f('ix_job_listings_closed_at'))
+        batch_op.drop_column('closed_at')
+
+    op.drop_table('rollup_watermarks')
+    op.drop_table('daily_rollups')
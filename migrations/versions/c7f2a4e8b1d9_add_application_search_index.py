@@ -0,0 +1,34 @@
+"""Add application_search full-text index (FTS5 / MySQL FULLTEXT)
+
+Revision ID: c7f2a4e8b1d9
+Revises: b5e1c9d7f3a2
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f2a4e8b1d9'
+down_revision = 'b5e1c9d7f3a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Isi indeks dengan `flask application-search-rebuild` (token diberi awalan perusahaan di aplikasi)
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE application_search USING fts5(body, tokenize='unicode61 remove_diacritics 2')")
+    elif dialect == 'mysql':
+        op.execute(
+            'CREATE TABLE application_search ('
+            'id_application INT NOT NULL PRIMARY KEY, '
+            'body MEDIUMTEXT NOT NULL, '
+            'FULLTEXT KEY ft_application_search_body (body)'
+            ') ENGINE=InnoDB DEFAULT CHARSET=utf8mb4'
+        )
+
+
+def downgrade():
+    op.execute('DROP TABLE IF EXISTS application_search')
@@ -0,0 +1,59 @@
+"""Add normalized locations, aliases and job_listings.id_location
+
+Revision ID: d5a9c7e3f2b8
+Revises: c3e8a5b1d6f2
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9c7e3f2b8'
+down_revision = 'c3e8a5b1d6f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('locations',
+    sa.Column('id_location', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('kind', sa.Enum('province', 'city', 'remote'), nullable=False),
+    sa.Column('id_parent', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['id_parent'], ['locations.id_location'], ),
+    sa.PrimaryKeyConstraint('id_location')
+    )
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_locations_id_parent'), ['id_parent'], unique=False)
+
+    op.create_table('location_aliases',
+    sa.Column('alias', sa.String(length=100), nullable=False),
+    sa.Column('id_location', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_location'], ['locations.id_location'], ),
+    sa.PrimaryKeyConstraint('alias')
+    )
+    with op.batch_alter_table('location_aliases', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_location_aliases_id_location'), ['id_location'], unique=False)
+
+    # Data lokasi diisi dan dipetakan dengan `flask locations-backfill`
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('id_location', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_job_listings_id_location'), ['id_location'], unique=False)
+        batch_op.create_foreign_key('fk_job_listings_id_location', 'locations', ['id_location'], ['id_location'])
+
+
+def downgrade():
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_job_listings_id_location', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_job_listings_id_location'))
+        batch_op.drop_column('id_location')
+
+    with op.batch_alter_table('location_aliases', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_location_aliases_id_location'))
+    op.drop_table('location_aliases')
+
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_locations_id_parent'))
+    op.drop_table('locations')
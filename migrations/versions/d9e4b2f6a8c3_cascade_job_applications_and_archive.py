@@ -0,0 +1,45 @@
+"""ON DELETE CASCADE for applications.id_job and job_listings.archived_at
+
+Revision ID: d9e4b2f6a8c3
+Revises: c7f2a4e8b1d9
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e4b2f6a8c3'
+down_revision = 'c7f2a4e8b1d9'
+branch_labels = None
+depends_on = None
+
+# FK di SQLite tidak bernama; batch mode memberinya nama lewat naming convention ini
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _job_fk_name():
+    # MySQL menamai FK tanpa nama dari 9e522d39eb64 sesuai urutan pembuatan: id_job = applications_ibfk_2
+    if op.get_bind().dialect.name == 'mysql':
+        return 'applications_ibfk_2'
+    return 'fk_applications_id_job_job_listings'
+
+
+def _recreate_job_fk(ondelete):
+    name = _job_fk_name()
+    with op.batch_alter_table('applications', schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, 'job_listings', ['id_job'], ['id_job'], ondelete=ondelete)
+
+
+def upgrade():
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('archived_at', sa.TIMESTAMP(), nullable=True))
+    _recreate_job_fk('CASCADE')
+
+
+def downgrade():
+    _recreate_job_fk(None)
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.drop_column('archived_at')
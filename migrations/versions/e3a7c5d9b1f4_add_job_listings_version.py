@@ -0,0 +1,26 @@
+"""Add job_listings.version for fragment cache keys
+
+Revision ID: e3a7c5d9b1f4
+Revises: d9e4b2f6a8c3
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a7c5d9b1f4'
+down_revision = 'd9e4b2f6a8c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.drop_column('version')
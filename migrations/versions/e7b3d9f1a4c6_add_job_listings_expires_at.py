@@ -0,0 +1,28 @@
+"""Add job_listings.expires_at for the lifecycle sweeper
+
+Revision ID: e7b3d9f1a4c6
+Revises: d5a9c7e3f2b8
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3d9f1a4c6'
+down_revision = 'd5a9c7e3f2b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('expires_at', sa.TIMESTAMP(), nullable=True))
+        batch_op.create_index('ix_job_listings_open_expires', ['is_open', 'expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_listings_open_expires')
+        batch_op.drop_column('expires_at')
@@ -0,0 +1,39 @@
+"""Add append-only activity_events log for admin recent activity
+
+Revision ID: f2c6a8e4b1d7
+Revises: e7b3d9f1a4c6
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a8e4b1d7'
+down_revision = 'e7b3d9f1a4c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('activity_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False),
+    sa.Column('id_user', sa.Integer(), nullable=True),
+    sa.Column('related_id', sa.Integer(), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('activity_events', schema=None) as batch_op:
+        batch_op.create_index('ix_activity_events_type_id', ['type', 'id'], unique=False)
+
+    # Riwayat lama diisi dengan `flask activity-backfill`
+
+
+def downgrade():
+    with op.batch_alter_table('activity_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_activity_events_type_id')
+
+    op.drop_table('activity_events')
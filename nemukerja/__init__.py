@@ -1,3 +1,10 @@
-from .app import create_app
-
 __all__ = ['create_app']
+
+
+def __getattr__(name):
+    # Impor malas: `import nemukerja.loadtest` / `nemukerja.profiling` tidak
+    # perlu ikut memuat seluruh aplikasi.
+    if name == 'create_app':
+        from .app import create_app
+        return create_app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
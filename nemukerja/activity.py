@@ -0,0 +1,57 @@
+"""Log aktivitas append-only untuk halaman admin.
+
+Jalur tulis (registrasi, tambah lowongan, melamar, perubahan status lamaran)
+menambahkan event di transaksi yang sama dengan perubahan datanya. Admin
+membaca dengan satu query `ORDER BY id DESC LIMIT n` (opsional per tipe,
+lewat indeks (type, id)); scroll-back memakai cursor `before=<id>`, jadi
+biaya halaman tetap sama berapa pun panjang riwayatnya.
+"""
+from sqlalchemy import insert, select
+
+from nemukerja.models import ActivityEvent
+
+ACTIVITY_TYPES = ('user', 'company', 'job', 'application', 'status')
+ACTIVITY_PAGE_SIZE = 20
+MAX_ACTIVITY_PAGE_SIZE = 100
+
+
+def record_activity(session, type, description, id_user=None, related_id=None):
+    """Tambahkan satu event; commit mengikuti transaksi pemanggil."""
+    session.add(ActivityEvent(type=type, description=description[:255],
+                              id_user=id_user, related_id=related_id))
+
+
+def record_activities(session, events):
+    """Versi batch (satu INSERT executemany) untuk aksi massal."""
+    events = [{**event, 'description': event['description'][:255]} for event in events]
+    if events:
+        session.execute(insert(ActivityEvent), events)
+    return len(events)
+
+
+def registration_activity(user, name):
+    role_type = 'company' if user.role == 'company' else 'user'
+    return role_type, f"{name} ({user.role.capitalize()}) registered."
+
+
+def parse_activity_args(args):
+    types = [value for value in args.getlist('type') if value in ACTIVITY_TYPES]
+    limit = args.get('limit', ACTIVITY_PAGE_SIZE, type=int)
+    return {
+        'types': types,
+        'before': args.get('before', type=int),
+        'limit': min(max(limit, 1), MAX_ACTIVITY_PAGE_SIZE),
+    }
+
+
+def activity_page(session, types=(), before=None, limit=ACTIVITY_PAGE_SIZE):
+    """Event terbaru (id menurun): (events, cursor_berikutnya atau None)."""
+    query = select(ActivityEvent)
+    if types:
+        query = query.where(ActivityEvent.type.in_(types))
+    if before is not None:
+        query = query.where(ActivityEvent.id < before)
+    events = session.scalars(query.order_by(ActivityEvent.id.desc()).limit(limit + 1)).all()
+    has_more = len(events) > limit
+    events = events[:limit]
+    return events, (events[-1].id if has_more else None)
@@ -0,0 +1,271 @@
+"""Pencarian full-text lamaran (cover letter + skills pelamar) untuk inbox perusahaan.
+
+Indeks `application_search` berisi satu baris per lamaran: FTS5 di SQLite,
+tabel InnoDB dengan indeks FULLTEXT di MySQL. Setiap kata disimpan dengan
+awalan perusahaan (`c<id_company>x<kata>`), jadi posting list sebuah kata
+hanya berisi lamaran ke lowongan satu perusahaan: biaya MATCH tumbuh dengan
+data perusahaan itu, bukan seluruh tabel. Efek samping yang berguna: kata
+pendek ("go", "r", "c") tetap terindeks walau ft_min_token_size MySQL = 3.
+
+Sintaks query (dinormalisasi sama seperti teks yang diindeks):
+    python sql          keduanya harus ada
+    python OR golang    salah satu
+    -php                tanpa kata ini
+    "data analyst"      frasa
+    analy*              awalan kata
+
+Indeks dijaga listener after_flush di transaksi yang sama dengan perubahan
+(Application baru/notes berubah/dihapus, Applicant.skills berubah). Lamaran
+yang terhapus lewat ON DELETE CASCADE saat JobListing dihapus dicatat di
+before_flush, selagi barisnya masih ada. Bila tabel
+indeks belum ada atau database lain, pencarian jatuh ke LIKE yang tetap
+dibatasi ke lamaran perusahaan. `flask application-search-rebuild` membuat
+tabel (bila perlu) dan mengisi ulang seluruh indeks.
+"""
+import logging
+import re
+import unicodedata
+import weakref
+
+from sqlalchemy import Integer, and_, bindparam, column, event, func, inspect, or_, select, text
+
+from nemukerja.models import Applicant, Application, JobListing
+from nemukerja.routing import RoutingSession
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'application_search'
+MAX_QUERY_TERMS = 16
+# innodb_ft_max_token_size = 84; kata yang lebih panjang dipotong di indeks dan query
+MAX_WORD_LENGTH = 60
+REINDEX_BATCH = 500
+# flush_context.attributes: id lamaran yang akan terhapus oleh cascade database
+CASCADE_DELETED_KEY = 'application_search_cascade_deleted'
+
+_WORD_RE = re.compile(r'[^\W_]+')
+_QUERY_TOKEN_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+# dialek -> SQL; kunci baris = id lamaran (rowid untuk FTS5)
+DIALECT_SQL = {
+    'sqlite': {
+        'create': (f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                   f"USING fts5(body, tokenize='unicode61 remove_diacritics 2')",),
+        'key': 'rowid',
+        'match': f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query',
+    },
+    'mysql': {
+        'create': (f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+                   'id_application INT NOT NULL PRIMARY KEY, '
+                   'body MEDIUMTEXT NOT NULL, '
+                   f'FULLTEXT KEY ft_{SEARCH_TABLE}_body (body)'
+                   ') ENGINE=InnoDB DEFAULT CHARSET=utf8mb4',),
+        'key': 'id_application',
+        'match': f'SELECT id_application FROM {SEARCH_TABLE} WHERE MATCH(body) AGAINST (:query IN BOOLEAN MODE)',
+    },
+}
+
+# Engine -> apakah tabel indeks ada (dicek sekali per engine)
+_index_ready = weakref.WeakKeyDictionary()
+
+
+def normalize_words(value):
+    """Huruf kecil, tanpa diakritik, dipecah di karakter non-alfanumerik."""
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch)).lower()
+    return [word[:MAX_WORD_LENGTH] for word in _WORD_RE.findall(value)]
+
+
+def company_token(company_id, word=''):
+    return f'c{company_id}x{word}'
+
+
+def index_body(company_id, notes, skills):
+    words = normalize_words(notes) + normalize_words(skills)
+    # Token penanda tanpa kata: "semua lamaran perusahaan", untuk query yang hanya berisi -kata
+    return ' '.join([company_token(company_id)] + [company_token(company_id, word) for word in words])
+
+
+def parse_search_query(query):
+    """Query pengguna -> (grup wajib [[atom, ...], ...], atom terlarang [...]).
+
+    Atom = (kata-kata, prefix). Kata-kata dalam satu atom adalah frasa; atom
+    dalam satu grup digabung OR.
+    """
+    required, excluded = [], []
+    join_next = False
+    for negate, phrase, bare in _QUERY_TOKEN_RE.findall(query or ''):
+        if bare == 'OR':
+            join_next = bool(required)
+            continue
+        if bare.startswith('-') and len(bare) > 1:
+            negate, bare = '-', bare[1:]
+        raw = phrase if phrase or not bare else bare
+        prefix = not phrase and raw.endswith('*')
+        words = normalize_words(raw)
+        if not words:
+            join_next = False
+            continue
+        atom = (tuple(words), prefix)
+        if negate:
+            excluded.append(atom)
+        elif join_next:
+            required[-1].append(atom)
+        else:
+            required.append([atom])
+        join_next = False
+        if len(required) + len(excluded) >= MAX_QUERY_TERMS:
+            break
+    return required, excluded
+
+
+def _fts5_atom(company_id, atom):
+    words, prefix = atom
+    phrase = ' '.join(company_token(company_id, word) for word in words)
+    return f'"{phrase}"' + ('*' if prefix else '')
+
+
+def _mysql_atom(company_id, atom):
+    words, prefix = atom
+    if len(words) > 1:
+        # Boolean mode MySQL tidak mendukung awalan di dalam frasa
+        return '"' + ' '.join(company_token(company_id, word) for word in words) + '"'
+    return company_token(company_id, words[0]) + ('*' if prefix else '')
+
+
+def build_match_query(dialect, company_id, required, excluded):
+    if dialect == 'sqlite':
+        groups = ['(' + ' OR '.join(_fts5_atom(company_id, atom) for atom in group) + ')' for group in required]
+        expression = ' AND '.join(groups) or f'"{company_token(company_id)}"'
+        for atom in excluded:
+            expression += ' NOT ' + _fts5_atom(company_id, atom)
+        return expression
+    parts = ['+(' + ' '.join(_mysql_atom(company_id, atom) for atom in group) + ')' for group in required]
+    if not parts:
+        parts.append('+' + company_token(company_id))
+    parts.extend('-' + _mysql_atom(company_id, atom) for atom in excluded)
+    return ' '.join(parts)
+
+
+def _dialect_sql(bind):
+    return DIALECT_SQL.get(bind.dialect.name)
+
+
+def search_index_ready(bind):
+    engine = getattr(bind, 'engine', bind)
+    if _dialect_sql(engine) is None:
+        return False
+    ready = _index_ready.get(engine)
+    if ready is None:
+        ready = _index_ready[engine] = inspect(engine).has_table(SEARCH_TABLE)
+        if not ready:
+            logger.warning('Tabel %s belum ada; pencarian lamaran memakai LIKE. '
+                           'Jalankan `flask db upgrade` atau `flask application-search-rebuild`.', SEARCH_TABLE)
+    return ready
+
+
+def application_search_filter(session, company_id, query):
+    """Kondisi WHERE untuk Application sesuai query; None bila query kosong.
+
+    Dipakai bersama company_inbox_query(), yang sudah membatasi ke lowongan
+    perusahaan; subquery MATCH di sini hanya membaca posting list perusahaan itu.
+    """
+    required, excluded = parse_search_query(query)
+    if not required and not excluded:
+        return None
+    bind = session.get_bind(mapper=Application.__mapper__)
+    if search_index_ready(bind):
+        sql = _dialect_sql(bind)
+        match = build_match_query(bind.dialect.name, company_id, required, excluded)
+        return Application.id.in_(text(sql['match']).bindparams(query=match).columns(column('id', Integer)))
+    return _like_filter(required, excluded)
+
+
+def _like_filter(required, excluded):
+    def atom_clause(atom):
+        pattern = '%' + '%'.join(atom[0]) + '%'
+        return or_(func.coalesce(Application.notes, '').ilike(pattern),
+                   Application.applicant.has(func.coalesce(Applicant.skills, '').ilike(pattern)))
+
+    clauses = [or_(*(atom_clause(atom) for atom in group)) for group in required]
+    clauses.extend(~atom_clause(atom) for atom in excluded)
+    return and_(*clauses)
+
+
+def reindex_applications(connection, application_ids=(), applicant_ids=(), deleted_ids=()):
+    """Tulis ulang baris indeks untuk lamaran tertentu (dan semua lamaran pelamar tertentu)."""
+    sql = _dialect_sql(connection)
+    if sql is None or not search_index_ready(connection):
+        return 0
+    application_ids, applicant_ids = set(application_ids), set(applicant_ids)
+    rows = []
+    if application_ids or applicant_ids:
+        rows = connection.execute(
+            select(Application.id.label('id'), Application.notes, Applicant.skills, JobListing.id_company)
+            .join(Applicant, Applicant.id == Application.id_applicant)
+            .join(JobListing, JobListing.id == Application.id_job)
+            .where(or_(Application.id.in_(application_ids), Application.id_applicant.in_(applicant_ids)))
+        ).all()
+    stale = set(deleted_ids) | application_ids | {row.id for row in rows}
+    if stale:
+        connection.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE {sql['key']} IN :ids")
+            .bindparams(bindparam('ids', expanding=True)),
+            {'ids': sorted(stale)},
+        )
+    if rows:
+        connection.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} ({sql['key']}, body) VALUES (:id, :body)"),
+            [{'id': row.id, 'body': index_body(row.id_company, row.notes, row.skills)} for row in rows],
+        )
+    return len(rows)
+
+
+def rebuild_search_index(connection):
+    """Buat tabel indeks bila belum ada lalu isi ulang dari semua lamaran."""
+    sql = _dialect_sql(connection)
+    if sql is None:
+        raise RuntimeError(f'Pencarian full-text lamaran tidak didukung untuk {connection.dialect.name}')
+    for statement in sql['create']:
+        connection.execute(text(statement))
+    _index_ready[connection.engine] = True
+    connection.execute(text(f'DELETE FROM {SEARCH_TABLE}'))
+    ids = connection.execute(select(Application.id).order_by(Application.id)).scalars().all()
+    total = 0
+    for start in range(0, len(ids), REINDEX_BATCH):
+        total += reindex_applications(connection, application_ids=ids[start:start + REINDEX_BATCH])
+    return total
+
+
+def _collect_cascade_deletes(session, flush_context, instances):
+    job_ids = [obj.id for obj in session.deleted if isinstance(obj, JobListing)]
+    if not job_ids or not search_index_ready(session.get_bind(mapper=Application.__mapper__)):
+        return
+    flush_context.attributes[CASCADE_DELETED_KEY] = session.connection().scalars(
+        select(Application.id).where(Application.id_job.in_(job_ids))
+    ).all()
+
+
+def _track_search_changes(session, flush_context):
+    application_ids, applicant_ids = set(), set()
+    deleted_ids = set(flush_context.attributes.get(CASCADE_DELETED_KEY, ()))
+    for obj in session.new:
+        if isinstance(obj, Application):
+            application_ids.add(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, Application) and inspect(obj).attrs.notes.history.has_changes():
+            application_ids.add(obj.id)
+        elif isinstance(obj, Applicant) and inspect(obj).attrs.skills.history.has_changes():
+            applicant_ids.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Application):
+            deleted_ids.add(obj.id)
+    if application_ids or applicant_ids or deleted_ids:
+        reindex_applications(session.connection(), application_ids, applicant_ids, deleted_ids)
+
+
+def init_application_search(app):
+    # Listener tingkat kelas session; didaftarkan sekali walau create_app() dipanggil berulang
+    for name, listener in (('before_flush', _collect_cascade_deletes),
+                           ('after_flush', _track_search_changes)):
+        if not event.contains(RoutingSession, name, listener):
+            event.listen(RoutingSession, name, listener)
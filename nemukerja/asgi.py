@@ -0,0 +1,268 @@
+"""Jalur async (ASGI) untuk endpoint baca yang paling sering dipanggil.
+
+Jalankan di samping aplikasi WSGI, contoh:
+
+    uvicorn nemukerja.asgi:app --port 8001
+
+lalu arahkan `/`, `/job/<id>`, `/notifications` dan `/api/get_job_id/<id>`
+(GET) ke proses ini di reverse proxy. Query memakai engine asyncio SQLAlchemy
+(aiomysql / aiosqlite) dengan model yang sama dari models.py; template,
+session cookie dan konfigurasi diambil dari aplikasi Flask yang sama.
+"""
+import asyncio
+import io
+import re
+import time
+from urllib.parse import quote
+
+from flask import g, jsonify, render_template, request, session
+from flask_login import AnonymousUserMixin
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import joinedload, selectinload
+
+from nemukerja.app import create_app
+from nemukerja.facets import build_facets, facet_statement, normalized_filter_key
+from nemukerja.locations import alias_lookup_statement, location_candidates, pick_alias
+from nemukerja.metrics import maybe_flush, record_request
+from nemukerja.models import Application, Company, JobListing, Notification, User
+from nemukerja.ratelimit import client_identity
+from nemukerja.search import JOBS_PER_PAGE, PrefetchedPagination, job_search_filters, parse_job_search_args
+
+# Driver sync -> driver async dengan dialek yang sama
+ASYNC_DRIVERS = {
+    'mysql+pymysql': 'mysql+aiomysql',
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+def async_database_uri(config):
+    if config.get('ASYNC_DATABASE_URL'):
+        return config['ASYNC_DATABASE_URL']
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    scheme, rest = uri.split('://', 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+def _environ_from_scope(scope):
+    # Environ WSGI minimal agar Flask bisa membaca args, cookie dan session
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        key = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[key] = value
+        else:
+            key = f'HTTP_{key}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class AsyncReadApp:
+    """Aplikasi ASGI kecil yang melayani endpoint baca panas secara async."""
+
+    def __init__(self, flask_app=None):
+        self.flask_app = flask_app or create_app()
+        config = self.flask_app.config
+        self.engine = create_async_engine(async_database_uri(config), **config['SQLALCHEMY_ENGINE_OPTIONS'])
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.routes = [
+            (re.compile(r'^/$'), self.index),
+            (re.compile(r'^/job/(?P<job_id>\d+)$'), self.job_detail),
+            (re.compile(r'^/notifications$'), self.get_notifications),
+            (re.compile(r'^/api/get_job_id/(?P<application_id>\d+)$'), self.get_job_id_from_application),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        for pattern, handler in self.routes:
+            match = pattern.match(scope['path'])
+            if match and scope['method'] in ('GET', 'HEAD'):
+                break
+        else:
+            await self._send(send, 404, [('Content-Type', 'application/json')], b'{"error": "Not found"}')
+            return
+
+        kwargs = {key: int(value) for key, value in match.groupdict().items()}
+        start = time.perf_counter()
+        with self.flask_app.request_context(_environ_from_scope(scope)):
+            g._metrics_queries = 0  # Diisi listener query metrics.py
+            async with self.sessionmaker() as db_session:
+                await self._load_user(db_session)
+                response = await handler(db_session, **kwargs)
+            body = response.get_data() if scope['method'] == 'GET' else b''
+            await self._send(send, response.status_code, response.headers.to_wsgi_list(), body)
+            if self.flask_app.config['METRICS_ENABLED']:
+                record_request(f'asgi.{handler.__name__}', scope['method'], response.status_code,
+                               time.perf_counter() - start, g.get('_metrics_queries'))
+                maybe_flush(self.flask_app)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _send(send, status, headers, body):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _load_user(self, db_session):
+        # Isi current_user Flask-Login dari session cookie tanpa query sync.
+        # Login lewat remember-cookie saja diperlakukan sebagai tamu di jalur ini.
+        user = None
+        user_id = session.get('_user_id')
+        if user_id is not None:
+            user = await db_session.scalar(
+                select(User)
+                .options(selectinload(User.applicant_profile), selectinload(User.company_profile))
+                .where(User.id == int(user_id))
+            )
+        g._login_user = user or AnonymousUserMixin()
+
+    @staticmethod
+    def _login_redirect():
+        response = jsonify({'error': 'Login required'})
+        response.status_code = 302
+        response.headers['Location'] = f"/login?next={quote(request.full_path.rstrip('?'))}"
+        return response
+
+    async def _rate_limited(self, policy, identity):
+        # Bucket yang sama dengan dekorator @rate_limit di jalur WSGI. check() memakai
+        # sqlite3 sinkron (busy timeout 1 detik): jalankan di thread agar tulisan yang
+        # sedang mengunci file tidak menghentikan seluruh event loop.
+        limiter = self.flask_app.extensions.get('rate_limiter')
+        if limiter is None:
+            return None
+        allowed, retry_after = await asyncio.to_thread(limiter.check, policy, identity)
+        if allowed:
+            return None
+        response = jsonify({'error': 'Too many requests'})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(retry_after)
+        return response
+
+    async def index(self, db_session):
+        params = parse_job_search_args(request.args)
+        page = max(request.args.get('page', 1, type=int), 1)
+        candidates = location_candidates(params['location'])
+        if candidates and not params['location_id']:
+            rows = (await db_session.execute(alias_lookup_statement(candidates))).all()
+            params['location_id'] = pick_alias(rows, candidates)
+        filters = job_search_filters(params)
+
+        # Facet dari satu query GROUP BY, berbagi cache dengan index() versi WSGI
+        facet_cache = self.flask_app.extensions['facet_cache']
+        facet_key = normalized_filter_key(params)
+        facets = facet_cache.get(facet_key)
+        if facets is None:
+            facets = build_facets((await db_session.execute(facet_statement(params))).all())
+            facet_cache.set(facet_key, facets)
+        # Total dari data terkini (seperti index() WSGI), bukan dari facet yang di-cache
+        total = await db_session.scalar(select(func.count(JobListing.id)).where(*filters))
+        jobs = (await db_session.scalars(
+            select(JobListing)
+            .options(joinedload(JobListing.company))
+            .where(*filters)
+            .order_by(JobListing.posted_at.desc(), JobListing.id.desc())
+            .limit(JOBS_PER_PAGE)
+            .offset((page - 1) * JOBS_PER_PAGE)
+        )).all()
+        companies = (await db_session.scalars(select(Company))).all()
+
+        pagination = PrefetchedPagination(page=page, per_page=JOBS_PER_PAGE, error_out=False,
+                                          items=jobs, total=total)
+        html = render_template('index.html', jobs=jobs, pagination=pagination, companies=companies,
+                               search_query=params['search'], facets=facets, guest=True)
+        return self.flask_app.make_response(html)
+
+    async def job_detail(self, db_session, job_id):
+        job = await db_session.scalar(
+            select(JobListing).options(joinedload(JobListing.company)).where(JobListing.id == job_id)
+        )
+        if job is None:
+            response = jsonify({'error': 'Not found'})
+            response.status_code = 404
+            return response
+
+        used_slots = await db_session.scalar(
+            select(func.count(Application.id))
+            .where(Application.id_job == job.id, Application.status.in_(['Pending', 'Diterima']))
+        )
+        return jsonify(job.to_dict(used_slots))
+
+    async def get_notifications(self, db_session):
+        user = g._login_user
+        if not user.is_authenticated:
+            return self._login_redirect()
+        limited = await self._rate_limited('notifications', client_identity(user))
+        if limited is not None:
+            return limited
+        notifications = (await db_session.scalars(
+            select(Notification)
+            .where(Notification.id_user == user.id)
+            .order_by(Notification.created_at.desc())
+            .limit(10)
+        )).all()
+        return jsonify([n.to_dict() for n in notifications])
+
+    async def get_job_id_from_application(self, db_session, application_id):
+        user = g._login_user
+        if not user.is_authenticated:
+            return self._login_redirect()
+
+        application = await db_session.scalar(
+            select(Application)
+            .options(joinedload(Application.job).joinedload(JobListing.company))
+            .where(Application.id == application_id)
+        )
+        if not application:
+            response = jsonify({'job_id': None})
+            response.status_code = 404
+            return response
+
+        # Aturan akses sama dengan versi WSGI di app.py
+        forbidden = (
+            (user.role == 'applicant' and application.id_applicant != user.applicant_profile.id)
+            or (user.role == 'company' and application.job.company.id_user != user.id)
+        )
+        if forbidden:
+            response = jsonify({'job_id': None})
+            response.status_code = 403
+            return response
+
+        return jsonify({'job_id': application.id_job})
+
+
+app = AsyncReadApp()
@@ -0,0 +1,122 @@
+import glob
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import abort, request, send_file, url_for
+
+try:
+    import brotli
+except ImportError:  # Brotli opsional; tanpa paket ini hanya varian .gz yang dibuat
+    brotli = None
+
+# File di folder static yang diberi fingerprint (pola glob relatif terhadap static/)
+ASSET_PATTERNS = ['style.css', 'script.js', 'images/*']
+# Tipe file yang layak dikompres; gambar PNG/JPG sudah terkompresi
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt'}
+BUILD_DIR = 'build'
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def build_assets(static_folder):
+    """Salin aset ke static/build/ dengan nama ber-hash + varian .gz/.br.
+
+    Mengembalikan manifest {nama logis: nama ber-hash} yang juga ditulis ke
+    static/build/manifest.json.
+    """
+    build_root = os.path.join(static_folder, BUILD_DIR)
+    if os.path.isdir(build_root):
+        shutil.rmtree(build_root)
+    os.makedirs(build_root)
+
+    manifest = {}
+    for pattern in ASSET_PATTERNS:
+        for source in sorted(glob.glob(os.path.join(static_folder, pattern))):
+            if not os.path.isfile(source):
+                continue
+            logical = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            stem, ext = os.path.splitext(logical)
+            fingerprinted = f'{stem}.{_file_hash(source)}{ext}'
+
+            target = os.path.join(build_root, fingerprinted)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+
+            if ext.lower() in COMPRESSIBLE_EXTENSIONS:
+                with open(source, 'rb') as f:
+                    data = f.read()
+                with open(target + '.gz', 'wb') as f:
+                    f.write(gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    with open(target + '.br', 'wb') as f:
+                        f.write(brotli.compress(data, quality=11))
+
+            manifest[logical] = fingerprinted
+
+    with open(os.path.join(build_root, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_folder):
+    path = os.path.join(static_folder, BUILD_DIR, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def init_assets(app):
+    """Daftarkan helper `asset_url` dan route /assets/<file> ber-cache immutable.
+
+    `asset_url` kompatibel dengan `url_for`: `asset_url('static', filename='style.css')`
+    menghasilkan URL ber-hash jika ada di manifest, selain itu sama dengan `url_for`.
+    """
+    manifest = load_manifest(app.static_folder) if app.config.get('ASSET_MANIFEST_ENABLED', True) else {}
+    app.extensions['asset_manifest'] = manifest
+    build_root = os.path.join(app.static_folder, BUILD_DIR)
+
+    def asset_url(endpoint, **values):
+        if endpoint == 'static':
+            fingerprinted = manifest.get(values.get('filename'))
+            if fingerprinted:
+                values['filename'] = fingerprinted
+                return url_for('serve_asset', **values)
+        return url_for(endpoint, **values)
+
+    app.add_template_global(asset_url)
+
+    @app.route('/assets/<path:filename>', endpoint='serve_asset')
+    def serve_asset(filename):
+        path = os.path.normpath(os.path.join(build_root, filename))
+        if not path.startswith(build_root + os.sep) or not os.path.isfile(path):
+            abort(404)
+
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        encoding = None
+        accepted = request.accept_encodings
+        for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[candidate] and os.path.isfile(path + suffix):
+                path, encoding = path + suffix, candidate
+                break
+
+        response = send_file(path, mimetype=mimetype, conditional=True, max_age=31536000)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        response.vary.add('Accept-Encoding')
+        return response
+
+    return manifest
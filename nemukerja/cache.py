@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+
+class LRUCache:
+    """Cache in-process dengan batas jumlah entri (Least Recently Used).
+
+    Aman dipakai dari beberapa thread. `ttl` (detik) opsional; entri yang
+    sudah kedaluwarsa dianggap tidak ada.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class FragmentCacheExtension(Extension):
+    """Tag Jinja `{% cache 'nama', key1, key2 %} ... {% endcache %}`.
+
+    Hasil render blok disimpan di LRUCache milik environment, dengan kunci
+    nama template + semua argumen. Masukkan identitas model dan penanda
+    perubahannya ke dalam kunci agar fragmen otomatis basi saat datanya
+    berubah, contoh: `{% cache 'jobcard', job.id, job.posted_at, job.version %}`.
+    Pakai penghitung versi bila ada: `updated_at` hanya beresolusi detik. Versi
+    mulai dari 0 untuk setiap baris baru dan SQLite bisa memakai ulang id baris
+    yang dihapus, jadi sertakan juga kolom yang tidak berubah per baris seperti
+    `posted_at` agar lowongan baru tidak mewarisi fragmen lowongan lama.
+    """
+
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=LRUCache(maxsize=2048), fragment_cache_enabled=True)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [nodes.Const(parser.name), parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_render_cached', [nodes.List(args)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _render_cached(self, key_parts, caller):
+        if not self.environment.fragment_cache_enabled:
+            return caller()
+        key = tuple(str(part) for part in key_parts)
+        rv = self.environment.fragment_cache.get(key)
+        if rv is None:
+            rv = caller()
+            self.environment.fragment_cache.set(key, rv)
+        return rv
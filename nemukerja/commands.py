@@ -0,0 +1,587 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import click
+from flask import render_template
+
+
+def register_commands(app):
+    """Daftarkan perintah CLI tambahan (`flask <perintah>`)."""
+
+    @app.cli.command('assets-build')
+    def assets_build():
+        """Buat aset static ber-fingerprint beserta varian gzip/brotli."""
+        from nemukerja.assets import brotli, build_assets
+
+        manifest = build_assets(app.static_folder)
+        for logical, fingerprinted in sorted(manifest.items()):
+            click.echo(f'{logical} -> {fingerprinted}')
+        if brotli is None:
+            click.echo('Paket Brotli tidak terpasang: hanya varian .gz yang dibuat.')
+        click.echo(f'{len(manifest)} aset ditulis ke static/build/. Restart aplikasi untuk memuat manifest.')
+
+    @app.cli.command('startup-profile')
+    def startup_profile():
+        """Laporkan waktu impor dan memori resident per komponen saat startup."""
+        result = subprocess.run([sys.executable, '-m', 'nemukerja.profiling'],
+                                capture_output=True, text=True, env=os.environ.copy(),
+                                cwd=os.path.dirname(app.root_path))
+        if result.returncode != 0:
+            raise click.ClickException(result.stderr.strip())
+        report = json.loads(result.stdout)
+
+        click.echo(f"{'component':<22} {'import ms':>10} {'rss +KB':>9}")
+        for row in report['rows']:
+            click.echo(f"{row['component']:<22} {row['ms']:>10.1f} {row['rss_kb']:>9}")
+        click.echo(f"{'total':<22} {sum(r['ms'] for r in report['rows']):>10.1f} {report['total_rss_kb']:>9}")
+
+    @app.cli.command('bench-render')
+    @click.option('--cards', default='9,50,500', help='Daftar jumlah kartu job, dipisah koma.')
+    @click.option('--repeat', default=20, help='Jumlah render per skenario.')
+    def bench_render(cards, repeat):
+        """Benchmark waktu render index.html dengan dan tanpa fragment cache."""
+        from nemukerja.models import Company, JobListing
+
+        env = app.jinja_env
+        pagination = SimpleNamespace(has_prev=False, has_next=False, page=1,
+                                     prev_num=None, next_num=None, iter_pages=lambda: [1])
+        company = Company(id=1, company_name='Bench Co', updated_at=datetime(2025, 1, 1))
+
+        def render(jobs):
+            with app.test_request_context('/'):
+                return render_template('index.html', jobs=jobs, pagination=pagination,
+                                       companies=[company], search_query='', guest=True)
+
+        def timed(jobs):
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                render(jobs)
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            return samples[len(samples) // 2] * 1000
+
+        click.echo(f"{'cards':>6} {'no cache (ms)':>14} {'cached (ms)':>12} {'speedup':>8}")
+        original = env.fragment_cache_enabled
+        try:
+            for n in [int(c) for c in cards.split(',') if c.strip()]:
+                jobs = [
+                    JobListing(id=i, id_company=1, company=company, title=f'Job {i}',
+                               description='Lorem ipsum dolor sit amet ' * 10,
+                               qualifications='Python, SQL', location='Jakarta',
+                               salary_min=5000000, salary_max=9000000, slots=3, is_open=True,
+                               posted_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1), version=1)
+                    for i in range(1, n + 1)
+                ]
+                env.fragment_cache_enabled = False
+                cold = timed(jobs)
+                env.fragment_cache_enabled = True
+                render(jobs)  # Isi cache terlebih dahulu
+                warm = timed(jobs)
+                click.echo(f'{n:>6} {cold:>14.2f} {warm:>12.2f} {cold / warm:>7.1f}x')
+        finally:
+            env.fragment_cache_enabled = original
+
+    @app.cli.command('rollup')
+    @click.option('--full', is_flag=True, help='Hitung ulang semua hari, abaikan watermark.')
+    def rollup(full):
+        """Perbarui tabel rollup harian untuk halaman tren admin."""
+        from nemukerja.rollup import run_rollup
+
+        start = time.perf_counter()
+        start_day, written, watermark = run_rollup(full=full)
+        click.echo(f"Mulai dari: {start_day or 'awal data'}; {written} baris rollup ditulis "
+                   f"dalam {(time.perf_counter() - start) * 1000:.0f} ms; watermark: {watermark or '-'}")
+
+    @app.cli.command('bench-facets')
+    @click.option('--jobs', default=1_000_000, help='Jumlah lowongan sintetis di database SQLite sementara.')
+    @click.option('--repeat', default=5, help='Jumlah pengulangan per skenario (median dilaporkan).')
+    def bench_facets(jobs, repeat):
+        """Bandingkan pencarian index() biasa (COUNT + halaman) dengan versi ber-facet."""
+        import random
+        import tempfile
+
+        from flask_sqlalchemy.pagination import SelectPagination
+        from sqlalchemy import create_engine, insert, select
+        from sqlalchemy.orm import Session, joinedload
+
+        from nemukerja.extensions import db
+        from nemukerja.facets import get_facets, normalized_filter_key
+        from nemukerja.models import Company, JobListing, Location, User
+        from nemukerja.search import JOBS_PER_PAGE, job_search_filters
+
+        cities = ['Jakarta Selatan', 'Jakarta Barat', 'Bandung', 'Surabaya', 'Medan', 'Semarang',
+                  'Yogyakarta', 'Denpasar', 'Makassar', 'Malang', 'Bogor', 'Remote']
+        words = ['Python', 'Java', 'Sales', 'Akuntansi', 'Marketing', 'Desain', 'Data', 'Admin']
+
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f'sqlite:///{tmp}/bench.db')
+            db.metadata.create_all(engine, tables=[User.__table__, Company.__table__, Location.__table__, JobListing.__table__])
+
+            click.echo(f'Mengisi {jobs} lowongan...')
+            rng = random.Random(42)
+            n_companies = max(jobs // 500, 1)
+            with engine.begin() as conn:
+                conn.execute(insert(User.__table__), [
+                    {'id_user': i, 'email': f'c{i}@bench', 'password': 'x', 'role': 'company'}
+                    for i in range(1, n_companies + 1)])
+                conn.execute(insert(Company.__table__), [
+                    {'id_company': i, 'id_user': i, 'company_name': f'Company {i}'}
+                    for i in range(1, n_companies + 1)])
+                for offset in range(0, jobs, 50_000):
+                    batch = []
+                    for i in range(offset, min(offset + 50_000, jobs)):
+                        salary = rng.randrange(1, 40) * 1_000_000
+                        word = rng.choice(words)
+                        batch.append({
+                            'id_company': rng.randint(1, n_companies), 'title': f'{word} Staff {i}',
+                            'description': 'Lorem ipsum', 'qualifications': f'{word}, komunikasi',
+                            'location': rng.choice(cities), 'salary_min': salary,
+                            'salary_max': salary + 2_000_000, 'slots': 1, 'is_open': rng.random() < 0.9,
+                        })
+                    conn.execute(insert(JobListing.__table__), batch)
+
+            scenarios = {
+                'tanpa filter': {'search': '', 'location': '', 'salary_min': None, 'company': ''},
+                'search=python': {'search': 'python', 'location': '', 'salary_min': None, 'company': ''},
+                'location=bandung': {'search': '', 'location': 'bandung', 'salary_min': None, 'company': ''},
+                'salary_min=10jt': {'search': '', 'location': '', 'salary_min': 10_000_000, 'company': ''},
+            }
+
+            def median_ms(*fns):
+                # Bergantian per putaran agar derau mesin (page cache, frekuensi CPU) kena semua varian
+                samples = [[] for _ in fns]
+                for _ in range(repeat):
+                    for fn, timings in zip(fns, samples):
+                        start = time.perf_counter()
+                        fn()
+                        timings.append(time.perf_counter() - start)
+                return [sorted(timings)[len(timings) // 2] * 1000 for timings in samples]
+
+            click.echo(f"{'skenario':<18} {'plain ms':>9} {'cold ms':>9} {'cold +%':>8} {'warm ms':>9} {'warm +%':>8}")
+            # Cache facet milik aplikasi (FACET_CACHE_*), sama dengan yang dipakai index()
+            cache = app.extensions['facet_cache']
+            with Session(engine) as session:
+                for name, params in scenarios.items():
+                    # Query yang sama dengan index(); paginate() = COUNT atas subquery + satu halaman
+                    statement = (select(JobListing).options(joinedload(JobListing.company))
+                                 .where(*job_search_filters(params))
+                                 .order_by(JobListing.posted_at.desc(), JobListing.id.desc()))
+
+                    def paginate():
+                        SelectPagination(select=statement, session=session, page=1, per_page=JOBS_PER_PAGE,
+                                         error_out=False, count=True)
+
+                    def plain():
+                        # index() tanpa facet: COUNT untuk pagination + satu halaman
+                        paginate()
+
+                    def cold():
+                        # index() saat cache facet miss: query facet GROUP BY + COUNT + halaman
+                        cache.delete(normalized_filter_key(params))
+                        get_facets(params, session)
+                        paginate()
+
+                    def warm():
+                        # index() saat cache facet hit: facet dari cache, COUNT + halaman tetap jalan
+                        get_facets(params, session)
+                        paginate()
+
+                    plain_ms, cold_ms, warm_ms = median_ms(plain, cold, warm)
+                    click.echo(f'{name:<18} {plain_ms:>9.1f} {cold_ms:>9.1f} {(cold_ms / plain_ms - 1) * 100:>7.0f}% '
+                               f'{warm_ms:>9.1f} {(warm_ms / plain_ms - 1) * 100:>7.0f}%')
+            engine.dispose()
+
+    @app.cli.command('locations-backfill')
+    def locations_backfill():
+        """Isi tabel locations dan petakan job_listings.location ke id_location."""
+        from nemukerja.extensions import db
+        from nemukerja.locations import backfill_job_locations, seed_locations
+
+        click.echo(f'{seed_locations(db.session)} alias lokasi baru ditambahkan.')
+        mapped, unmatched = backfill_job_locations(db.session)
+        click.echo(f'{mapped} lowongan dipetakan ke id_location.')
+        if unmatched:
+            click.echo('Teks lokasi yang belum dikenali (tambahkan alias di SEED_LOCATIONS):')
+            for text, count in sorted(unmatched, key=lambda item: -item[1]):
+                click.echo(f'  {count:>6}  {text}')
+
+    @app.cli.command('snapshot-report')
+    @click.option('--jobs', default=100_000, help='Jumlah lowongan sintetis di snapshot.')
+    @click.option('--repeat', default=20, help='Jumlah pengulangan per skenario (median dilaporkan).')
+    def snapshot_report(jobs, repeat):
+        """Laporkan memori snapshot lowongan per komponen dan waktu filter index() darinya."""
+        import random
+        from datetime import timedelta
+
+        from nemukerja.snapshot import JobSnapshot, _import_numpy
+
+        if _import_numpy() is None:
+            raise click.ClickException('NumPy tidak terpasang: snapshot lowongan tidak tersedia.')
+
+        words = ['Python', 'Java', 'Sales', 'Akuntansi', 'Marketing', 'Desain', 'Data', 'Admin']
+        rng = random.Random(42)
+        n_companies = max(jobs // 500, 1)
+        snapshot = JobSnapshot()
+        # 2 provinsi x 5 kota, id_location 1-12
+        snapshot.location_parent = {i: (None if i <= 2 else 1 + i % 2) for i in range(1, 13)}
+        snapshot.location_names = {i: f'Lokasi {i}' for i in range(1, 13)}
+        snapshot.company_names = {i: f'company {i}' for i in range(1, n_companies + 1)}
+
+        start = time.perf_counter()
+        posted = datetime(2025, 1, 1)
+        for i in range(1, jobs + 1):
+            word = rng.choice(words)
+            salary = rng.randrange(1, 40) * 1_000_000
+            snapshot.columns.append(i, posted + timedelta(minutes=i), salary, salary + 2_000_000,
+                                    rng.randint(1, n_companies), rng.randint(1, 12),
+                                    f'{word} Staff {i}', f'{word}, komunikasi', posted)
+        snapshot.refreshed_at = snapshot.full_refreshed_at = time.monotonic()
+        snapshot.max_age = float('inf')
+        click.echo(f'{jobs} lowongan dimuat dalam {(time.perf_counter() - start) * 1000:.0f} ms')
+
+        report, rows = snapshot.memory_report()
+        total = sum(report.values())
+        click.echo(f"{'komponen':<20} {'KB':>10} {'byte/lowongan':>14} {'MB per 100k':>12}")
+        for name, size in sorted(report.items(), key=lambda item: -item[1]):
+            click.echo(f'{name:<20} {size / 1024:>10.0f} {size / rows:>14.1f} {size / rows * 100_000 / 2**20:>12.2f}')
+        click.echo(f"{'total':<20} {total / 1024:>10.0f} {total / rows:>14.1f} {total / rows * 100_000 / 2**20:>12.2f}")
+
+        base = {'search': '', 'location': '', 'location_id': None, 'salary_min': None, 'company': ''}
+        scenarios = {
+            'tanpa filter': {},
+            'search=python': {'search': 'python'},
+            'location_id=1': {'location': 'x', 'location_id': 1},
+            'salary_min=10jt': {'salary_min': 10_000_000},
+            'company=company 1': {'company': 'company 1'},
+        }
+        click.echo(f"{'skenario':<20} {'total':>8} {'median ms':>10}")
+        for name, overrides in scenarios.items():
+            params = {**base, **overrides}
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                _, matched, _ = snapshot.search(params, page=1, per_page=9)
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            click.echo(f'{name:<20} {matched:>8} {samples[len(samples) // 2] * 1000:>10.2f}')
+
+    @app.cli.command('bench-ratelimit')
+    @click.option('--requests', 'n_requests', default=20_000, help='Jumlah cek per proses.')
+    @click.option('--processes', default=4, help='Jumlah proses paralel untuk skenario kontensi.')
+    @click.option('--keys', default=1000, help='Jumlah identitas (IP/user) berbeda.')
+    def bench_ratelimit(n_requests, processes, keys):
+        """Ukur overhead per permintaan rate limiter (mikrodetik), satu proses dan multi-proses."""
+        import multiprocessing
+        import tempfile
+
+        from nemukerja.ratelimit import RateLimiter
+
+        def run(path, seed, results):
+            limiter = RateLimiter(path, {'bench': '10/60'})
+            limiter.hit('bench', 'warmup')
+            start = time.perf_counter()
+            for i in range(n_requests):
+                limiter.hit('bench', f'ip:{(i * 7919 + seed) % keys}')
+            results.put((time.perf_counter() - start) / n_requests * 1e6)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'ratelimit.db')
+            ctx = multiprocessing.get_context('fork')
+            click.echo(f"{'proses':>7} {'us/cek (median proses)':>24} {'cek/detik total':>16}")
+            for n in sorted({1, processes}):
+                results = ctx.Queue()
+                workers = [ctx.Process(target=run, args=(path, seed, results)) for seed in range(n)]
+                for worker in workers:
+                    worker.start()
+                samples = sorted(results.get() for _ in workers)
+                for worker in workers:
+                    worker.join()
+                per_check = samples[len(samples) // 2]
+                click.echo(f'{n:>7} {per_check:>24.1f} {n * 1e6 / per_check:>16.0f}')
+
+    @app.cli.command('sweeper')
+    @click.option('--once', is_flag=True, help='Jalankan satu kali lalu keluar (untuk cron).')
+    @click.option('--interval', default=300, help='Jeda antar putaran dalam detik.')
+    @click.option('--batch-size', default=500, help='Jumlah lowongan per batch/commit.')
+    def sweeper(once, interval, batch_size):
+        """Tutup otomatis lowongan yang slotnya penuh atau sudah melewati expires_at."""
+        from sqlalchemy.exc import SQLAlchemyError
+
+        from nemukerja.extensions import db
+        from nemukerja.sweeper import run_sweep
+
+        while True:
+            start = time.perf_counter()
+            try:
+                closed = run_sweep(db.session, batch_size)
+            except SQLAlchemyError as exc:
+                db.session.rollback()
+                if once:
+                    raise click.ClickException(str(exc))
+                app.logger.exception('Sweeper gagal; dicoba lagi pada putaran berikutnya')
+            else:
+                click.echo(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] ditutup: {closed['expired']} kedaluwarsa, "
+                           f"{closed['full']} slot penuh ({(time.perf_counter() - start) * 1000:.0f} ms)")
+            finally:
+                db.session.remove()
+            if once:
+                return
+            time.sleep(interval)
+
+    @app.cli.command('activity-backfill')
+    def activity_backfill():
+        """Isi activity_events dari riwayat users, job_listings dan applications (hanya bila kosong)."""
+        from sqlalchemy import func, select
+
+        from nemukerja.activity import record_activities, registration_activity
+        from nemukerja.extensions import db
+        from nemukerja.models import ActivityEvent, Applicant, Application, Company, JobListing, User
+
+        if db.session.scalar(select(func.count(ActivityEvent.id))):
+            raise click.ClickException('activity_events sudah berisi data; backfill hanya untuk tabel kosong.')
+
+        events = []
+        users = db.session.execute(
+            select(User, Applicant.full_name, Company.company_name)
+            .outerjoin(Applicant, Applicant.id_user == User.id)
+            .outerjoin(Company, Company.id_user == User.id)
+        ).all()
+        for user, full_name, company_name in users:
+            activity_type, description = registration_activity(user, full_name or company_name or user.email)
+            events.append((user.created_at, activity_type, description, user.id, user.id))
+        for job_id, title, company_name, user_id, posted_at in db.session.execute(
+                select(JobListing.id, JobListing.title, Company.company_name, Company.id_user, JobListing.posted_at)
+                .join(Company, Company.id == JobListing.id_company)):
+            events.append((posted_at, 'job', f"New Job: '{title}' posted by {company_name}.", user_id, job_id))
+        for application_id, title, full_name, user_id, applied_at in db.session.execute(
+                select(Application.id, JobListing.title, Applicant.full_name, Applicant.id_user, Application.applied_at)
+                .join(JobListing, JobListing.id == Application.id_job)
+                .join(Applicant, Applicant.id == Application.id_applicant)):
+            events.append((applied_at, 'application', f"New Application for '{title}' by {full_name}.",
+                           user_id, application_id))
+
+        # Urut waktu agar id (urutan baca admin) mengikuti kronologi
+        events.sort(key=lambda event: (event[0] or datetime.min))
+        for offset in range(0, len(events), 1000):
+            record_activities(db.session, [
+                {'created_at': created_at or datetime.now(), 'type': activity_type, 'description': description,
+                 'id_user': user_id, 'related_id': related_id}
+                for created_at, activity_type, description, user_id, related_id in events[offset:offset + 1000]
+            ])
+        db.session.commit()
+        click.echo(f'{len(events)} event aktivitas ditulis.')
+
+    @app.cli.command('notifications-repair')
+    @click.option('--dry-run', is_flag=True, help='Hanya laporkan penghitung yang menyimpang.')
+    def notifications_repair(dry_run):
+        """Hitung ulang penghitung notifikasi belum-dibaca dari tabel notifications."""
+        from nemukerja.extensions import db
+        from nemukerja.notify import repair_unread_counters
+
+        drift = repair_unread_counters(db.session, dry_run=dry_run)
+        for user_id, (stored, actual) in sorted(drift.items()):
+            click.echo(f'  user {user_id}: {stored} -> {actual}')
+        verb = 'ditemukan' if dry_run else 'diperbaiki'
+        click.echo(f'{len(drift)} penghitung menyimpang {verb}.')
+
+    @app.cli.command('cv-storage-migrate')
+    @click.option('--keep', is_flag=True, help='Jangan hapus file lama setelah disalin.')
+    @click.option('--batch-size', default=500, help='Jumlah applicant per commit.')
+    def cv_storage_migrate(keep, batch_size):
+        """Pindahkan CV dari static/uploads/cv ke storage yang dikonfigurasi (layout bersharding)."""
+        from nemukerja.extensions import db
+        from nemukerja.models import Applicant
+        from nemukerja.storage import LocalStorage, get_cv_storage, legacy_cv_root, sharded_key
+
+        source = LocalStorage(legacy_cv_root(app))
+        target = get_cv_storage()
+        same_disk = isinstance(target, LocalStorage) and os.path.abspath(target.root) == os.path.abspath(source.root)
+        moved = missing = 0
+        applicants = Applicant.query.filter(Applicant.cv_path.isnot(None), Applicant.cv_path != '')
+        for n, applicant in enumerate(applicants.order_by(Applicant.id).all(), 1):
+            old_key = applicant.cv_path
+            new_key = sharded_key(old_key)
+            if same_disk and new_key == old_key:
+                continue
+            if not source.exists(old_key):
+                missing += 1
+                continue
+            if not target.exists(new_key):
+                with open(source.path(old_key), 'rb') as f:
+                    target.put(new_key, f)
+            applicant.cv_path = new_key
+            moved += 1
+            if not keep:
+                source.delete(old_key)
+            if n % batch_size == 0:
+                db.session.commit()
+        db.session.commit()
+        click.echo(f'{moved} CV dipindahkan ke storage {app.config["CV_STORAGE_BACKEND"]}; '
+                   f'{missing} file tidak ditemukan di {source.root}.')
+
+    @app.cli.command('application-search-rebuild')
+    def application_search_rebuild():
+        """Buat (bila perlu) dan isi ulang indeks full-text lamaran untuk pencarian inbox."""
+        from nemukerja.appsearch import rebuild_search_index
+        from nemukerja.extensions import db
+
+        start = time.perf_counter()
+        with db.engine.begin() as connection:
+            total = rebuild_search_index(connection)
+        click.echo(f'{total} lamaran diindeks dalam {time.perf_counter() - start:.1f} s.')
+
+    @app.cli.command('bench-application-search')
+    @click.option('--applications', default=200_000, help='Jumlah lamaran sintetis di database SQLite sementara.')
+    @click.option('--companies', default=500, help='Jumlah perusahaan; perusahaan #1 menerima 20% lamaran.')
+    @click.option('--repeat', default=20, help='Jumlah pengulangan per skenario (median dilaporkan).')
+    def bench_application_search(applications, companies, repeat):
+        """Bandingkan LIKE, FTS5 global + filter perusahaan, dan FTS5 berawalan perusahaan."""
+        import random
+        import tempfile
+
+        from sqlalchemy import create_engine, func, insert, select, text
+
+        from nemukerja.appsearch import DIALECT_SQL, build_match_query, parse_search_query, rebuild_search_index
+        from nemukerja.extensions import db
+        from nemukerja.models import Applicant, Application, Company, JobListing, Location, User
+
+        words = ['python', 'sql', 'excel', 'marketing', 'akuntansi', 'desain', 'golang', 'laravel', 'data',
+                 'analyst', 'komunikasi', 'tim', 'pengalaman', 'tahun', 'proyek', 'kepemimpinan'] + \
+                [f'kata{i}' for i in range(400)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f'sqlite:///{tmp}/bench.db')
+            db.metadata.create_all(engine, tables=[User.__table__, Company.__table__, Location.__table__,
+                                                   JobListing.__table__, Applicant.__table__, Application.__table__])
+            click.echo(f'Mengisi {applications} lamaran untuk {companies} perusahaan...')
+            rng = random.Random(42)
+            with engine.begin() as conn:
+                conn.execute(insert(User.__table__), [
+                    {'id_user': i, 'email': f'u{i}@bench', 'password': 'x', 'role': 'company'}
+                    for i in range(1, companies + 1)])
+                conn.execute(insert(Company.__table__), [
+                    {'id_company': i, 'id_user': i, 'company_name': f'Company {i}'} for i in range(1, companies + 1)])
+                conn.execute(insert(JobListing.__table__), [
+                    {'id_job': i, 'id_company': i, 'title': 'Job', 'description': 'x', 'qualifications': 'x',
+                     'location': 'Jakarta', 'salary_min': 1, 'salary_max': 2, 'slots': 1, 'is_open': True}
+                    for i in range(1, companies + 1)])
+                conn.execute(insert(Applicant.__table__), [
+                    {'id_applicant': 1, 'id_user': 1, 'full_name': 'Bench', 'skills': 'python sql'}])
+                for offset in range(0, applications, 50_000):
+                    conn.execute(insert(Application.__table__), [
+                        {'id_applicant': 1, 'notes': ' '.join(rng.choices(words, k=60)),
+                         'id_job': 1 if rng.random() < 0.2 else rng.randint(2, companies)}
+                        for _ in range(offset, min(offset + 50_000, applications))])
+                rebuild_search_index(conn)
+                # Pembanding: FTS5 tanpa awalan, disaring perusahaan setelah MATCH
+                conn.execute(text("CREATE VIRTUAL TABLE plain_search USING fts5(body)"))
+                conn.execute(text("INSERT INTO plain_search (rowid, body) "
+                                  "SELECT id_application, notes || ' ' || 'python sql' FROM applications"))
+
+            def median_ms(conn, statement, params):
+                samples = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    conn.execute(statement, params).all()
+                    samples.append(time.perf_counter() - start)
+                samples.sort()
+                return samples[len(samples) // 2] * 1000
+
+            scoped = select(func.count()).select_from(Application).join(JobListing) \
+                .where(JobListing.id_company == text(':company'))
+            like = scoped.where(Application.notes.like(text(':pattern')))
+            plain = scoped.where(Application.id.in_(text('SELECT rowid FROM plain_search WHERE plain_search MATCH :plain')))
+            prefixed = scoped.where(Application.id.in_(text(DIALECT_SQL['sqlite']['match'])))
+
+            click.echo(f"{'perusahaan':<11} {'query':<22} {'hasil':>6} {'LIKE ms':>9} {'FTS global ms':>14} {'FTS scoped ms':>14}")
+            with engine.connect() as conn:
+                for company_id in (1, companies):
+                    for query, plain_query in (('python', 'python'), ('golang -laravel', 'golang NOT laravel'),
+                                               ('"data analyst"', '"data analyst"'), ('kata7', 'kata7')):
+                        match = build_match_query('sqlite', company_id, *parse_search_query(query))
+                        pattern = '%' + query.strip('"').split()[0] + '%'
+                        params = {'company': company_id, 'pattern': pattern, 'plain': plain_query, 'query': match}
+                        hits = conn.execute(prefixed, params).scalar()
+                        click.echo(f'{"#" + str(company_id):<11} {query:<22} {hits:>6} '
+                                   f'{median_ms(conn, like, params):>9.2f} {median_ms(conn, plain, params):>14.2f} '
+                                   f'{median_ms(conn, prefixed, params):>14.2f}')
+            engine.dispose()
+
+    @app.cli.command('cv-previews')
+    @click.option('--all', 'regenerate_all', is_flag=True, help='Buat ulang juga preview yang sudah ada.')
+    def cv_previews(regenerate_all):
+        """Buat preview CV yang belum ada (mis. CV lama atau pekerjaan yang hilang saat restart)."""
+        from nemukerja.extensions import db
+        from nemukerja.models import Applicant
+        from nemukerja.previews import get_cv_previewer
+
+        previewer = get_cv_previewer(app)
+        if previewer is None:
+            raise click.ClickException('CV_PREVIEW_ENABLED=0.')
+        query = db.session.query(Applicant.id, Applicant.cv_path) \
+            .filter(Applicant.cv_path.isnot(None), Applicant.cv_path != '')
+        if not regenerate_all:
+            query = query.filter(Applicant.cv_preview_at.is_(None))
+        pending = query.order_by(Applicant.id).all()
+        start = time.perf_counter()
+        # Sinkron di proses ini: tidak lewat thread pool agar perintah selesai setelah semuanya dibuat
+        done = sum(1 for applicant_id, cv_key in pending if previewer.generate(applicant_id, cv_key))
+        click.echo(f'{done}/{len(pending)} preview CV dibuat dalam {time.perf_counter() - start:.1f} s.')
+
+    @app.cli.command('loadtest-seed')
+    @click.option('--applicants', default=50, help='Jumlah akun applicant.')
+    @click.option('--companies', default=5, help='Jumlah akun company.')
+    @click.option('--jobs-per-company', default=40, help='Lowongan terbuka per company baru.')
+    @click.option('--prefix', default='loadtest', help='Prefix email: <prefix>-<role>-<n>@example.com.')
+    @click.option('--password', default='loadtest123')
+    def loadtest_seed(applicants, companies, jobs_per_company, prefix, password):
+        """Buat akun dan lowongan untuk `python -m nemukerja.loadtest --journeys` (idempoten)."""
+        import random
+
+        from nemukerja.extensions import bcrypt, db
+        from nemukerja.locations import resolve_location_id
+        from nemukerja.models import Applicant, Company, JobListing, User
+
+        titles = ('Backend Developer', 'Data Analyst', 'UI Designer', 'Marketing Manager',
+                  'DevOps Engineer', 'Data Engineer', 'Product Manager', 'QA Engineer')
+        locations = ('Jakarta', 'Bandung', 'Surabaya', 'Yogyakarta', 'Remote')
+        # Satu hash dipakai semua akun: bcrypt per akun hanya memperlambat seeding
+        pw_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        wanted = {f'{prefix}-applicant-{i}@example.com': 'applicant' for i in range(1, applicants + 1)}
+        wanted.update({f'{prefix}-company-{i}@example.com': 'company' for i in range(1, companies + 1)})
+        existing = {email for (email,) in db.session.query(User.email).filter(User.email.in_(wanted))}
+
+        location_ids = {text: resolve_location_id(db.session, text) for text in locations}
+        created = jobs = 0
+        for email, role in wanted.items():
+            if email in existing:
+                continue
+            user = User(email=email, password=pw_hash, role=role)
+            db.session.add(user)
+            db.session.flush()
+            created += 1
+            if role == 'applicant':
+                db.session.add(Applicant(id_user=user.id, full_name=email.split('@')[0]))
+                continue
+            company = Company(id_user=user.id, company_name=email.split('@')[0], contact_email=email,
+                              description='Akun uji beban.')
+            db.session.add(company)
+            db.session.flush()
+            for n in range(jobs_per_company):
+                location = random.choice(locations)
+                salary = random.randrange(4, 20) * 1_000_000
+                db.session.add(JobListing(
+                    id_company=company.id, title=f'{random.choice(titles)} {n + 1}',
+                    description='Lowongan uji beban. ' * 5, qualifications='Python, SQL',
+                    location=location, id_location=location_ids[location],
+                    salary_min=salary, salary_max=salary + 3_000_000,
+                    slots=100_000, is_open=True))
+                jobs += 1
+        db.session.commit()
+        click.echo(f'{created} akun baru ({len(existing)} sudah ada), {jobs} lowongan baru; password: {password}')
@@ -1,10 +1,87 @@
 import os
+import tempfile
 from datetime import timedelta
 
+def _engine_options(database_uri):
+    # Opsi pool SQLAlchemy dari environment. pool_size/max_overflow hanya berlaku
+    # untuk QueuePool (MySQL); SQLite memakai pool bawaannya sendiri.
+    options = {
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', '1') == '1',
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '280')),  # < wait_timeout MySQL
+    }
+    if not database_uri.startswith('sqlite'):
+        options['pool_size'] = int(os.getenv('DB_POOL_SIZE', '10'))
+        options['max_overflow'] = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+        options['pool_timeout'] = int(os.getenv('DB_POOL_TIMEOUT', '10'))
+    return options
+
 class Config:
-    SECRET_KEY = os.getenv('SECRET_KEY', 'a-very-secret-key-that-you-should-change')
+    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-me')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'mysql+pymysql://root:@localhost/nemukerja_db')
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+    # Replica baca opsional, contoh lokal: DATABASE_REPLICA_URL=sqlite:////tmp/nemukerja_replica.db
+    SQLALCHEMY_BINDS = {'replica': os.getenv('DATABASE_REPLICA_URL')} if os.getenv('DATABASE_REPLICA_URL') else {}
+    READ_YOUR_WRITES_SECONDS = int(os.getenv('READ_YOUR_WRITES_SECONDS', '10'))
+    # Jalur async (asgi.py); kosong = diturunkan dari DATABASE_URL (pymysql -> aiomysql, sqlite -> aiosqlite)
+    ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     REMEMBER_COOKIE_DURATION = timedelta(days=30)
     REMEMBER_COOKIE_SECURE = True
-    REMEMBER_COOKIE_HTTPONLY = True
\ No newline at end of file
+    REMEMBER_COOKIE_HTTPONLY = True
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+    FRAGMENT_CACHE_ENABLED = os.getenv('FRAGMENT_CACHE_ENABLED', '1') == '1'
+    FRAGMENT_CACHE_SIZE = int(os.getenv('FRAGMENT_CACHE_SIZE', '2048'))
+    JINJA_BYTECODE_CACHE_DIR = os.getenv('JINJA_BYTECODE_CACHE_DIR')  # None = direktori temp default Jinja
+    # Funnel rekrutmen per perusahaan (funnel.py); antar worker diinvalidasi lewat tag query cache,
+    # TTL hanya batas basi bila query cache dimatikan
+    FUNNEL_CACHE_SIZE = int(os.getenv('FUNNEL_CACHE_SIZE', '1024'))
+    FUNNEL_CACHE_TTL = int(os.getenv('FUNNEL_CACHE_TTL', '300'))
+    # Facet count pencarian (facets.py); TTL pendek karena lowongan baru mengubah hitungan
+    FACET_CACHE_SIZE = int(os.getenv('FACET_CACHE_SIZE', '512'))
+    FACET_CACHE_TTL = int(os.getenv('FACET_CACHE_TTL', '30'))
+    # Snapshot kolumnar lowongan terbuka per worker (snapshot.py, butuh NumPy); mati secara default
+    JOB_SNAPSHOT_ENABLED = os.getenv('JOB_SNAPSHOT_ENABLED', '0') == '1'
+    JOB_SNAPSHOT_REFRESH_SECONDS = int(os.getenv('JOB_SNAPSHOT_REFRESH_SECONDS', '5'))
+    JOB_SNAPSHOT_MAX_AGE = int(os.getenv('JOB_SNAPSHOT_MAX_AGE', '30'))  # Lebih basi dari ini -> SQL
+    JOB_SNAPSHOT_FULL_REFRESH_SECONDS = int(os.getenv('JOB_SNAPSHOT_FULL_REFRESH_SECONDS', '300'))
+    # Rate limit token bucket (ratelimit.py); file SQLite dibagi semua worker di host yang sama
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', '1') == '1'
+    RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB', os.path.join(tempfile.gettempdir(), 'nemukerja-ratelimit.db'))
+    RATE_LIMITS = {  # "burst/detik": burst N permintaan, isi ulang N token per detik tersebut
+        'login': os.getenv('RATE_LIMIT_LOGIN', '10/60'),
+        'apply': os.getenv('RATE_LIMIT_APPLY', '5/60'),
+        'notifications': os.getenv('RATE_LIMIT_NOTIFICATIONS', '30/60'),
+    }
+    # Cache hasil SELECT ORM dengan invalidasi per tabel (querycache.py)
+    QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', '1') == '1'
+    # local | sqlite | modul:Kelas. Default sqlite: file QUERY_CACHE_DB dibagi semua proses di host
+    # (worker gunicorn, `flask sweeper`, `flask rollup`), jadi invalidasi dari CLI sampai ke worker web
+    QUERY_CACHE_BACKEND = os.getenv('QUERY_CACHE_BACKEND', 'sqlite')
+    QUERY_CACHE_SIZE = int(os.getenv('QUERY_CACHE_SIZE', '1024'))
+    QUERY_CACHE_TTL = int(os.getenv('QUERY_CACHE_TTL', '30'))  # Batas basi antar-worker untuk backend local
+    QUERY_CACHE_DB = os.getenv('QUERY_CACHE_DB', os.path.join(tempfile.gettempdir(), 'nemukerja-querycache.db'))
+    # Penyimpanan CV (storage.py): local (sharded di CV_STORAGE_ROOT) | s3 (S3/MinIO, butuh boto3)
+    CV_STORAGE_BACKEND = os.getenv('CV_STORAGE_BACKEND', 'local')
+    CV_STORAGE_ROOT = os.getenv('CV_STORAGE_ROOT', '')  # Kosong = static/uploads/cv (lokasi lama)
+    CV_X_ACCEL_PREFIX = os.getenv('CV_X_ACCEL_PREFIX', '')  # Mis. /protected-cv: nginx yang mengirim file
+    CV_S3_BUCKET = os.getenv('CV_S3_BUCKET', '')
+    CV_S3_PREFIX = os.getenv('CV_S3_PREFIX', 'cv/')
+    CV_S3_ENDPOINT_URL = os.getenv('CV_S3_ENDPOINT_URL', '')  # Kosong = AWS; isi untuk MinIO
+    CV_S3_REGION = os.getenv('CV_S3_REGION', '')
+    CV_PRESIGN_SECONDS = int(os.getenv('CV_PRESIGN_SECONDS', '300'))
+    CV_UPLOAD_CHUNK_MB = int(os.getenv('CV_UPLOAD_CHUNK_MB', '8'))  # Ukuran part multipart (minimum S3: 5)
+    # Hapus lowongan (jobremoval.py): delete = lowongan + lamarannya (ON DELETE CASCADE) |
+    # archive = lowongan disembunyikan dari dashboard, lamaran tetap ada
+    JOB_DELETE_MODE = os.getenv('JOB_DELETE_MODE', 'delete')
+    # Preview CV di latar belakang (previews.py); renderer opsional: pymupdf atau poppler-utils
+    CV_PREVIEW_ENABLED = os.getenv('CV_PREVIEW_ENABLED', '1') == '1'
+    CV_PREVIEW_WORKERS = int(os.getenv('CV_PREVIEW_WORKERS', '2'))  # 0 = sinkron di dalam request
+    CV_PREVIEW_WIDTH = int(os.getenv('CV_PREVIEW_WIDTH', '320'))  # Lebar thumbnail dalam piksel
+    CV_PREVIEW_CHARS = int(os.getenv('CV_PREVIEW_CHARS', '600'))
+    CV_PREVIEW_TIMEOUT = int(os.getenv('CV_PREVIEW_TIMEOUT', '20'))  # Batas detik per proses poppler
+    # Endpoint /metrics (metrics.py); snapshot per proses dijumlahkan dari METRICS_DIR
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+    METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'nemukerja-metrics'))
+    METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')  # Kosong = hanya localhost; isi jika di balik proxy
+    ASSET_MANIFEST_ENABLED = os.getenv('ASSET_MANIFEST_ENABLED', '1') == '1'  # Pakai static/build/manifest.json jika ada
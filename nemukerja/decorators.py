@@ -0,0 +1,16 @@
+from functools import wraps
+
+from flask import flash, redirect, url_for
+from flask_login import current_user, login_required
+
+
+def admin_required(f):
+    # Admin authorization decorator
+    @wraps(f)
+    @login_required
+    def decorated_function(*args, **kwargs):
+        if current_user.role != 'admin':
+            flash('Admin access required.', 'danger')
+            return redirect(url_for('public.dashboard'))
+        return f(*args, **kwargs)
+    return decorated_function
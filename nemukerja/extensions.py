@@ -1,7 +1,21 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
-from flask_bcrypt import Bcrypt
+from flask_bcrypt import Bcrypt as _Bcrypt
+from nemukerja.metrics import timed
+from nemukerja.routing import RoutingSession
 
-db = SQLAlchemy()
+
+class Bcrypt(_Bcrypt):
+    # Durasi hash/cek dicatat ke /metrics (nemukerja_bcrypt_duration_seconds)
+    def generate_password_hash(self, *args, **kwargs):
+        with timed('nemukerja_bcrypt_duration_seconds', op='hash'):
+            return super().generate_password_hash(*args, **kwargs)
+
+    def check_password_hash(self, *args, **kwargs):
+        with timed('nemukerja_bcrypt_duration_seconds', op='check'):
+            return super().check_password_hash(*args, **kwargs)
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
 bcrypt = Bcrypt()
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""Facet count (lokasi, perusahaan, rentang gaji) untuk hasil pencarian index().
+
+Semua facet dihitung dari SATU query GROUP BY (id_location, id_company, band)
+atas himpunan hasil yang sudah difilter. Hasilnya di-cache per worker per
+kunci filter yang dinormalisasi, jadi hitungan facet boleh basi sampai
+FACET_CACHE_TTL; total untuk pagination tetap dihitung dari query halaman.
+"""
+from collections import Counter
+
+from flask import current_app
+from sqlalchemy import case, func, select
+
+from nemukerja.cache import LRUCache
+from nemukerja.models import JobListing, Location
+from nemukerja.search import job_search_filters
+
+# Nilai filter "gaji minimum" yang ditawarkan facet (IDR). Link facet mengirim
+# salary_min=floor, jadi hitungan tiap floor memakai predikat yang sama dengan
+# job_search_filters(): salary_min >= floor DAN salary_max >= floor, yaitu
+# min(salary_min, salary_max) >= floor. Hitungannya kumulatif, bukan rentang.
+SALARY_BAND_FLOORS = (0, 3_000_000, 5_000_000, 10_000_000, 20_000_000)
+TOP_FACETS = 8
+
+
+def salary_band_label(index):
+    return f'>= {SALARY_BAND_FLOORS[index] // 1_000_000} jt'
+
+
+def cumulative_band_counts(counts):
+    """Jumlah per band tertinggi yang dipenuhi lowongan -> jumlah lowongan yang lolos tiap floor."""
+    total, result = 0, []
+    for count in reversed(counts):
+        total += count
+        result.append(total)
+    return result[::-1]
+
+
+def normalized_filter_key(params):
+    """Kunci cache: filter yang sama dengan huruf/spasi berbeda berbagi entri."""
+    return (
+        ' '.join(params['search'].lower().split()),
+        # ID lokasi dan teksnya: teks tetap dicocokkan ke lowongan yang lokasinya belum terpetakan
+        params.get('location_id'),
+        ' '.join(params['location'].lower().split()),
+        params['salary_min'] if params['salary_min'] and params['salary_min'] > 0 else 0,
+        ' '.join(params['company'].lower().split()),
+    )
+
+
+def facet_statement(params):
+    """Satu SELECT ... GROUP BY untuk semua facet (dipakai juga oleh jalur async)."""
+    salary_min = func.coalesce(JobListing.salary_min, 0)
+    salary_max = func.coalesce(JobListing.salary_max, 0)
+    # LEAST() portabel (SQLite tidak punya LEAST; min() multi-argumen tidak ada di MySQL)
+    lower = case((salary_min <= salary_max, salary_min), else_=salary_max)
+    band = case(
+        *[(lower >= floor, index)
+          for index, floor in reversed(list(enumerate(SALARY_BAND_FLOORS))) if floor > 0],
+        else_=0,
+    )
+    return (
+        select(JobListing.id_location, Location.name, JobListing.id_company, band, func.count())
+        .outerjoin(Location, Location.id == JobListing.id_location)
+        .where(*job_search_filters(params))
+        .group_by(JobListing.id_location, Location.name, JobListing.id_company, band)
+    )
+
+
+def build_facets(rows, top=TOP_FACETS):
+    """Gulung baris (id_location, nama, id_company, band, count) menjadi tiga facet + total."""
+    locations, companies, bands = Counter(), Counter(), Counter()
+    total = 0
+    for location_id, location_name, company_id, band, count in rows:
+        total += count
+        # Lowongan yang belum dipetakan ke tabel locations tidak muncul di facet lokasi
+        if location_id is not None:
+            locations[(location_id, location_name)] += count
+        companies[company_id] += count
+        bands[int(band)] += count
+    band_counts = cumulative_band_counts([bands[index] for index in range(len(SALARY_BAND_FLOORS))])
+
+    return {
+        'total': total,
+        'locations': [
+            {'id': location_id, 'name': name, 'count': count}
+            for (location_id, name), count in locations.most_common(top)
+        ],
+        'companies': companies.most_common(top),
+        'salary_bands': [
+            {'floor': floor, 'label': salary_band_label(index), 'count': band_counts[index]}
+            for index, floor in enumerate(SALARY_BAND_FLOORS)
+        ],
+    }
+
+
+def compute_facets(params, session):
+    return build_facets(session.execute(facet_statement(params)).all())
+
+
+def get_facets(params, session):
+    cache = current_app.extensions['facet_cache']
+    key = normalized_filter_key(params)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(params, session)
+        cache.set(key, facets)
+    return facets
+
+
+def init_facets(app):
+    app.extensions['facet_cache'] = LRUCache(
+        maxsize=app.config['FACET_CACHE_SIZE'], ttl=app.config['FACET_CACHE_TTL']
+    )
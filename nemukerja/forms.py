@@ -1,6 +1,6 @@
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileField, FileAllowed, FileRequired
-from wtforms import StringField, PasswordField, BooleanField, SubmitField, TextAreaField, IntegerField, SelectField
+from wtforms import StringField, PasswordField, BooleanField, SubmitField, TextAreaField, IntegerField, SelectField, DateField
 from wtforms.validators import DataRequired, Email, Length, EqualTo, ValidationError, Optional, NumberRange
 
 class RegisterForm(FlaskForm):
@@ -76,6 +76,8 @@ class AddJobForm(FlaskForm):
         DataRequired(), 
         NumberRange(min=1, message='Slots must be at least 1')
     ], default=1)
+    # Opsional: lowongan ditutup otomatis oleh `flask sweeper` setelah tanggal ini
+    expires_on = DateField('Close Automatically After (optional)', validators=[Optional()])
     submit = SubmitField('Add Job')
 
     def validate_salary_max(self, field):
@@ -0,0 +1,189 @@
+"""Funnel rekrutmen per job dan per perusahaan, dihitung dengan satu query agregat.
+
+Hasil di-cache per perusahaan (LRUCache di `app.extensions['funnel_cache']`)
+dan dibuang otomatis setelah commit yang menambah/mengubah/menghapus
+Application milik perusahaan tersebut (apply, accept, reject, hapus job).
+
+Tiap worker gunicorn punya LRUCache sendiri, jadi setiap entri menyimpan versi
+tag `funnel:<id_company>` dari tag store query cache (querycache.py). Commit
+menaikkan versi itu; dengan backend query cache yang dibagi (sqlite), entri di
+worker lain ikut basi pada baca berikutnya. Tanpa query cache
+(QUERY_CACHE_ENABLED=0) hanya FUNNEL_CACHE_TTL yang membatasi data basi di
+worker lain.
+"""
+from flask import current_app, has_app_context
+from sqlalchemy import Float, case, event, func, inspect, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from nemukerja.cache import LRUCache
+from nemukerja.extensions import db
+from nemukerja.models import Application, JobListing
+from nemukerja.routing import RoutingSession
+
+SESSION_INFO_KEY = 'funnel_dirty_companies'
+# Tag di tag store query cache; tidak bentrok dengan tag nama tabel
+FUNNEL_TAG = 'funnel:{}'
+
+
+class seconds_between(FunctionElement):
+    """Selisih detik antara dua kolom waktu, dikompilasi sesuai dialek."""
+    type = Float()
+    inherit_cache = True
+    name = 'seconds_between'
+
+
+@compiles(seconds_between)
+def _seconds_between_mysql(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return f'TIMESTAMPDIFF(SECOND, {compiler.process(start, **kw)}, {compiler.process(end, **kw)})'
+
+
+@compiles(seconds_between, 'sqlite')
+def _seconds_between_sqlite(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return f'((julianday({compiler.process(end, **kw)}) - julianday({compiler.process(start, **kw)})) * 86400.0)'
+
+
+@compiles(seconds_between, 'postgresql')
+def _seconds_between_postgresql(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return f'EXTRACT(EPOCH FROM ({compiler.process(end, **kw)} - {compiler.process(start, **kw)}))'
+
+
+def _stats(total=0, pending=0, accepted=0, rejected=0, responded=0, response_seconds=0.0):
+    decided = accepted + rejected
+    return {
+        'total': total,
+        'pending': pending,
+        'accepted': accepted,
+        'rejected': rejected,
+        'responded': responded,
+        'avg_response_seconds': response_seconds / responded if responded else None,
+        'acceptance_rate': accepted / decided if decided else None,
+    }
+
+
+EMPTY_STATS = _stats()
+
+
+def compute_company_funnel(company_id):
+    """Hitung funnel tanpa cache: {'jobs': {id_job: stats}, 'overall': stats}."""
+    response_seconds = seconds_between(Application.applied_at, Application.responded_at)
+    rows = db.session.execute(
+        select(
+            Application.id_job,
+            func.count(Application.id),
+            func.sum(case((Application.status == 'Pending', 1), else_=0)),
+            func.sum(case((Application.status == 'Diterima', 1), else_=0)),
+            func.sum(case((Application.status == 'Ditolak', 1), else_=0)),
+            func.count(Application.responded_at),
+            # SUM (bukan AVG) agar rata-rata perusahaan bisa dihitung tertimbang;
+            # baris tanpa responded_at bernilai NULL dan diabaikan SUM
+            func.coalesce(func.sum(response_seconds), 0),
+        )
+        .join(JobListing, JobListing.id == Application.id_job)
+        # Lowongan yang diarsipkan tidak dihitung, sama seperti di inbox dan dashboard
+        .where(JobListing.id_company == company_id, JobListing.archived_at.is_(None))
+        .group_by(Application.id_job)
+    ).all()
+
+    jobs = {}
+    totals = [0, 0, 0, 0, 0, 0.0]
+    for job_id, *values in rows:
+        values = [int(v or 0) for v in values[:5]] + [float(values[5] or 0)]
+        jobs[job_id] = _stats(*values)
+        totals = [a + b for a, b in zip(totals, values)]
+    return {'jobs': jobs, 'overall': _stats(*totals)}
+
+
+def _shared_version(company_id):
+    # () bila query cache tidak aktif; None bila tag store gagal dibaca (jangan cache)
+    query_cache = current_app.extensions.get('query_cache')
+    if query_cache is None:
+        return ()
+    return query_cache.tag_versions({FUNNEL_TAG.format(company_id)})
+
+
+def get_company_funnel(company_id):
+    cache = current_app.extensions['funnel_cache']
+    version = _shared_version(company_id)
+    entry = cache.get(company_id)
+    if entry is not None and version is not None and entry[0] == version:
+        return entry[1]
+    funnel = compute_company_funnel(company_id)
+    if version is not None:
+        cache.set(company_id, (version, funnel))
+    return funnel
+
+
+def invalidate_company_funnel(company_id):
+    if not has_app_context():
+        return
+    if 'funnel_cache' in current_app.extensions:
+        current_app.extensions['funnel_cache'].delete(company_id)
+    query_cache = current_app.extensions.get('query_cache')
+    if query_cache is not None:
+        query_cache.invalidate({FUNNEL_TAG.format(company_id)})
+
+
+def mark_company_funnel_dirty(session, company_id):
+    # Untuk UPDATE massal (tanpa objek ORM) yang tidak terlihat oleh after_flush:
+    # cache perusahaan ini tetap dibuang setelah commit
+    session.info.setdefault(SESSION_INFO_KEY, set()).add(company_id)
+
+
+def format_duration(seconds):
+    """Filter template `duration`: 5400 -> '1.5 jam', 172800 -> '2.0 hari'."""
+    if seconds is None:
+        return '-'
+    if seconds < 3600:
+        return f'{seconds / 60:.0f} menit'
+    if seconds < 86400:
+        return f'{seconds / 3600:.1f} jam'
+    return f'{seconds / 86400:.1f} hari'
+
+
+def _company_id_for(session, application):
+    # Pakai relasi yang sudah dimuat bila ada, supaya tidak ada query tambahan
+    if 'job' not in inspect(application).unloaded and application.job is not None:
+        return application.job.id_company
+    return session.connection().scalar(
+        select(JobListing.id_company).where(JobListing.id == application.id_job)
+    )
+
+
+def _collect_dirty_companies(session, flush_context):
+    dirty = session.info.setdefault(SESSION_INFO_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Application):
+            company_id = _company_id_for(session, obj)
+            if company_id is not None:
+                dirty.add(company_id)
+    for obj in session.deleted:
+        # Lamarannya terhapus oleh ON DELETE CASCADE, tidak lewat session
+        if isinstance(obj, JobListing):
+            dirty.add(obj.id_company)
+
+
+def _invalidate_after_commit(session):
+    for company_id in session.info.pop(SESSION_INFO_KEY, ()):
+        invalidate_company_funnel(company_id)
+
+
+def _discard_after_rollback(session):
+    session.info.pop(SESSION_INFO_KEY, None)
+
+
+def init_funnel(app):
+    app.extensions['funnel_cache'] = LRUCache(
+        maxsize=app.config['FUNNEL_CACHE_SIZE'], ttl=app.config['FUNNEL_CACHE_TTL']
+    )
+    app.add_template_filter(format_duration, 'duration')
+
+    # Listener tingkat kelas session; didaftarkan sekali walau create_app() dipanggil berulang
+    for name, listener in (('after_flush', _collect_dirty_companies),
+                           ('after_commit', _invalidate_after_commit),
+                           ('after_rollback', _discard_after_rollback)):
+        if not event.contains(RoutingSession, name, listener):
+            event.listen(RoutingSession, name, listener)
@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import contains_eager, joinedload
+
+from nemukerja.activity import record_activities
+from nemukerja.appsearch import application_search_filter
+from nemukerja.funnel import mark_company_funnel_dirty
+from nemukerja.models import Applicant, Application, JobListing
+from nemukerja.notify import notify_many
+from nemukerja.rollup import mark_rollup_days_dirty
+
+# Jumlah lamaran per halaman di inbox perusahaan (HTML dan JSON)
+APPLICATIONS_PER_PAGE = 25
+MAX_APPLICATIONS_PER_PAGE = 100
+MAX_SEARCH_LENGTH = 200
+APPLICATION_STATUSES = ('Pending', 'Diterima', 'Ditolak')
+
+# Aksi massal inbox -> (status baru, kata kerja di pesan notifikasi pelamar)
+BULK_STATUS_ACTIONS = {
+    'accept': ('Diterima', 'accepted'),
+    'reject': ('Ditolak', 'rejected'),
+}
+MAX_BULK_APPLICATIONS = 500
+
+# Urutan yang didukung; selalu diakhiri id agar urutan stabil antar halaman
+INBOX_SORTS = {
+    'newest': lambda: (Application.applied_at.desc(), Application.id.desc()),
+    'oldest': lambda: (Application.applied_at.asc(), Application.id.asc()),
+    'status': lambda: (Application.status, Application.applied_at.desc(), Application.id.desc()),
+    'job': lambda: (JobListing.title, Application.applied_at.desc(), Application.id.desc()),
+}
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_inbox_args(args):
+    """Ambil filter/urutan inbox lamaran dari request.args (nilai tidak valid diabaikan)."""
+    status = args.get('status', '', type=str)
+    sort = args.get('sort', 'newest', type=str)
+    per_page = args.get('per_page', APPLICATIONS_PER_PAGE, type=int)
+    return {
+        # Pencarian full-text cover letter + skills (nemukerja/appsearch.py)
+        'q': args.get('q', '', type=str).strip()[:MAX_SEARCH_LENGTH],
+        'job_id': args.get('job', type=int),
+        'status': status if status in APPLICATION_STATUSES else '',
+        'date_from': _parse_date(args.get('date_from')),
+        'date_to': _parse_date(args.get('date_to')),
+        'sort': sort if sort in INBOX_SORTS else 'newest',
+        'per_page': min(max(per_page, 1), MAX_APPLICATIONS_PER_PAGE),
+    }
+
+
+def company_inbox_query(query, company_id, params):
+    """Filter + urutkan query Application untuk satu perusahaan, dengan eager loading.
+
+    Semua filter dan urutan default tercakup indeks
+    ix_applications_job_status_applied (id_job, status, applied_at), jadi
+    rencana query tidak berubah menjadi full scan untuk perusahaan besar.
+    """
+    # Lamaran untuk lowongan yang diarsipkan (JOB_DELETE_MODE=archive) tidak masuk inbox
+    query = query.join(Application.job) \
+        .filter(JobListing.id_company == company_id, JobListing.archived_at.is_(None)) \
+        .options(
+            contains_eager(Application.job),
+            joinedload(Application.applicant).joinedload(Applicant.user),
+        )
+
+    if params['q']:
+        condition = application_search_filter(query.session, company_id, params['q'])
+        if condition is not None:
+            query = query.filter(condition)
+    if params['job_id']:
+        query = query.filter(Application.id_job == params['job_id'])
+    if params['status']:
+        query = query.filter(Application.status == params['status'])
+    if params['date_from']:
+        query = query.filter(Application.applied_at >= params['date_from'])
+    if params['date_to']:
+        # date_to inklusif: sampai akhir hari tersebut
+        query = query.filter(Application.applied_at < params['date_to'] + timedelta(days=1))
+
+    return query.order_by(*INBOX_SORTS[params['sort']]())
+
+
+def encode_cursor(application):
+    return f"{application.applied_at.strftime('%Y-%m-%dT%H:%M:%S.%f')}_{application.id}"
+
+
+def apply_cursor(query, cursor, sort):
+    """Keyset pagination (applied_at, id) untuk feed JSON; hanya untuk urutan newest/oldest."""
+    try:
+        applied_at, _, application_id = cursor.rpartition('_')
+        applied_at = datetime.strptime(applied_at, '%Y-%m-%dT%H:%M:%S.%f')
+        application_id = int(application_id)
+    except (AttributeError, ValueError):
+        return query
+
+    if sort == 'oldest':
+        return query.filter(or_(
+            Application.applied_at > applied_at,
+            and_(Application.applied_at == applied_at, Application.id > application_id),
+        ))
+    return query.filter(or_(
+        Application.applied_at < applied_at,
+        and_(Application.applied_at == applied_at, Application.id < application_id),
+    ))
+
+
+def bulk_set_application_status(session, company_id, application_ids, action, actor_id=None):
+    """Terima/tolak banyak lamaran milik satu perusahaan dalam satu transaksi.
+
+    Satu SELECT memeriksa kepemilikan (dan mengambil id_user pelamar + judul job
+    untuk pesan), satu UPDATE mengubah status, satu INSERT batch membuat semua
+    notifikasi (dan satu lagi untuk log aktivitas admin). Lamaran yang bukan milik perusahaan, tidak ada, atau sudah
+    berstatus tujuan dilewati. Kembalikan (id_diubah, id_dilewati); commit
+    dilakukan pemanggil.
+    """
+    status, verb = BULK_STATUS_ACTIONS[action]
+    requested = list(dict.fromkeys(application_ids))[:MAX_BULK_APPLICATIONS]
+    if not requested:
+        return [], []
+
+    rows = session.execute(
+        select(Application.id, Application.responded_at, Applicant.id_user, Applicant.full_name, JobListing.title)
+        .join(JobListing, JobListing.id == Application.id_job)
+        .join(Applicant, Applicant.id == Application.id_applicant)
+        .where(Application.id.in_(requested),
+               JobListing.id_company == company_id,
+               JobListing.archived_at.is_(None),
+               Application.status != status)
+    ).all()
+    changed = [row.id for row in rows]
+    if changed:
+        session.execute(
+            update(Application)
+            .where(Application.id.in_(changed))
+            .values(status=status,
+                    responded_at=func.coalesce(Application.responded_at, func.now()),
+                    updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        notify_many(session, (
+            {
+                'id_user': row.id_user,
+                'title': 'Application Status Updated',
+                'message': f'Your application for {row.title} has been {verb}',
+                'type': 'application_status',
+                'related_id': row.id,
+            }
+            for row in rows
+        ))
+        record_activities(session, (
+            {
+                'type': 'status',
+                'description': f"Application for '{row.title}' by {row.full_name} {verb}.",
+                'id_user': actor_id,
+                'related_id': row.id,
+            }
+            for row in rows
+        ))
+        mark_company_funnel_dirty(session, company_id)
+        # responded_at yang sudah ada dipertahankan: rollup hari itu perlu dihitung ulang
+        mark_rollup_days_dirty(session, (row.responded_at for row in rows))
+    changed_ids = set(changed)
+    return changed, [application_id for application_id in requested if application_id not in changed_ids]
@@ -0,0 +1,72 @@
+"""Penghapusan lowongan: cascade di database dan notifikasi pelamar dalam satu INSERT.
+
+Lamaran ikut terhapus lewat FOREIGN KEY ... ON DELETE CASCADE
+(`JobListing.applications` memakai passive_deletes), jadi ORM tidak memuat dan
+menghapus lamaran satu per satu. User pelamar diambil dengan satu SELECT
+sebelum DELETE, lalu notifikasinya disisipkan lewat notify_many(). Listener
+yang biasanya melihat lamaran di session.deleted (indeks pencarian lamaran,
+funnel, query cache) menangani JobListing yang dihapus secara langsung.
+
+JOB_DELETE_MODE=archive mengganti DELETE dengan pengarsipan: lowongan diberi
+archived_at dan hilang dari dashboard, inbox, funnel dan aksi massal
+perusahaan, sedangkan baris lamaran beserta riwayatnya tetap ada (pelamar masih
+melihatnya di daftar lamarannya).
+
+SQLite baru menegakkan foreign key bila `PRAGMA foreign_keys=ON` di setiap
+koneksi; init_job_removal() memasangnya (InnoDB selalu menegakkannya).
+"""
+import sqlite3
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+
+from nemukerja.funnel import mark_company_funnel_dirty
+from nemukerja.models import Applicant, Application
+from nemukerja.notify import notify_many
+
+JOB_DELETE_MODES = ('delete', 'archive')
+
+
+def remove_job(session, job, archive=False):
+    """Hapus atau arsipkan lowongan dan beri tahu pelamarnya; kembalikan jumlah user yang diberi tahu.
+
+    Commit dilakukan pemanggil agar penghapusan dan notifikasi satu transaksi.
+    """
+    user_ids = session.scalars(
+        select(Applicant.id_user).distinct()
+        .join(Application, Application.id_applicant == Applicant.id)
+        .where(Application.id_job == job.id)
+    ).all()
+    title = job.title
+    if archive:
+        job.is_open = False
+        job.archived_at = func.now()
+        # Lamarannya keluar dari funnel; tidak ada Application yang berubah untuk memicu listener
+        mark_company_funnel_dirty(session, job.id_company)
+    else:
+        session.delete(job)
+    return notify_many(session, (
+        {
+            'id_user': user_id,
+            'title': 'Job Posting Removed',
+            'message': f"The job '{title}' you applied for has been removed by the company.",
+            'type': 'job_posted',
+            'related_id': None,
+        }
+        for user_id in user_ids
+    ))
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+def init_job_removal(app):
+    if app.config['JOB_DELETE_MODE'] not in JOB_DELETE_MODES:
+        raise RuntimeError(f"JOB_DELETE_MODE tidak dikenal: {app.config['JOB_DELETE_MODE']}")
+    # Listener tingkat kelas Engine; didaftarkan sekali walau create_app() dipanggil berulang
+    if not event.contains(Engine, 'connect', _enable_sqlite_foreign_keys):
+        event.listen(Engine, 'connect', _enable_sqlite_foreign_keys)
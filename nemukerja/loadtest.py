@@ -0,0 +1,453 @@
+"""Load test koneksi bersamaan untuk membandingkan jalur WSGI dan ASGI.
+
+Contoh (jalankan server dulu, masing-masing satu proses):
+
+    gunicorn -w 1 -b 127.0.0.1:8000 run:app            # WSGI sekarang
+    uvicorn nemukerja.asgi:app --port 8001              # jalur async
+    python -m nemukerja.loadtest --url http://127.0.0.1:8000/job/1
+    python -m nemukerja.loadtest --url http://127.0.0.1:8001/job/1
+
+Setiap tingkat concurrency membuka N koneksi keep-alive yang terus mengirim
+GET selama --duration detik. Hasilnya: throughput, persentil latensi, rasio
+error, dan tingkat concurrency tertinggi dengan error di bawah --max-error-rate.
+
+Mode journey (--journeys) menjalankan skenario pengguna yang realistis:
+
+    flask loadtest-seed --applicants 50 --companies 5     # akun & lowongan uji
+    RATE_LIMIT_ENABLED=0 gunicorn -w 4 -b 127.0.0.1:8000 run:app
+    python -m nemukerja.loadtest --base-url http://127.0.0.1:8000 \\
+        --journeys guest=20,applicant=5,company=2,idle=50 --duration 60
+
+- guest: cari di index() lalu buka /job/<id>
+- applicant: login, buka form apply, kirim lamaran + upload CV (multipart)
+- company: login, tinjau /company/applications, terima satu lamaran Pending
+- idle: login, polling /notifications/unread-count (ETag) seperti tab yang dibiarkan
+
+Angkanya = jumlah virtual user per journey; tiap user punya koneksi keep-alive
+dan cookie jar sendiri. Laporan per langkah: request, req/s, p50/p95/p99 dan
+error % (status di luar yang diharapkan, 429, timeout). Rate limiter harus
+dimatikan di server (semua user berasal dari satu IP). CV hasil upload
+tertinggal di static/uploads/cv/ dan perlu dibersihkan setelahnya.
+"""
+import argparse
+import asyncio
+import random
+import re
+import time
+import uuid
+from urllib.parse import urlencode, urlsplit
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.limited = 0
+        self.open_connections = 0
+        self.peak_connections = 0
+
+    def percentile(self, pct):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+
+async def read_response(reader):
+    """Baca satu respons HTTP/1.1; kembalikan (status, headers, body, keep_alive)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Server menutup koneksi')
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers.setdefault(name.strip().lower(), []).append(value.strip())
+
+    if headers.get('transfer-encoding', [''])[0].lower() == 'chunked':
+        body = b''
+        while True:
+            size = int((await reader.readline()).strip() or b'0', 16)
+            if size == 0:
+                await reader.readline()
+                break
+            body += await reader.readexactly(size)
+            await reader.readline()
+    else:
+        body = await reader.readexactly(int(headers.get('content-length', ['0'])[0]))
+
+    keep_alive = headers.get('connection', [''])[0].lower() != 'close'
+    return status, headers, body, keep_alive
+
+
+def build_request(method, host, path, headers=None, body=b''):
+    lines = [f'{method} {path} HTTP/1.1', f'Host: {host}', 'Connection: keep-alive']
+    for name, value in (headers or {}).items():
+        lines.append(f'{name}: {value}')
+    if body or method not in ('GET', 'HEAD'):
+        lines.append(f'Content-Length: {len(body)}')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+async def _connection_worker(url, deadline, stats, timeout):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    path = parts.path or '/'
+    if parts.query:
+        path = f'{path}?{parts.query}'
+    request = build_request('GET', parts.netloc, path)
+
+    reader = writer = None
+    try:
+        while time.monotonic() < deadline:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+                stats.open_connections += 1
+                stats.peak_connections = max(stats.peak_connections, stats.open_connections)
+            start = time.perf_counter()
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, _, _, keep_alive = await asyncio.wait_for(read_response(reader), timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+                stats.errors += 1
+                keep_alive = False
+            else:
+                if status >= 500:
+                    stats.errors += 1
+                else:
+                    stats.latencies.append(time.perf_counter() - start)
+            if not keep_alive:
+                writer.close()
+                stats.open_connections -= 1
+                writer = None
+    except (OSError, asyncio.TimeoutError):
+        stats.errors += 1
+    finally:
+        if writer is not None:
+            writer.close()
+            stats.open_connections -= 1
+
+
+async def run_level(url, concurrency, duration, timeout):
+    stats = Stats()
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(_connection_worker(url, deadline, stats, timeout) for _ in range(concurrency)))
+    return stats
+
+
+# --- Mode journey -----------------------------------------------------------
+
+JOURNEYS = ('guest', 'applicant', 'company', 'idle')
+SEARCH_TERMS = ('', 'developer', 'data', 'engineer', 'designer', 'marketing', 'analyst', 'manager')
+
+_CSRF_RE = re.compile(rb'name="csrf_token"[^>]*value="([^"]+)"')
+_JOB_ID_RE = re.compile(rb'data-job-id="(\d+)"')
+_ACCEPT_RE = re.compile(rb'/company/application/(\d+)/accept')
+_LAST_PAGE_RE = re.compile(rb'[?&]page=(\d+)')
+
+
+class StepFailed(Exception):
+    """Langkah journey gagal; iterasi dihentikan dan dimulai ulang."""
+
+
+def build_multipart(fields, files):
+    """Body multipart/form-data; files = {name: (filename, content_type, bytes)}."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+                     .encode('utf-8'))
+    for name, (filename, content_type, content) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: {content_type}\r\n\r\n'.encode('utf-8') + content + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode('ascii'))
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def fake_cv(size_kb):
+    """PDF minimal yang lolos FileAllowed(['pdf']), dipadatkan sampai ~size_kb."""
+    head = b'%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\n'
+    tail = b'\ntrailer << /Root 1 0 R >>\n%%EOF\n'
+    return head + b'%' + b'x' * max(0, size_kb * 1024 - len(head) - len(tail) - 1) + tail
+
+
+class HttpSession:
+    """Satu virtual user: koneksi keep-alive + cookie jar, dan pencatatan per langkah."""
+
+    def __init__(self, base_url, steps, timeout):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.netloc = parts.netloc
+        self.steps = steps
+        self.timeout = timeout
+        self.cookies = {}
+        self.reader = self.writer = None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    def _store_cookies(self, headers):
+        for raw in headers.get('set-cookie', []):
+            pair = raw.split(';', 1)[0]
+            name, _, value = pair.partition('=')
+            name, value = name.strip(), value.strip().strip('"')
+            if value and 'max-age=0' not in raw.lower():
+                self.cookies[name] = value
+            else:
+                self.cookies.pop(name, None)
+
+    async def request(self, step, method, path, expect=(200,), headers=None, body=b''):
+        """Kirim satu request dan catat latensinya di self.steps[step]; kembalikan (status, headers, body)."""
+        stats = self.steps.setdefault(step, Stats())
+        headers = dict(headers or {})
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.cookies.items())
+        payload = build_request(method, self.netloc, path, headers, body)
+
+        start = time.perf_counter()
+        try:
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout)
+            self.writer.write(payload)
+            await self.writer.drain()
+            status, resp_headers, resp_body, keep_alive = await asyncio.wait_for(
+                read_response(self.reader), self.timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            stats.errors += 1
+            self.close()
+            raise StepFailed(f'{step}: {e.__class__.__name__}') from e
+        elapsed = time.perf_counter() - start
+
+        if not keep_alive:
+            self.close()
+        self._store_cookies(resp_headers)
+        if status == 429:
+            stats.limited += 1
+        if status not in expect:
+            stats.errors += 1
+            raise StepFailed(f'{step}: HTTP {status}')
+        stats.latencies.append(elapsed)
+        return status, resp_headers, resp_body
+
+    async def get_form(self, step, path):
+        _, _, body = await self.request(step, 'GET', path)
+        match = _CSRF_RE.search(body)
+        return match.group(1).decode() if match else None
+
+    async def login(self, step, email, password):
+        token = await self.get_form(f'{step}-form', '/login')
+        fields = {'email': email, 'password': password}
+        if token:
+            fields['csrf_token'] = token
+        # Login sukses = 302 ke dashboard; 200 berarti form dirender ulang (kredensial salah)
+        await self.request(step, 'POST', '/login', expect=(302,),
+                           headers={'Content-Type': 'application/x-www-form-urlencoded'},
+                           body=urlencode(fields).encode())
+
+
+def _account(opts, role, index):
+    count = opts.applicants if role == 'applicant' else opts.companies
+    return f'{opts.prefix}-{role}-{index % count + 1}@example.com'
+
+
+async def _think(opts):
+    if opts.think:
+        await asyncio.sleep(random.uniform(0, 2 * opts.think))
+
+
+async def guest_journey(session, opts, index, deadline):
+    max_page = 1
+    while time.monotonic() < deadline:
+        params = {'search': random.choice(SEARCH_TERMS), 'page': random.randint(1, max_page)}
+        _, _, body = await session.request('guest:search', 'GET', '/?' + urlencode(params))
+        pages = [int(p) for p in _LAST_PAGE_RE.findall(body)]
+        if not params['search'] and pages:
+            max_page = max(max_page, min(max(pages), 50))
+        job_ids = _JOB_ID_RE.findall(body)
+        await _think(opts)
+        if job_ids:
+            await session.request('guest:job', 'GET', f'/job/{random.choice(job_ids).decode()}')
+            await _think(opts)
+        yield
+
+
+async def applicant_journey(session, opts, index, deadline):
+    await session.login('applicant:login', _account(opts, 'applicant', index), opts.password)
+    cv = fake_cv(opts.cv_kb)
+    tried = set()
+    while time.monotonic() < deadline:
+        _, _, body = await session.request('applicant:browse', 'GET',
+                                           '/?' + urlencode({'page': random.randint(1, opts.pages)}))
+        candidates = [int(j) for j in _JOB_ID_RE.findall(body) if int(j) not in tried]
+        if not candidates:
+            yield
+            continue
+        job_id = random.choice(candidates)
+        tried.add(job_id)
+        # Sudah melamar / lowongan tutup / slot penuh -> apply() me-redirect tanpa form
+        status, _, body = await session.request('applicant:apply-form', 'GET', f'/apply/{job_id}',
+                                                expect=(200, 302))
+        if status == 302:
+            yield
+            continue
+        await _think(opts)
+        fields = {'cover_letter': 'Saya tertarik dengan posisi ini. ' * 5}
+        match = _CSRF_RE.search(body)
+        if match:
+            fields['csrf_token'] = match.group(1).decode()
+        body, content_type = build_multipart(fields, {'cv_file': ('cv.pdf', 'application/pdf', cv)})
+        # Sukses = redirect; 200 berarti validasi form gagal
+        await session.request('applicant:apply-submit', 'POST', f'/apply/{job_id}', expect=(302,),
+                              headers={'Content-Type': content_type}, body=body)
+        await _think(opts)
+        yield
+
+
+async def company_journey(session, opts, index, deadline):
+    await session.login('company:login', _account(opts, 'company', index), opts.password)
+    while time.monotonic() < deadline:
+        _, _, body = await session.request('company:applications', 'GET',
+                                           '/company/applications?' + urlencode({'status': 'Pending'}))
+        pending = _ACCEPT_RE.findall(body)
+        await _think(opts)
+        if pending:
+            await session.request('company:accept', 'POST',
+                                  f'/company/application/{random.choice(pending).decode()}/accept',
+                                  expect=(302,))
+            await _think(opts)
+        yield
+
+
+async def idle_journey(session, opts, index, deadline):
+    await session.login('idle:login', _account(opts, 'applicant', index), opts.password)
+    etag = None
+    while time.monotonic() < deadline:
+        headers = {'If-None-Match': etag} if etag else {}
+        status, resp_headers, _ = await session.request('idle:unread-count', 'GET',
+                                                        '/notifications/unread-count',
+                                                        expect=(200, 304), headers=headers)
+        if status == 200:
+            etag = resp_headers.get('etag', [None])[0]
+            await session.request('idle:notifications', 'GET', '/notifications')
+        await asyncio.sleep(random.uniform(0.5, 1.5) * opts.poll_interval)
+        yield
+
+
+JOURNEY_FUNCS = {
+    'guest': guest_journey,
+    'applicant': applicant_journey,
+    'company': company_journey,
+    'idle': idle_journey,
+}
+
+
+async def _virtual_user(name, index, opts, steps, iterations, deadline):
+    # Start disebar selama --ramp-up agar login tidak datang serentak
+    await asyncio.sleep(random.uniform(0, opts.ramp_up))
+    while time.monotonic() < deadline:
+        session = HttpSession(opts.base_url, steps, opts.timeout)
+        try:
+            async for _ in JOURNEY_FUNCS[name](session, opts, index, deadline):
+                iterations[name] = iterations.get(name, 0) + 1
+        except StepFailed:
+            # Mulai ulang dengan sesi baru (login ulang) setelah jeda singkat
+            await asyncio.sleep(0.5)
+        finally:
+            session.close()
+
+
+async def run_journeys(opts, mix):
+    steps, iterations = {}, {}
+    deadline = time.monotonic() + opts.ramp_up + opts.duration
+    users = [
+        _virtual_user(name, index, opts, steps, iterations, deadline)
+        for name, count in mix.items() for index in range(count)
+    ]
+    await asyncio.gather(*users)
+    return steps, iterations
+
+
+def parse_mix(value):
+    """'guest=20,idle=50' -> {'guest': 20, 'idle': 50}."""
+    mix = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        name, _, count = item.partition('=')
+        name = name.strip()
+        if name not in JOURNEYS:
+            raise argparse.ArgumentTypeError(f'Journey tidak dikenal: {name} (pilihan: {", ".join(JOURNEYS)})')
+        mix[name] = int(count or 1)
+    return mix
+
+
+def report_journeys(steps, iterations, elapsed):
+    print(f"{'langkah':<24} {'req':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err %':>6} {'429':>5}")
+    for step in sorted(steps, key=lambda s: (JOURNEYS.index(s.split(':')[0]), s)):
+        stats = steps[step]
+        done = len(stats.latencies)
+        error_rate = stats.errors / max(done + stats.errors, 1)
+        print(f'{step:<24} {done:>7} {done / elapsed:>8.1f} {stats.percentile(50):>8.1f} '
+              f'{stats.percentile(95):>8.1f} {stats.percentile(99):>8.1f} {error_rate * 100:>6.2f} '
+              f'{stats.limited:>5}')
+    print('Iterasi selesai: ' + ', '.join(f'{name}={iterations.get(name, 0)} '
+                                          f'({iterations.get(name, 0) / elapsed:.1f}/s)'
+                                          for name in JOURNEYS if name in iterations))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Mode concurrency sweep: satu URL GET.')
+    parser.add_argument('--concurrency', default='10,50,100,250,500,1000')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+
+    journey = parser.add_argument_group('mode journey')
+    journey.add_argument('--base-url', default='http://127.0.0.1:8000')
+    journey.add_argument('--journeys', type=parse_mix, help='Virtual user per journey, mis. guest=20,idle=50.')
+    journey.add_argument('--ramp-up', type=float, default=5.0, help='Detik untuk menyebar start virtual user.')
+    journey.add_argument('--think', type=float, default=0.5, help='Rata-rata jeda antar langkah (detik).')
+    journey.add_argument('--poll-interval', type=float, default=5.0, help='Interval polling tab idle (detik).')
+    journey.add_argument('--prefix', default='loadtest', help='Prefix akun dari `flask loadtest-seed`.')
+    journey.add_argument('--password', default='loadtest123')
+    journey.add_argument('--applicants', type=int, default=50, help='Jumlah akun applicant yang di-seed.')
+    journey.add_argument('--companies', type=int, default=5, help='Jumlah akun company yang di-seed.')
+    journey.add_argument('--pages', type=int, default=5, help='Halaman index yang dijelajahi applicant.')
+    journey.add_argument('--cv-kb', type=int, default=100, help='Ukuran CV yang di-upload (KB).')
+    args = parser.parse_args(argv)
+
+    if args.journeys:
+        start = time.monotonic()
+        steps, iterations = asyncio.run(run_journeys(args, args.journeys))
+        report_journeys(steps, iterations, time.monotonic() - start)
+        return
+    if not args.url:
+        parser.error('gunakan --url (concurrency sweep) atau --journeys (mode journey)')
+
+    print(f"{'conc':>6} {'peak':>6} {'req':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err %':>6}")
+    sustained = 0
+    for level in [int(c) for c in args.concurrency.split(',') if c.strip()]:
+        stats = asyncio.run(run_level(args.url, level, args.duration, args.timeout))
+        done = len(stats.latencies)
+        error_rate = stats.errors / max(done + stats.errors, 1)
+        print(f'{level:>6} {stats.peak_connections:>6} {done:>8} {done / args.duration:>9.1f} '
+              f'{stats.percentile(50):>8.1f} {stats.percentile(95):>8.1f} {stats.percentile(99):>8.1f} '
+              f'{error_rate * 100:>6.2f}')
+        if error_rate > args.max_error_rate:
+            break
+        sustained = level
+    print(f'Concurrency tertinggi dengan error <= {args.max_error_rate:.0%}: {sustained}')
+
+
+if __name__ == '__main__':
+    main()
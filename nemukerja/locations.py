@@ -0,0 +1,183 @@
+"""Dimensi lokasi ternormalisasi: provinsi -> kota, beserta alias.
+
+`JobListing.location` tetap teks bebas untuk tampilan, sedangkan
+`JobListing.id_location` menunjuk ke baris `locations` hasil resolusi alias
+("Jaksel", "jakarta selatan", "Kota Jakarta Selatan" -> Jakarta Selatan).
+Filter lokasi di index() memakai ID ini: memilih provinsi juga mencakup
+semua kotanya.
+"""
+import re
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import joinedload
+
+from nemukerja.models import JobListing, Location, LocationAlias
+
+# provinsi/wilayah -> (alias, {kota: alias})
+SEED_LOCATIONS = {
+    'DKI Jakarta': (['jakarta', 'dki', 'jkt', 'jabodetabek'], {
+        'Jakarta Selatan': ['jaksel', 'south jakarta'],
+        'Jakarta Pusat': ['jakpus', 'central jakarta'],
+        'Jakarta Barat': ['jakbar', 'west jakarta'],
+        'Jakarta Timur': ['jaktim', 'east jakarta'],
+        'Jakarta Utara': ['jakut', 'north jakarta'],
+    }),
+    'Jawa Barat': (['jabar', 'west java'], {
+        'Bandung': [], 'Bogor': [], 'Bekasi': [], 'Depok': [], 'Cimahi': [],
+        'Cirebon': [], 'Karawang': [],
+    }),
+    'Banten': ([], {
+        'Tangerang': [], 'Tangerang Selatan': ['tangsel'], 'Serang': [], 'Cilegon': [],
+    }),
+    'Jawa Tengah': (['jateng', 'central java'], {
+        'Semarang': [], 'Surakarta': ['solo'], 'Magelang': [],
+    }),
+    'DI Yogyakarta': (['yogyakarta', 'yogya', 'jogja', 'jogjakarta', 'diy'], {
+        'Sleman': [], 'Bantul': [],
+    }),
+    'Jawa Timur': (['jatim', 'east java'], {
+        'Surabaya': [], 'Malang': [], 'Sidoarjo': [],
+    }),
+    'Bali': ([], {'Denpasar': [], 'Badung': []}),
+    'Sumatera Utara': (['sumut', 'north sumatra'], {'Medan': []}),
+    'Sumatera Selatan': (['sumsel', 'south sumatra'], {'Palembang': []}),
+    'Sulawesi Selatan': (['sulsel', 'south sulawesi'], {'Makassar': []}),
+    'Kalimantan Timur': (['kaltim', 'east kalimantan'], {'Balikpapan': [], 'Samarinda': []}),
+    'Kepulauan Riau': (['kepri'], {'Batam': []}),
+}
+REMOTE_ALIASES = ['wfh', 'work from home', 'anywhere', 'remote indonesia', 'online']
+
+_PREFIXES = ('kota ', 'kabupaten ', 'kab ', 'provinsi ', 'prov ')
+
+
+def normalize_location(text):
+    """'  Kota Jakarta-Selatan ' -> 'jakarta selatan'."""
+    text = ' '.join(re.sub(r'[^0-9a-z]+', ' ', (text or '').lower()).split())
+    for prefix in _PREFIXES:
+        if text.startswith(prefix):
+            text = text[len(prefix):]
+    return text
+
+
+def location_candidates(text):
+    """Alias yang dicoba berurutan: teks utuh, lalu tiap bagian dipisah koma."""
+    candidates = []
+    for part in [text] + (text or '').split(','):
+        normalized = normalize_location(part)
+        if normalized and normalized not in candidates:
+            candidates.append(normalized)
+    return candidates
+
+
+def alias_lookup_statement(candidates):
+    return select(LocationAlias.alias, LocationAlias.id_location).where(LocationAlias.alias.in_(candidates))
+
+
+def pick_alias(rows, candidates):
+    found = dict(rows)
+    return next((found[c] for c in candidates if c in found), None)
+
+
+def resolve_location_id(session, text):
+    candidates = location_candidates(text)
+    if not candidates:
+        return None
+    return pick_alias(session.execute(alias_lookup_statement(candidates)).all(), candidates)
+
+
+def resolve_search_location(params, session):
+    """Isi params['location_id'] dari teks lokasi bila belum ada (untuk index())."""
+    if params['location'] and not params['location_id']:
+        params['location_id'] = resolve_location_id(session, params['location'])
+    return params
+
+
+def _get_or_create(session, name, kind, parent=None):
+    location = session.scalar(select(Location).where(Location.name == name, Location.kind == kind))
+    if location is None:
+        location = Location(name=name, kind=kind, parent=parent)
+        session.add(location)
+        session.flush()
+    return location
+
+
+def _add_aliases(session, location, aliases):
+    added = 0
+    for alias in [location.name] + list(aliases):
+        alias = normalize_location(alias)
+        # Alias pertama yang terdaftar menang (provinsi didaftarkan sebelum kotanya)
+        if alias and session.get(LocationAlias, alias) is None:
+            session.add(LocationAlias(alias=alias, id_location=location.id))
+            session.flush()
+            added += 1
+    return added
+
+
+def seed_locations(session):
+    """Isi tabel locations/location_aliases dari SEED_LOCATIONS (idempoten)."""
+    added = 0
+    for province_name, (province_aliases, cities) in SEED_LOCATIONS.items():
+        province = _get_or_create(session, province_name, 'province')
+        added += _add_aliases(session, province, province_aliases)
+        for city_name, city_aliases in cities.items():
+            city = _get_or_create(session, city_name, 'city', parent=province)
+            added += _add_aliases(session, city, city_aliases)
+    remote = _get_or_create(session, 'Remote', 'remote')
+    added += _add_aliases(session, remote, REMOTE_ALIASES)
+    session.commit()
+    return added
+
+
+def backfill_job_locations(session):
+    """Petakan job_listings.location (teks) ke id_location, satu UPDATE per teks unik.
+
+    Mengembalikan (jumlah_baris_terpetakan, [(teks, jumlah)] yang tidak dikenali).
+    """
+    texts = session.execute(
+        select(JobListing.location, func.count())
+        .where(JobListing.id_location.is_(None), JobListing.location.isnot(None))
+        .group_by(JobListing.location)
+    ).all()
+
+    mapped, unmatched = 0, []
+    for text, count in texts:
+        location_id = resolve_location_id(session, text)
+        if location_id is None:
+            unmatched.append((text, count))
+            continue
+        result = session.execute(
+            update(JobListing)
+            .where(JobListing.location == text, JobListing.id_location.is_(None))
+            .values(id_location=location_id)
+            .execution_options(synchronize_session=False)
+        )
+        mapped += result.rowcount
+        session.commit()
+    return mapped, unmatched
+
+
+def _prefix_upper_bound(prefix):
+    # 'jak' -> 'jal': alias >= 'jak' AND alias < 'jal' tetap memakai indeks PK alias
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def autocomplete_locations(session, query, limit=10):
+    prefix = normalize_location(query)
+    if not prefix:
+        return []
+    rows = session.execute(
+        select(Location)
+        .options(joinedload(Location.parent))
+        .join(LocationAlias, LocationAlias.id_location == Location.id)
+        .where(LocationAlias.alias >= prefix, LocationAlias.alias < _prefix_upper_bound(prefix))
+        .order_by(Location.name)
+        .limit(limit * 3)
+    ).scalars().all()
+
+    results, seen = [], set()
+    for location in rows:
+        if location.id in seen:
+            continue
+        seen.add(location.id)
+        results.append(location.to_dict())
+    return results[:limit]
@@ -0,0 +1,362 @@
+"""Metrik operasional format Prometheus untuk endpoint /metrics.
+
+Setiap proses (worker gunicorn/uvicorn) mengumpulkan counter dan histogram di
+memori sendiri; satu observasi = satu kunci thread lokal yang hampir tidak
+pernah diperebutkan. Secara berkala (METRICS_FLUSH_SECONDS) snapshot proses
+ditulis atomik ke METRICS_DIR/<pid>-<token>.json. /metrics menjumlahkan semua
+file tersebut, jadi hasil scrape sama di worker mana pun permintaan mendarat.
+
+File milik proses yang sudah mati dilipat ke `archived.json` (counter dan
+histogram tetap monoton setelah worker di-restart); gauge proses mati dibuang.
+
+Akses: jika METRICS_TOKEN diisi, wajib header `Authorization: Bearer <token>`;
+jika kosong hanya permintaan langsung dari localhost yang dilayani.
+"""
+import atexit
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import Response, abort, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# nama -> (tipe, deskripsi, bucket histogram)
+METRICS = {
+    'nemukerja_http_requests_total': (
+        'counter', 'Permintaan HTTP per endpoint, method dan status.', None),
+    'nemukerja_http_request_duration_seconds': (
+        'histogram', 'Latensi permintaan HTTP per endpoint.', LATENCY_BUCKETS),
+    'nemukerja_db_queries_per_request': (
+        'histogram', 'Jumlah query SQL per permintaan HTTP.', (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)),
+    'nemukerja_db_commits_per_request': (
+        'histogram', 'Jumlah COMMIT database per permintaan HTTP.', (0, 1, 2, 3, 5)),
+    'nemukerja_db_pool_checked_out': (
+        'gauge', 'Koneksi pool yang sedang dipinjam (jumlah semua proses hidup).', None),
+    'nemukerja_db_pool_overflow': (
+        'gauge', 'Koneksi overflow di atas pool_size (jumlah semua proses hidup).', None),
+    'nemukerja_cv_upload_bytes': (
+        'histogram', 'Ukuran file CV yang diunggah.',
+        (64 * 1024, 256 * 1024, 1024 ** 2, 2 * 1024 ** 2, 5 * 1024 ** 2, 10 * 1024 ** 2)),
+    'nemukerja_cv_upload_duration_seconds': (
+        'histogram', 'Durasi menyimpan file CV.', LATENCY_BUCKETS),
+    'nemukerja_cv_preview_duration_seconds': (
+        'histogram', 'Durasi render preview CV (thumbnail + teks) di latar belakang.', LATENCY_BUCKETS),
+    'nemukerja_job_notification_fanout': (
+        'histogram', 'Jumlah notifikasi yang dibuat per lowongan baru (add_job).',
+        (0, 10, 100, 1000, 10_000, 100_000)),
+    'nemukerja_bcrypt_duration_seconds': (
+        'histogram', 'Durasi hash/cek password bcrypt.', (0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0)),
+    'nemukerja_query_cache_requests_total': (
+        'counter', 'Lookup query cache per nama query dan hasil (hit/miss/bypass).', None),
+}
+
+ARCHIVE_FILE = 'archived.json'
+_atexit_registered = False
+
+
+class _Registry:
+    """Counter dan histogram milik satu proses."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self.token = f'{time.time_ns():x}'
+        self.counters = {}
+        self.histograms = {}
+        self.last_flush = time.monotonic()
+
+    def _check_fork(self):
+        # Setelah fork (gunicorn --preload) proses anak mulai dari nol, bukan salinan induk
+        if self.pid != os.getpid():
+            self._lock = threading.Lock()
+            self._reset()
+
+    def inc(self, name, value=1, labels=()):
+        self._check_fork()
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        self._check_fork()
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            hist[0][bisect_left(buckets, value)] += 1
+            hist[1] += value
+            hist[2] += 1
+
+    def snapshot(self, gauges=()):
+        with self._lock:
+            return {
+                'pid': self.pid,
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), list(h[0]), h[1], h[2]]
+                               for (name, labels), h in self.histograms.items()],
+                'gauges': [[name, list(labels), value] for name, labels, value in gauges],
+            }
+
+
+_registry = _Registry()
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    _registry.inc(name, value, _labels(labels))
+
+
+def observe(name, value, **labels):
+    _registry.observe(name, value, _labels(labels))
+
+
+@contextmanager
+def timed(name, **labels):
+    """Catat durasi blok `with` ke histogram `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def record_request(endpoint, method, status, duration, queries=None, commits=None):
+    inc('nemukerja_http_requests_total', endpoint=endpoint, method=method, status=str(status))
+    observe('nemukerja_http_request_duration_seconds', duration, endpoint=endpoint, method=method)
+    if queries is not None:
+        observe('nemukerja_db_queries_per_request', queries, endpoint=endpoint)
+    if commits is not None:
+        observe('nemukerja_db_commits_per_request', commits, endpoint=endpoint)
+
+
+# --- Agregasi multi-proses --------------------------------------------------
+
+def _pool_gauges(app):
+    engines = app.extensions['sqlalchemy'].engines
+    for bind, engine in engines.items():
+        pool = engine.pool
+        # Hanya QueuePool punya checkedout()/overflow(); NullPool/StaticPool dilewati
+        if hasattr(pool, 'checkedout') and hasattr(pool, 'overflow'):
+            labels = [['bind', bind or 'default']]
+            yield 'nemukerja_db_pool_checked_out', labels, pool.checkedout()
+            yield 'nemukerja_db_pool_overflow', labels, max(pool.overflow(), 0)
+
+
+def _write_json(path, data):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def flush(directory, gauges=()):
+    """Tulis snapshot proses ini ke METRICS_DIR (atomik via os.replace)."""
+    _registry._check_fork()
+    if not (_registry.counters or _registry.histograms or gauges):
+        return  # Mis. proses CLI yang tidak melayani permintaan
+    try:
+        os.makedirs(directory, exist_ok=True)
+        _write_json(os.path.join(directory, f'{_registry.pid}-{_registry.token}.json'),
+                    _registry.snapshot(gauges))
+    except OSError:
+        logger.exception('Gagal menulis snapshot metrik ke %s', directory)
+    _registry.last_flush = time.monotonic()
+
+
+def maybe_flush(app):
+    if time.monotonic() - _registry.last_flush >= app.config['METRICS_FLUSH_SECONDS']:
+        flush(app.config['METRICS_DIR'], list(_pool_gauges(app)))
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(total, snapshot, include_gauges=True):
+    for name, labels, value in snapshot['counters']:
+        key = (name, tuple(map(tuple, labels)))
+        total['counters'][key] = total['counters'].get(key, 0) + value
+    for name, labels, counts, hist_sum, count in snapshot['histograms']:
+        key = (name, tuple(map(tuple, labels)))
+        hist = total['histograms'].get(key)
+        if hist is None or len(hist[0]) != len(counts):
+            hist = total['histograms'][key] = [[0] * len(counts), 0.0, 0]
+        hist[0] = [a + b for a, b in zip(hist[0], counts)]
+        hist[1] += hist_sum
+        hist[2] += count
+    if include_gauges:
+        for name, labels, value in snapshot.get('gauges', ()):
+            key = (name, tuple(map(tuple, labels)))
+            total['gauges'][key] = total['gauges'].get(key, 0) + value
+
+
+def _as_snapshot(total):
+    return {
+        'counters': [[name, list(labels), value] for (name, labels), value in total['counters'].items()],
+        'histograms': [[name, list(labels), h[0], h[1], h[2]] for (name, labels), h in total['histograms'].items()],
+    }
+
+
+def collect(directory):
+    """Jumlahkan snapshot semua proses; file proses mati dilipat ke archived.json."""
+    total = {'counters': {}, 'histograms': {}, 'gauges': {}}
+    if not os.path.isdir(directory):
+        return total
+    with open(os.path.join(directory, '.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            archive_path = os.path.join(directory, ARCHIVE_FILE)
+            archive = {'counters': {}, 'histograms': {}, 'gauges': {}}
+            if os.path.exists(archive_path):
+                with open(archive_path) as f:
+                    _merge(archive, json.load(f), include_gauges=False)
+            dead = []
+            for filename in os.listdir(directory):
+                if not filename.endswith('.json') or filename == ARCHIVE_FILE:
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    with open(path) as f:
+                        snapshot = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if _pid_alive(snapshot['pid']):
+                    _merge(total, snapshot)
+                else:
+                    _merge(archive, snapshot, include_gauges=False)
+                    dead.append(path)
+            if dead:
+                _write_json(archive_path, _as_snapshot(archive))
+                for path in dead:
+                    os.remove(path)
+            _merge(total, _as_snapshot(archive), include_gauges=False)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    return total
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(total):
+    """Format teks Prometheus (exposition format 0.0.4)."""
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'histogram':
+            for (metric, labels), (counts, hist_sum, count) in sorted(total['histograms'].items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(list(buckets) + ['+Inf'], counts):
+                    cumulative += bucket_count
+                    le = bound if bound == '+Inf' else _format_value(bound)
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", le)])} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(hist_sum)}')
+                lines.append(f'{name}_count{_format_labels(labels)} {count}')
+        else:
+            source = total['counters'] if kind == 'counter' else total['gauges']
+            for (metric, labels), value in sorted(source.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+# --- Integrasi Flask ----------------------------------------------------------
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    # Hit query cache (querycache.ReplayCursor) bukan round trip ke database
+    if getattr(context.cursor, 'from_cache', False):
+        return
+    if has_request_context():
+        g._metrics_queries = g.get('_metrics_queries', 0) + 1
+
+
+def _count_commit(conn):
+    # COMMIT yang benar-benar dikirim ke database (session tanpa query tidak dihitung)
+    if has_request_context():
+        g._metrics_commits = g.get('_metrics_commits', 0) + 1
+
+
+def _authorized():
+    token = current_app.config['METRICS_TOKEN']
+    if token:
+        return request.headers.get('Authorization') == f'Bearer {token}'
+    # Tanpa token: hanya localhost langsung. Lewat reverse proxy remote_addr juga
+    # 127.0.0.1, jadi permintaan yang membawa X-Forwarded-For ditolak.
+    return request.remote_addr in ('127.0.0.1', '::1') and 'X-Forwarded-For' not in request.headers
+
+
+def init_metrics(app):
+    if not app.config['METRICS_ENABLED']:
+        return
+    directory = app.config['METRICS_DIR']
+
+    if not event.contains(Engine, 'after_cursor_execute', _count_query):
+        event.listen(Engine, 'after_cursor_execute', _count_query)
+    if not event.contains(Engine, 'commit', _count_commit):
+        event.listen(Engine, 'commit', _count_commit)
+
+    @app.before_request
+    def start_request_timer():
+        g._metrics_start = time.perf_counter()
+        g._metrics_queries = 0
+        g._metrics_commits = 0
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            endpoint = request.url_rule.endpoint if request.url_rule else 'unmatched'
+            record_request(endpoint, request.method, response.status_code,
+                           time.perf_counter() - start, g.pop('_metrics_queries', 0),
+                           g.pop('_metrics_commits', 0))
+        maybe_flush(app)
+        return response
+
+    def metrics_view():
+        if not _authorized():
+            abort(403)
+        flush(directory, list(_pool_gauges(app)))
+        return Response(render(collect(directory)), mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+    # Sisa observasi sejak flush terakhir ikut tersimpan saat worker berhenti normal
+    global _atexit_registered
+    if not _atexit_registered:
+        atexit.register(flush, directory)
+        _atexit_registered = True
@@ -9,7 +9,7 @@ class User(db.Model, UserMixin):
     email = db.Column(db.String(255), unique=True, nullable=False)
     password = db.Column('password', db.String(255), nullable=False)
     role = db.Column(db.Enum('applicant', 'company','admin'), nullable=False)
-    created_at = db.Column(db.TIMESTAMP, server_default=func.now())
+    created_at = db.Column(db.TIMESTAMP, server_default=func.now(), index=True)
     updated_at = db.Column(db.TIMESTAMP, server_default=func.now(), onupdate=func.now())
 
     applicant_profile = db.relationship('Applicant', backref='user', uselist=False, cascade="all, delete-orphan")
@@ -38,6 +38,10 @@ class Applicant(db.Model):
     id_user = db.Column(db.Integer, db.ForeignKey('users.id_user'), nullable=False)
     full_name = db.Column(db.String(255))
     cv_path = db.Column(db.String(255))
+    # Preview CV (previews.py); dikosongkan setiap kali cv_path berubah
+    cv_preview_text = db.Column(db.Text)
+    cv_preview_thumb = db.Column(db.Boolean, default=False, nullable=False)
+    cv_preview_at = db.Column(db.TIMESTAMP, nullable=True)
     skills = db.Column(db.Text)
     created_at = db.Column(db.TIMESTAMP, server_default=func.now())
     updated_at = db.Column(db.TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -74,25 +78,115 @@ class JobListing(db.Model):
     description = db.Column(db.Text, nullable=False)
     qualifications = db.Column(db.Text, nullable=False)
     location = db.Column(db.String(255))
+    # Lokasi ternormalisasi (locations.py); diisi saat simpan dan oleh `flask locations-backfill`
+    id_location = db.Column(db.Integer, db.ForeignKey('locations.id_location'), nullable=True, index=True)
     salary_min = db.Column(db.Integer, default=0)
     salary_max = db.Column(db.Integer, default=0)
     slots = db.Column(db.Integer, default=1, nullable=False)
     is_open = db.Column(db.Boolean, default=True, nullable=False)
-    posted_at = db.Column(db.TIMESTAMP, server_default=func.now())
+    posted_at = db.Column(db.TIMESTAMP, server_default=func.now(), index=True)
+    # Waktu lowongan terakhir ditutup (rollup harian "jobs_closed"); None selama masih buka
+    closed_at = db.Column(db.TIMESTAMP, nullable=True, index=True)
+    # Batas waktu opsional; lewat dari ini lowongan ditutup oleh `flask sweeper`
+    expires_at = db.Column(db.TIMESTAMP, nullable=True)
+    # Diisi saat lowongan dihapus dengan JOB_DELETE_MODE=archive (jobremoval.py); None = aktif
+    archived_at = db.Column(db.TIMESTAMP, nullable=True)
     updated_at = db.Column(db.TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    # Naik di setiap UPDATE (ORM maupun massal, mis. sweeper); kunci fragment cache kartu job.
+    # updated_at hanya beresolusi detik: tutup lalu buka lagi di detik yang sama tidak mengubahnya
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0',
+                        onupdate=db.text('version + 1'))
+
+    # Lamaran dihapus oleh ON DELETE CASCADE di database, tidak dimuat satu per satu oleh ORM
+    applications = db.relationship('Application', backref='job', cascade="all, delete-orphan",
+                                   passive_deletes=True)
+
+    # Sweeper: lowongan terbuka yang sudah kedaluwarsa, tanpa scan seluruh tabel
+    __table_args__ = (
+        db.Index('ix_job_listings_open_expires', 'is_open', 'expires_at'),
+    )
+
+    def to_dict(self, applied_count):
+        # Dipakai /job/<id>, /api/jobs dan jalur async (asgi.py); company harus sudah dimuat
+        return {
+            'id': self.id,
+            'title': self.title,
+            'location': self.location,
+            'salary_min': self.salary_min,
+            'salary_max': self.salary_max,
+            'description': self.description,
+            'qualifications': self.qualifications,
+            'company': self.company.company_name if self.company else "N/A",
+            'applied_count': applied_count,
+            'slots': self.slots,
+            'is_open': self.is_open
+        }
+
+class Location(db.Model):
+    """Provinsi/kota kanonik; kota menunjuk ke provinsinya lewat id_parent."""
+    __tablename__ = 'locations'
+
+    id = db.Column('id_location', db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    kind = db.Column(db.Enum('province', 'city', 'remote'), nullable=False)
+    id_parent = db.Column(db.Integer, db.ForeignKey('locations.id_location'), nullable=True, index=True)
+
+    parent = db.relationship('Location', remote_side=[id], backref='children')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'kind': self.kind,
+            'parent': self.parent.name if self.parent else None,
+        }
+
+
+class LocationAlias(db.Model):
+    # Alias sudah dinormalisasi (huruf kecil, tanpa tanda baca/prefiks "kota")
+    __tablename__ = 'location_aliases'
+
+    alias = db.Column(db.String(100), primary_key=True)
+    id_location = db.Column(db.Integer, db.ForeignKey('locations.id_location'), nullable=False, index=True)
 
-    applications = db.relationship('Application', backref='job', cascade="all, delete-orphan")
 
 class Application(db.Model):
     __tablename__ = 'applications'
     id = db.Column('id_application', db.Integer, primary_key=True)
     id_applicant = db.Column(db.Integer, db.ForeignKey('applicants.id_applicant'), nullable=False)
-    id_job = db.Column(db.Integer, db.ForeignKey('job_listings.id_job'), nullable=False)
+    id_job = db.Column(db.Integer, db.ForeignKey('job_listings.id_job', ondelete='CASCADE'), nullable=False)
     status = db.Column(db.Enum('Pending','Diterima','Ditolak'), nullable=False, default='Pending')
     notes = db.Column(db.Text)
-    applied_at = db.Column(db.TIMESTAMP, server_default=func.now())
+    applied_at = db.Column(db.TIMESTAMP, server_default=func.now(), index=True)
+    # Waktu perusahaan pertama kali menerima/menolak (untuk time-to-first-response di funnel)
+    responded_at = db.Column(db.TIMESTAMP, nullable=True, index=True)
     updated_at = db.Column(db.TIMESTAMP, server_default=func.now(), onupdate=func.now())
 
+    # Inbox perusahaan: filter per job + status, urut/rentang applied_at
+    __table_args__ = (
+        db.Index('ix_applications_job_status_applied', 'id_job', 'status', 'applied_at'),
+    )
+
+    def to_dict(self):
+        # Dipakai feed inbox perusahaan; job dan applicant.user sebaiknya sudah di-eager-load
+        return {
+            'id': self.id,
+            'status': self.status,
+            'notes': self.notes,
+            'applied_at': self.applied_at.isoformat() if self.applied_at else None,
+            'responded_at': self.responded_at.isoformat() if self.responded_at else None,
+            'job': {
+                'id': self.job.id,
+                'title': self.job.title,
+                'location': self.job.location,
+            },
+            'applicant': {
+                'id': self.applicant.id,
+                'full_name': self.applicant.full_name,
+                'email': self.applicant.user.email,
+            },
+        }
+
 class Notification(db.Model):
     __tablename__ = 'notifications'
 
@@ -116,4 +210,73 @@ class Notification(db.Model):
             'is_read': self.is_read,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'related_id': self.related_id
-        }
\ No newline at end of file
+        }
+
+
+class NotificationCounter(db.Model):
+    """Jumlah notifikasi belum dibaca per user (dijaga oleh notify.py)."""
+    __tablename__ = 'notification_counters'
+
+    id_user = db.Column(db.Integer, primary_key=True)  # Tanpa FK, sama seperti activity_events
+    unread = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailyRollup(db.Model):
+    """Agregat harian untuk halaman tren admin (diisi `flask rollup`, lihat rollup.py).
+
+    Satu baris = nilai satu metrik pada satu hari untuk satu dimensi, contoh
+    ('jobs_posted', 'company', '12') atau ('registrations', 'role', 'applicant').
+    Dimensi 'all' (dimension_key '') adalah total keseluruhan.
+    """
+    __tablename__ = 'daily_rollups'
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    metric = db.Column(db.String(50), nullable=False)
+    dimension = db.Column(db.String(20), nullable=False)
+    dimension_key = db.Column(db.String(255), nullable=False, default='')
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('metric', 'dimension', 'dimension_key', 'day', name='uq_daily_rollups_series_day'),
+    )
+
+
+class ActivityEvent(db.Model):
+    """Log aktivitas append-only untuk "Recent Activity" admin (lihat activity.py).
+
+    Deskripsi ditulis saat event terjadi sehingga pembacaan tidak perlu join
+    atau lazy load; id yang naik monoton sekaligus menjadi urutan waktu dan cursor.
+    """
+    __tablename__ = 'activity_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    type = db.Column(db.String(20), nullable=False)
+    id_user = db.Column(db.Integer, nullable=True)  # Pelaku; tanpa FK agar log tetap utuh saat user dihapus
+    related_id = db.Column(db.Integer, nullable=True)
+    description = db.Column(db.String(255), nullable=False)
+    created_at = db.Column(db.TIMESTAMP, server_default=func.now(), nullable=False)
+
+    # Filter per tipe tetap berurutan id tanpa sort tambahan
+    __table_args__ = (
+        db.Index('ix_activity_events_type_id', 'type', 'id'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'type': self.type,
+            'id_user': self.id_user,
+            'related_id': self.related_id,
+            'description': self.description,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+class RollupWatermark(db.Model):
+    __tablename__ = 'rollup_watermarks'
+
+    name = db.Column(db.String(50), primary_key=True)
+    # Hari terakhir yang sudah diproses; run berikutnya menghitung ulang mulai hari ini
+    day = db.Column(db.Date, nullable=False)
+    updated_at = db.Column(db.TIMESTAMP, server_default=func.now(), onupdate=func.now())
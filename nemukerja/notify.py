@@ -0,0 +1,136 @@
+"""Helper notifikasi: insert batch dan penghitung belum-dibaca per user.
+
+`notification_counters.unread` dijaga di transaksi yang sama dengan perubahan
+notifikasi: perubahan lewat ORM (Notification baru, is_read berubah, dihapus)
+ditangkap listener after_flush; jalur SQL massal (notify_many, read-all,
+clear-all) memanggil helper di sini secara eksplisit. Penghitung selalu diubah
+dengan delta (jumlah baris yang benar-benar berubah), tidak pernah di-set ke
+nilai mutlak, sehingga notifikasi yang disisipkan request lain di tengah jalan
+tetap terhitung. Penyimpangan (mis. data
+diubah manual di database) diperbaiki dengan `flask notifications-repair`.
+"""
+from collections import Counter
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select, update
+from sqlalchemy.dialects import mysql, sqlite
+
+from nemukerja.models import Notification, NotificationCounter
+from nemukerja.routing import RoutingSession
+
+# Notifikasi lama bisa ber-is_read NULL; NULL dihitung belum dibaca
+UNREAD = func.coalesce(Notification.is_read, False).is_(False)
+
+
+def notify_many(session, notifications):
+    """Sisipkan banyak notifikasi dengan satu INSERT batch (executemany).
+
+    `notifications` berisi dict kolom Notification (id_user, title, message,
+    type, related_id). Tidak ada objek ORM yang dibuat atau di-flush satu per
+    satu; commit tetap tanggung jawab pemanggil agar satu transaksi.
+    """
+    notifications = list(notifications)
+    if notifications:
+        session.execute(insert(Notification), notifications)
+        bump_unread(session, Counter(row['id_user'] for row in notifications if not row.get('is_read')))
+    return len(notifications)
+
+
+def bump_unread(session, deltas, connection=None):
+    """Tambah/kurangi penghitung per user ({id_user: delta}) dengan satu upsert."""
+    rows = [{'id_user': user_id, 'unread': delta} for user_id, delta in deltas.items() if delta]
+    if not rows:
+        return
+    connection = connection if connection is not None else session.connection()
+    table = NotificationCounter.__table__
+
+    def clamped(value):
+        return case((value < 0, 0), else_=value)
+
+    if connection.dialect.name == 'mysql':
+        statement = mysql.insert(table).values(rows)
+        statement = statement.on_duplicate_key_update(unread=clamped(table.c.unread + statement.inserted.unread))
+    else:
+        # SQLite dan PostgreSQL berbagi sintaks ON CONFLICT
+        statement = sqlite.insert(table).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.id_user],
+            set_={'unread': clamped(table.c.unread + statement.excluded.unread)},
+        )
+    connection.execute(statement)
+    # Baris baru dengan delta negatif (penghitung belum ada) tidak boleh di bawah nol
+    if any(row['unread'] < 0 for row in rows):
+        connection.execute(update(table).where(table.c.unread < 0).values(unread=0))
+
+
+def mark_all_read(session, user_id):
+    """Tandai semua notifikasi belum-dibaca user sebagai dibaca; kembalikan jumlahnya."""
+    marked = session.execute(
+        update(Notification).where(Notification.id_user == user_id, UNREAD).values(is_read=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    bump_unread(session, {user_id: -marked})
+    return marked
+
+
+def delete_all(session, user_id):
+    """Hapus semua notifikasi user; penghitung dikurangi sebanyak baris belum-dibaca yang terhapus.
+
+    Belum-dibaca dihapus lebih dulu (rowcount = delta penghitung), lalu yang sudah
+    dibaca. Notifikasi baru yang masuk di antara keduanya belum dibaca, jadi
+    tidak ikut terhapus dan +1-nya tetap benar.
+    """
+    unread = session.execute(
+        delete(Notification).where(Notification.id_user == user_id, UNREAD)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    read = session.execute(
+        delete(Notification).where(Notification.id_user == user_id, ~UNREAD)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    bump_unread(session, {user_id: -unread})
+    return unread + read
+
+
+def get_unread_count(session, user_id):
+    return session.scalar(select(NotificationCounter.unread).where(NotificationCounter.id_user == user_id)) or 0
+
+
+def repair_unread_counters(session, dry_run=False):
+    """Hitung ulang semua penghitung dari tabel notifications; kembalikan {id_user: (lama, benar)}."""
+    actual = dict(session.execute(
+        select(Notification.id_user, func.count()).where(UNREAD).group_by(Notification.id_user)
+    ).all())
+    stored = dict(session.execute(select(NotificationCounter.id_user, NotificationCounter.unread)).all())
+    drift = {
+        user_id: (stored.get(user_id, 0), actual.get(user_id, 0))
+        for user_id in set(actual) | set(stored)
+        if stored.get(user_id, 0) != actual.get(user_id, 0)
+    }
+    if drift and not dry_run:
+        bump_unread(session, {user_id: correct - old for user_id, (old, correct) in drift.items()})
+        session.commit()
+    return drift
+
+
+def _track_unread_changes(session, flush_context):
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Notification) and not obj.is_read:
+            deltas[obj.id_user] += 1
+    for obj in session.deleted:
+        # Tanpa lazy load: baris sudah terhapus; nilai yang tidak dimuat dianggap belum dibaca
+        if isinstance(obj, Notification) and not inspect(obj).dict.get('is_read'):
+            deltas[obj.id_user] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, Notification):
+            history = inspect(obj).attrs.is_read.history
+            if history.deleted and bool(history.deleted[0]) != bool(obj.is_read):
+                deltas[obj.id_user] += -1 if obj.is_read else 1
+    if deltas:
+        bump_unread(session, deltas, connection=session.connection())
+
+
+def init_notification_counters(app):
+    # Listener tingkat kelas session; didaftarkan sekali walau create_app() dipanggil berulang
+    if not event.contains(RoutingSession, 'after_flush', _track_unread_changes):
+        event.listen(RoutingSession, 'after_flush', _track_unread_changes)
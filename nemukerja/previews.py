@@ -0,0 +1,278 @@
+"""Preview CV (thumbnail halaman pertama + cuplikan teks) untuk halaman review lamaran.
+
+Preview dibuat di latar belakang setelah commit yang mengubah `Applicant.cv_path`,
+jadi upload tidak menunggu render PDF. Hasilnya:
+- thumbnail PNG disimpan di storage CV di samping file-nya (`ab/cd/<uuid>.png`),
+- cuplikan teks disimpan di `applicants.cv_preview_text` agar inbox tidak perlu
+  membaca storage per baris.
+
+Setiap kali cv_path berubah kolom preview dikosongkan (listener `set`) dan
+thumbnail lama dihapus setelah commit. Pekerjaan yang selesai terlambat untuk
+CV yang sudah diganti tidak menimpa apa pun: UPDATE-nya bersyarat pada cv_path.
+
+CV_PREVIEW_WORKERS=0 (sinkron) tetap tidak berjalan di dalam request: pekerjaan
+ditunda sampai response selesai dikirim (call_on_close) dan memakai app context
+serta session sendiri, jadi route tulis tetap satu commit. Di luar request
+(CLI) pekerjaan langsung dijalankan.
+
+Renderer opsional, dicoba berurutan: PyMuPDF (paket pymupdf), lalu pdftoppm +
+pdftotext dari poppler-utils. Tanpa keduanya preview ditandai selesai tanpa isi;
+`flask cv-previews --all` membuat ulang setelah salah satunya dipasang.
+"""
+import io
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import event, func, inspect, update
+
+from nemukerja.extensions import db
+from nemukerja.metrics import timed
+from nemukerja.models import Applicant
+from nemukerja.routing import RoutingSession
+from nemukerja.storage import get_cv_storage, is_valid_key
+
+# PyMuPDF opsional dan baru diimpor saat preview pertama dibuat
+pymupdf = None
+
+logger = logging.getLogger(__name__)
+
+SESSION_INFO_KEY = 'cv_preview_jobs'
+# Pekerjaan mode sinkron yang menunggu response selesai (flask.g)
+DEFERRED_KEY = '_cv_preview_deferred'
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _import_pymupdf():
+    global pymupdf
+    if pymupdf is None:
+        try:
+            import pymupdf as module
+        except ImportError:
+            try:
+                import fitz as module  # Nama lama (PyMuPDF < 1.24)
+            except ImportError:
+                return None
+        pymupdf = module
+    return pymupdf
+
+
+def thumbnail_key(cv_key):
+    return f'{os.path.splitext(cv_key)[0]}.png'
+
+
+def _clean_text(text, max_chars):
+    text = _WHITESPACE_RE.sub(' ', text or '').strip()
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit(' ', 1)[0] + '…'
+    return text
+
+
+def _render_pymupdf(data, width):
+    with pymupdf.open(stream=data, filetype='pdf') as doc:
+        if doc.page_count == 0:
+            return '', None
+        page = doc[0]
+        zoom = width / page.rect.width
+        png = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False).tobytes('png')
+        text = ' '.join(doc[i].get_text() for i in range(min(doc.page_count, 2)))
+    return text, png
+
+
+def _render_poppler(data, width, timeout):
+    with tempfile.TemporaryDirectory(prefix='cv-preview-') as tmp:
+        pdf_path = os.path.join(tmp, 'cv.pdf')
+        with open(pdf_path, 'wb') as f:
+            f.write(data)
+        text = png = None
+        if shutil.which('pdftotext'):
+            result = subprocess.run(['pdftotext', '-f', '1', '-l', '2', '-enc', 'UTF-8', pdf_path, '-'],
+                                    capture_output=True, timeout=timeout)
+            text = result.stdout.decode('utf-8', 'replace') if result.returncode == 0 else None
+        if shutil.which('pdftoppm'):
+            out = os.path.join(tmp, 'thumb')
+            result = subprocess.run(['pdftoppm', '-png', '-f', '1', '-l', '1', '-singlefile',
+                                     '-scale-to-x', str(width), '-scale-to-y', '-1', pdf_path, out],
+                                    capture_output=True, timeout=timeout)
+            if result.returncode == 0:
+                with open(f'{out}.png', 'rb') as f:
+                    png = f.read()
+    return text, png
+
+
+def render_preview(data, width=320, max_chars=600, timeout=20):
+    """(cuplikan teks, PNG halaman pertama atau None) dari bytes PDF."""
+    if _import_pymupdf() is not None:
+        text, png = _render_pymupdf(data, width)
+    elif shutil.which('pdftoppm') or shutil.which('pdftotext'):
+        text, png = _render_poppler(data, width, timeout)
+    else:
+        return None, None
+    return _clean_text(text, max_chars), png
+
+
+class CVPreviewer:
+    """Thread pool per proses yang membuat preview; CV_PREVIEW_WORKERS=0 berarti sinkron."""
+
+    def __init__(self, app):
+        self.app = app
+        self.workers = app.config['CV_PREVIEW_WORKERS']
+        self.width = app.config['CV_PREVIEW_WIDTH']
+        self.max_chars = app.config['CV_PREVIEW_CHARS']
+        self.timeout = app.config['CV_PREVIEW_TIMEOUT']
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._warned = False
+
+    def _submit(self, fn, *args):
+        if not self.workers:
+            if has_request_context():
+                g.setdefault(DEFERRED_KEY, []).append((fn, args))
+                return None
+            return fn(*args)
+        with self._lock:
+            # Thread tidak ikut ter-fork: worker gunicorn membuat pool sendiri
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='cv-preview')
+                self._executor_pid = os.getpid()
+            return self._executor.submit(fn, *args)
+
+    def schedule(self, applicant_id, cv_key):
+        return self._submit(self._run, applicant_id, cv_key)
+
+    def discard(self, cv_key):
+        return self._submit(self._delete_thumbnail, cv_key)
+
+    def _delete_thumbnail(self, cv_key):
+        with self.app.app_context():
+            try:
+                get_cv_storage().delete(thumbnail_key(cv_key))
+            except Exception:
+                logger.exception('Gagal menghapus thumbnail CV %s', cv_key)
+
+    def _run(self, applicant_id, cv_key):
+        with self.app.app_context():
+            try:
+                return self.generate(applicant_id, cv_key)
+            except Exception:
+                logger.exception('Gagal membuat preview CV %s', cv_key)
+                db.session.rollback()
+                return False
+
+    def generate(self, applicant_id, cv_key):
+        """Buat dan simpan preview satu CV; False bila CV sudah diganti atau hilang."""
+        storage = get_cv_storage()
+        try:
+            data = storage.read(cv_key)
+        except (FileNotFoundError, ValueError):
+            logger.warning('File CV %s tidak ditemukan; preview dilewati.', cv_key)
+            return False
+
+        try:
+            with timed('nemukerja_cv_preview_duration_seconds'):
+                text, png = render_preview(data, self.width, self.max_chars, self.timeout)
+        except Exception as e:
+            # PDF rusak/terenkripsi atau poppler timeout: tandai selesai tanpa isi agar tidak dicoba terus
+            logger.warning('CV %s tidak bisa dirender: %s', cv_key, e)
+            text = png = ''
+        if text is None and png is None and not self._warned:
+            self._warned = True
+            logger.warning('PyMuPDF/poppler-utils tidak terpasang; preview CV dibuat tanpa isi.')
+        if png:
+            storage.put(thumbnail_key(cv_key), io.BytesIO(png))
+
+        result = db.session.execute(
+            update(Applicant)
+            .where(Applicant.id == applicant_id, Applicant.cv_path == cv_key)
+            .values(cv_preview_text=text or None, cv_preview_thumb=bool(png), cv_preview_at=func.now(),
+                    updated_at=Applicant.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount == 0:
+            # CV diganti selama render; thumbnail-nya sudah yatim
+            if png:
+                storage.delete(thumbnail_key(cv_key))
+            return False
+        return True
+
+
+def get_cv_previewer(app=None):
+    return (app or current_app).extensions.get('cv_previews')
+
+
+def _reset_preview(target, value, oldvalue, initiator):
+    if value != oldvalue:
+        target.cv_preview_text = None
+        target.cv_preview_thumb = False
+        target.cv_preview_at = None
+
+
+def _collect_cv_changes(session, flush_context):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Applicant):
+            continue
+        history = inspect(obj).attrs.cv_path.history
+        if not history.added:
+            continue
+        jobs = session.info.setdefault(SESSION_INFO_KEY, [])
+        for old_key in history.deleted:
+            if is_valid_key(old_key):
+                jobs.append(('discard', old_key))
+        if is_valid_key(obj.cv_path):
+            jobs.append(('schedule', obj.id, obj.cv_path))
+
+
+def _run_after_commit(session):
+    jobs = session.info.pop(SESSION_INFO_KEY, None)
+    if not jobs or not has_app_context():
+        return
+    previewer = get_cv_previewer()
+    if previewer is None:
+        return
+    for action, *args in jobs:
+        try:
+            getattr(previewer, action)(*args)
+        except Exception:
+            # Commit sudah terjadi; preview yang gagal dijadwalkan dibuat ulang oleh `flask cv-previews`
+            logger.exception('Gagal menjadwalkan preview CV %s', args[-1])
+
+
+def _discard_after_rollback(session):
+    session.info.pop(SESSION_INFO_KEY, None)
+
+
+def _run_deferred(jobs):
+    for fn, args in jobs:
+        fn(*args)
+
+
+def _defer_until_closed(response):
+    # Mode sinkron: jalankan setelah response terkirim, di luar transaksi dan session request
+    jobs = g.pop(DEFERRED_KEY, None)
+    if jobs:
+        response.call_on_close(lambda: _run_deferred(jobs))
+    return response
+
+
+def init_cv_previews(app):
+    if not app.config.get('CV_PREVIEW_ENABLED'):
+        return None
+    previewer = CVPreviewer(app)
+    app.extensions['cv_previews'] = previewer
+    if not previewer.workers:
+        app.after_request(_defer_until_closed)
+    if not event.contains(Applicant.cv_path, 'set', _reset_preview):
+        event.listen(Applicant.cv_path, 'set', _reset_preview)
+    for name, listener in (('after_flush', _collect_cv_changes), ('after_commit', _run_after_commit),
+                           ('after_rollback', _discard_after_rollback)):
+        if not event.contains(RoutingSession, name, listener):
+            event.listen(RoutingSession, name, listener)
+    return previewer
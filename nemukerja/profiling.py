@@ -0,0 +1,59 @@
+"""Ukur waktu impor dan memori resident per komponen saat startup.
+
+Dijalankan di interpreter baru (lihat perintah `flask startup-profile`) agar
+modul yang sudah dimuat oleh proses CLI tidak ikut terhitung.
+"""
+import importlib
+import json
+import sys
+import time
+
+# (label, modul) dalam urutan impor create_app()
+COMPONENTS = (
+    ('flask', 'flask'),
+    ('sqlalchemy', 'sqlalchemy.orm'),
+    ('extensions', 'nemukerja.extensions'),
+    ('models', 'nemukerja.models'),
+    ('forms', 'nemukerja.forms'),
+    ('views.public', 'nemukerja.views.public'),
+    ('views.applicant', 'nemukerja.views.applicant'),
+    ('views.company', 'nemukerja.views.company'),
+    ('views.admin', 'nemukerja.views.admin'),
+    ('views.notifications', 'nemukerja.views.notifications'),
+    ('views.api', 'nemukerja.views.api'),
+    ('app', 'nemukerja.app'),
+)
+
+
+def rss_kb():
+    """Resident memory proses saat ini dalam KB (Linux: /proc, lainnya: puncak RSS)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure():
+    rows = []
+    for label, module in COMPONENTS:
+        rss_before, start = rss_kb(), time.perf_counter()
+        importlib.import_module(module)
+        rows.append({'component': label, 'ms': (time.perf_counter() - start) * 1000,
+                     'rss_kb': rss_kb() - rss_before})
+
+    from nemukerja.app import create_app
+    rss_before, start = rss_kb(), time.perf_counter()
+    create_app()
+    rows.append({'component': 'create_app()', 'ms': (time.perf_counter() - start) * 1000,
+                 'rss_kb': rss_kb() - rss_before})
+    return {'rows': rows, 'total_rss_kb': rss_kb()}
+
+
+if __name__ == '__main__':
+    json.dump(measure(), sys.stdout)
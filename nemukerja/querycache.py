@@ -0,0 +1,381 @@
+"""Cache hasil SELECT ORM yang diinvalidasi per tabel (tag).
+
+Query ikut di-cache bila diberi execution option `query_cache=<nama>`:
+
+    Company.query.execution_options(query_cache='companies').all()
+
+Kunci cache = URL engine + SQL hasil kompilasi + nilai parameternya, jadi query
+yang sama dari user berbeda berbagi satu entri, tetapi baris yang dibaca dari
+replica (routing.py) tidak pernah dipakai untuk bacaan ke primary: user yang
+sticky ke primary setelah menulis tetap melihat tulisannya sendiri. Yang
+disimpan adalah baris mentah dari cursor DBAPI (bukan objek ORM); saat hit baris
+diputar ulang lewat ReplayCursor dan loader ORM membangun objeknya seperti biasa
+di session pemanggil, jadi tidak ada objek yang dibagi antar session. Setiap
+entri diberi tag berupa tabel yang muncul di SQL final (termasuk tabel dari
+joinedload) dan menyimpan versi tag saat dibaca. Tulisan lewat session (flush
+ORM maupun insert/update/delete massal lewat session.execute) menaikkan versi
+tabelnya setelah commit, sehingga entri lama otomatis dianggap basi tanpa harus
+mencari kuncinya satu per satu.
+
+Backend:
+- 'local'  : LRU in-process per worker; invalidasi langsung di worker yang
+             menulis, worker lain mengandalkan QUERY_CACHE_TTL. Hanya cocok
+             untuk satu proses (test).
+- 'sqlite' : (default) file SQLite (WAL) yang dibagi semua proses di host yang
+             sama, versi tag ikut dibagi sehingga invalidasi berlaku di semua
+             worker, termasuk tulisan dari perintah CLI (`flask sweeper`).
+- 'modul:Kelas' : backend lain dengan antarmuka yang sama.
+"""
+import hashlib
+import importlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import weakref
+from collections import Counter
+
+from flask import current_app, has_app_context
+from sqlalchemy import Table, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import visitors
+
+from nemukerja.cache import LRUCache
+from nemukerja.metrics import inc
+from nemukerja.routing import RoutingSession
+
+logger = logging.getLogger(__name__)
+
+SESSION_INFO_KEY = 'query_cache_dirty_tables'
+EXECUTION_OPTION = 'query_cache'
+DIRTY_OPTION = '_query_cache_dirty_tables'
+
+
+class LocalBackend:
+    """Entri di LRUCache milik proses ini; versi tag di dict biasa.
+
+    Nilai disimpan apa adanya tanpa pickle: isinya tuple baris yang tidak
+    pernah diubah, jadi aman dibagi antar request.
+    """
+
+    def __init__(self, maxsize=1024, **_):
+        self._entries = LRUCache(maxsize=maxsize)
+        self._versions = Counter()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value, ttl):
+        self._entries.set(key, value, ttl=ttl)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return tuple((tag, self._versions[tag]) for tag in sorted(tags))
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_SQLITE_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS tags (tag TEXT PRIMARY KEY, version INTEGER NOT NULL) WITHOUT ROWID',
+)
+PRUNE_EVERY = 1000
+
+
+class SQLiteBackend:
+    """Entri dan versi tag di satu file SQLite; satu koneksi per thread per proses.
+
+    Kegagalan akses file diperlakukan sebagai miss (query tetap jalan ke DB).
+    """
+
+    def __init__(self, path, **_):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')  # Cache boleh hilang saat crash
+            for statement in _SQLITE_SCHEMA:
+                conn.execute(statement)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        try:
+            row = self._connection().execute(
+                'SELECT value FROM entries WHERE key = ? AND expires > ?', (key, time.time())
+            ).fetchone()
+        except sqlite3.Error:
+            logger.exception('Query cache: gagal membaca %s', self.path)
+            return None
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        try:
+            conn = self._connection()
+            conn.execute('INSERT OR REPLACE INTO entries (key, value, expires) VALUES (?, ?, ?)',
+                         (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time() + ttl))
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                conn.execute('DELETE FROM entries WHERE expires <= ?', (time.time(),))
+        except sqlite3.Error:
+            logger.exception('Query cache: gagal menulis %s', self.path)
+
+    def tag_versions(self, tags):
+        tags = sorted(tags)
+        try:
+            rows = dict(self._connection().execute(
+                f"SELECT tag, version FROM tags WHERE tag IN ({','.join('?' * len(tags))})", tags
+            ).fetchall())
+        except sqlite3.Error:
+            logger.exception('Query cache: gagal membaca versi tag')
+            return None  # Versi tidak diketahui -> entri tidak pernah dianggap valid
+        return tuple((tag, rows.get(tag, 0)) for tag in tags)
+
+    def bump(self, tags):
+        try:
+            self._connection().executemany(
+                'INSERT INTO tags (tag, version) VALUES (?, 1) '
+                'ON CONFLICT (tag) DO UPDATE SET version = version + 1', [(tag,) for tag in tags])
+        except sqlite3.Error:
+            logger.exception('Query cache: gagal menaikkan versi tag %s', tags)
+
+    def clear(self):
+        self._connection().execute('DELETE FROM entries')
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM entries WHERE expires > ?',
+                                          (time.time(),)).fetchone()[0]
+
+
+BACKENDS = {'local': LocalBackend, 'sqlite': SQLiteBackend}
+
+
+def load_backend(name, **options):
+    if name in BACKENDS:
+        return BACKENDS[name](**options)
+    module_name, _, class_name = name.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)(**options)
+
+
+class ReplayCursor:
+    """Cursor DBAPI tiruan yang memutar ulang baris dari cache.
+
+    Dipasang sebagai context.cursor sehingga CursorResult dan loader ORM
+    membangun objek persis seperti dari database, tanpa round trip.
+    """
+
+    def __init__(self, description, rows, from_cache):
+        self.from_cache = from_cache  # False = baris baru saja diambil dari DB (miss)
+        self.description = description
+        self.rowcount = len(rows)
+        self.lastrowid = None
+        self._rows = rows
+        self._position = 0
+
+    def fetchone(self):
+        if self._position >= len(self._rows):
+            return None
+        self._position += 1
+        return self._rows[self._position - 1]
+
+    def fetchmany(self, size=None):
+        size = size or 1
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def close(self):
+        pass
+
+
+class QueryCache:
+    def __init__(self, backend, ttl=30):
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = {}  # nama query -> Counter(hit/miss/bypass), per proses
+        # Compiled (di-cache SQLAlchemy per bentuk statement) -> tag tabel
+        self._tags = weakref.WeakKeyDictionary()
+
+    def _record(self, name, result):
+        self.stats.setdefault(name, Counter())[result] += 1
+        inc('nemukerja_query_cache_requests_total', query=name, result=result)
+
+    def tags_for(self, compiled):
+        tags = self._tags.get(compiled)
+        if tags is None:
+            # SQL final (setelah eager load ORM ditambahkan) ada di compile_state.statement
+            final = getattr(getattr(compiled, 'compile_state', None), 'statement', None)
+            if final is None:
+                final = compiled.statement
+            tags = self._tags[compiled] = frozenset(
+                node.name for node in visitors.iterate(final) if isinstance(node, Table))
+        return tags
+
+    def execute(self, cursor, statement, parameters, context, name):
+        """Handler do_execute: True berarti context.cursor sudah berisi hasil."""
+        tags = self.tags_for(context.compiled)
+        # Tabel yang sudah ditulis di transaksi ini tapi belum di-commit: jangan baca
+        # dari cache (hasilnya akan tanpa tulisan sendiri) dan jangan simpan (belum final)
+        if tags & context.execution_options.get(DIRTY_OPTION, frozenset()):
+            self._record(name, 'bypass')
+            return False
+
+        # Primary dan replica bisa berbeda isi (replica tertinggal): entri dipisah per engine
+        engine_url = context.engine.url.render_as_string(hide_password=True)
+        key = hashlib.sha1(repr((engine_url, statement, parameters)).encode()).hexdigest()
+        versions = self.backend.tag_versions(tags)
+        entry = self.backend.get(key)
+        if entry is not None and versions is not None and entry[0] == versions:
+            self._record(name, 'hit')
+            context.cursor = ReplayCursor(*entry[1], from_cache=True)
+            return True
+
+        self._record(name, 'miss')
+        # Versi dibaca SEBELUM query: commit yang terjadi di tengah jalan membuat entri ini basi
+        cursor.execute(statement, parameters)
+        description, rows = cursor.description, cursor.fetchall()
+        cursor.close()
+        rows = [tuple(row) for row in rows]
+        if versions is not None:
+            self.backend.set(key, (versions, (description, rows)), self.ttl)
+        context.cursor = ReplayCursor(description, rows, from_cache=False)
+        return True
+
+    def tag_versions(self, tags):
+        """Versi tag saat ini (None bila backend gagal dibaca); dipakai juga oleh funnel.py."""
+        return self.backend.tag_versions(tags)
+
+    def invalidate(self, tables):
+        if tables:
+            self.backend.bump(tables)
+
+
+def _query_cache():
+    if has_app_context():
+        return current_app.extensions.get('query_cache')
+    return None
+
+
+def _mark_dirty(session, tables):
+    session.info.setdefault(SESSION_INFO_KEY, set()).update(tables)
+
+
+def mark_query_cache_dirty(session, tables):
+    # Invalidasi eksplisit untuk penulis massal (sweeper): versi tag naik setelah commit session ini
+    _mark_dirty(session, set(tables))
+
+
+def _on_execute(orm_execute_state):
+    cache = _query_cache()
+    if cache is None:
+        return None
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        # DML massal (session.execute(insert/update/delete)) tidak terlihat oleh after_flush
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            _mark_dirty(orm_execute_state.session, {table.name})
+        return None
+    dirty = orm_execute_state.session.info.get(SESSION_INFO_KEY)
+    if dirty and orm_execute_state.execution_options.get(EXECUTION_OPTION):
+        orm_execute_state.update_execution_options(**{DIRTY_OPTION: frozenset(dirty)})
+    return None
+
+
+def _on_do_execute(cursor, statement, parameters, context):
+    name = context.execution_options.get(EXECUTION_OPTION)
+    if not name or context.compiled is None or context.isddl:
+        return False
+    cache = _query_cache()
+    if cache is None or not context.compiled.statement.is_select:
+        return False
+    return cache.execute(cursor, statement, parameters, context, name)
+
+
+def _collect_dirty_tables(session, flush_context):
+    tables = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        mapper = getattr(obj, '__mapper__', None)
+        if mapper is not None:
+            tables.update(table.name for table in mapper.tables)
+    for obj in session.deleted:
+        # Baris anak yang dihapus ON DELETE CASCADE (passive_deletes) tidak pernah masuk session
+        for relationship in obj.__mapper__.relationships:
+            if relationship.passive_deletes and relationship.cascade.delete:
+                tables.update(table.name for table in relationship.mapper.tables)
+    if tables:
+        _mark_dirty(session, tables)
+
+
+def _invalidate_after_commit(session):
+    tables = session.info.pop(SESSION_INFO_KEY, None)
+    cache = _query_cache()
+    if tables and cache is not None:
+        cache.invalidate(tables)
+
+
+def _discard_after_rollback(session):
+    session.info.pop(SESSION_INFO_KEY, None)
+
+
+def query_cache_stats(app):
+    """Baris statistik per nama query: gabungan semua worker jika /metrics aktif."""
+    counts = {}
+    if app.config['METRICS_ENABLED']:
+        from nemukerja.metrics import collect, flush
+
+        flush(app.config['METRICS_DIR'])
+        for (metric, labels), value in collect(app.config['METRICS_DIR'])['counters'].items():
+            if metric == 'nemukerja_query_cache_requests_total':
+                labels = dict(labels)
+                counts.setdefault(labels['query'], Counter())[labels['result']] += value
+    else:
+        cache = app.extensions.get('query_cache')
+        counts = {name: Counter(stats) for name, stats in (cache.stats.items() if cache else ())}
+
+    rows = []
+    for name, counter in sorted(counts.items()):
+        lookups = counter['hit'] + counter['miss']
+        rows.append({'name': name, 'hits': counter['hit'], 'misses': counter['miss'],
+                     'bypass': counter['bypass'], 'hit_ratio': counter['hit'] / lookups if lookups else None})
+    return rows
+
+
+def init_query_cache(app):
+    if not app.config['QUERY_CACHE_ENABLED']:
+        return
+    backend = load_backend(app.config['QUERY_CACHE_BACKEND'],
+                           maxsize=app.config['QUERY_CACHE_SIZE'], path=app.config['QUERY_CACHE_DB'])
+    app.extensions['query_cache'] = QueryCache(backend, ttl=app.config['QUERY_CACHE_TTL'])
+
+    # Listener tingkat kelas session; didaftarkan sekali walau create_app() dipanggil berulang
+    for name, listener in (('do_orm_execute', _on_execute),
+                           ('after_flush', _collect_dirty_tables),
+                           ('after_commit', _invalidate_after_commit),
+                           ('after_rollback', _discard_after_rollback)):
+        if not event.contains(RoutingSession, name, listener):
+            event.listen(RoutingSession, name, listener)
+    # Cache sebenarnya bekerja di tingkat cursor DBAPI (SQL final + parameter -> baris)
+    if not event.contains(Engine, 'do_execute', _on_do_execute):
+        event.listen(Engine, 'do_execute', _on_do_execute)
@@ -0,0 +1,142 @@
+"""Rate limiter token bucket lokal yang dibagi semua worker di satu host.
+
+State bucket disimpan di file SQLite (mode WAL) sehingga semua proses
+gunicorn/uvicorn di host yang sama berbagi kuota tanpa layanan eksternal.
+Satu permintaan = satu statement UPSERT ... RETURNING yang atomik: isi ulang
+token sesuai waktu berlalu, kurangi satu jika cukup, kembalikan hasilnya.
+
+Policy per route diatur lewat Config.RATE_LIMITS, contoh `RATE_LIMIT_LOGIN=10/60`
+berarti burst 10 permintaan dan isi ulang 10 token per 60 detik.
+"""
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, request
+from flask_login import current_user
+from werkzeug.exceptions import TooManyRequests
+
+logger = logging.getLogger(__name__)
+
+# Bucket yang tidak tersentuh selama ini sudah pasti penuh kembali -> boleh dihapus
+BUCKET_IDLE_SECONDS = 3600
+PRUNE_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    allowed INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+# refill = min(capacity, tokens + elapsed * rate); ambil satu token jika refill >= 1
+_TAKE = """
+INSERT INTO buckets (key, tokens, updated, allowed) VALUES (:key, :capacity - 1, :now, 1)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = MIN(:capacity, tokens + MAX(:now - updated, 0) * :rate)
+             - (MIN(:capacity, tokens + MAX(:now - updated, 0) * :rate) >= 1),
+    allowed = MIN(:capacity, tokens + MAX(:now - updated, 0) * :rate) >= 1,
+    updated = MAX(:now, updated)
+RETURNING tokens, allowed
+"""
+
+
+def parse_rate(value):
+    """'10/60' -> (capacity=10, per_seconds=60.0); ValueError untuk format/nilai yang tidak valid."""
+    capacity, _, seconds = str(value).partition('/')
+    try:
+        capacity, seconds = int(capacity), float(seconds or 1)
+    except ValueError:
+        raise ValueError(f'Rate limit tidak valid: {value!r} (format "burst/detik", mis. "10/60")') from None
+    # Kapasitas 0 berarti laju isi ulang 0 (pembagian nol); untuk mematikan pakai RATE_LIMIT_ENABLED=0
+    if capacity <= 0 or seconds <= 0:
+        raise ValueError(f'Rate limit tidak valid: {value!r} (burst dan detik harus > 0)')
+    return capacity, seconds
+
+
+class RateLimiter:
+    """Token bucket di SQLite; satu koneksi per thread per proses."""
+
+    def __init__(self, path, policies):
+        self.path = path
+        self.policies = {name: parse_rate(rate) for name, rate in policies.items()}
+        self._local = threading.local()
+        self._calls = 0
+
+    def _connection(self):
+        # Koneksi tidak boleh dipakai lintas fork: simpan bersama PID pembuatnya
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')  # Kehilangan bucket saat crash tidak berbahaya
+            conn.execute(_SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def hit(self, policy, identity, now=None):
+        """Ambil satu token; kembalikan (allowed, retry_after_detik)."""
+        capacity, per_seconds = self.policies[policy]
+        rate = capacity / per_seconds
+        now = time.time() if now is None else now
+        conn = self._connection()
+        tokens, allowed = conn.execute(_TAKE, {
+            'key': f'{policy}:{identity}', 'capacity': capacity, 'rate': rate, 'now': now,
+        }).fetchone()
+
+        self._calls += 1
+        if self._calls % PRUNE_EVERY == 0:
+            conn.execute('DELETE FROM buckets WHERE updated < ?', (now - BUCKET_IDLE_SECONDS,))
+        if allowed:
+            return True, 0
+        return False, max(1, math.ceil((1 - tokens) / rate))
+
+    def check(self, policy, identity):
+        # Gagal terbuka: masalah file rate limit tidak boleh menjatuhkan login/lamaran
+        try:
+            return self.hit(policy, identity)
+        except sqlite3.Error:
+            logger.exception('Rate limiter gagal; permintaan diteruskan tanpa limit')
+            return True, 0
+
+
+def client_identity(user=None):
+    """Identitas bucket: user yang login, atau alamat IP untuk tamu."""
+    user = user if user is not None else current_user
+    if user.is_authenticated:
+        return f'user:{user.id}'
+    return f'ip:{request.remote_addr}'
+
+
+def rate_limit(policy, methods=None, per_ip=False):
+    """Batasi view dengan policy `policy`; lampaui kuota -> 429 + Retry-After.
+
+    `methods` membatasi hanya metode tertentu (mis. POST login), `per_ip`
+    memaksa bucket per IP walau user sudah login.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            limiter = current_app.extensions.get('rate_limiter')
+            if limiter is not None and (methods is None or request.method in methods):
+                identity = f'ip:{request.remote_addr}' if per_ip else client_identity()
+                allowed, retry_after = limiter.check(policy, identity)
+                if not allowed:
+                    raise TooManyRequests(retry_after=retry_after)
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def init_rate_limit(app):
+    if not app.config['RATE_LIMIT_ENABLED']:
+        return None
+    limiter = RateLimiter(app.config['RATE_LIMIT_DB'], app.config['RATE_LIMITS'])
+    app.extensions['rate_limiter'] = limiter
+    return limiter
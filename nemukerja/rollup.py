@@ -0,0 +1,221 @@
+"""Rollup harian inkremental untuk tren admin.
+
+`run_rollup()` hanya membaca baris sumber sejak watermark terakhir (per hari,
+memakai indeks pada kolom waktu), menghitung ulang hari-hari tersebut, lalu
+mengganti baris `daily_rollups` yang bersangkutan. Hari terakhir selalu
+dihitung ulang pada run berikutnya karena mungkin belum lengkap.
+
+Dimensi lokasi memakai nama kanonik dari `id_location` (locations.py), atau
+teks yang dinormalisasi bila lokasinya belum terpetakan, sehingga "Jaksel" dan
+"Jakarta Selatan" masuk satu kunci.
+
+Status lamaran bisa berubah lama setelah hari responnya (Diterima -> Ditolak
+tetap memakai responded_at semula), dan lowongan yang dibuka lagi kehilangan
+closed_at lamanya ("jobs_closed" hari itu berkurang). Perubahan seperti itu
+memundurkan watermark ke hari tersebut (`mark_rollup_days_dirty`), lewat
+listener after_flush untuk jalur ORM dan secara eksplisit untuk UPDATE massal,
+sehingga run berikutnya menghitung ulang mulai hari itu. Penghapusan data lama (hapus
+lowongan beserta lamarannya, hapus akun) tidak memundurkan watermark; jalankan
+`flask rollup --full` bila angka hari-hari lama perlu dikoreksi.
+"""
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+
+from nemukerja.extensions import db
+from nemukerja.locations import normalize_location
+from nemukerja.models import Application, DailyRollup, JobListing, Location, RollupWatermark, User
+from nemukerja.routing import RoutingSession
+
+WATERMARK_NAME = 'daily'
+
+# metrik -> dimensi yang tersedia (selain 'all')
+ROLLUP_METRICS = {
+    'jobs_posted': ('company', 'location'),
+    'jobs_closed': ('company', 'location'),
+    'applications_submitted': ('company', 'location'),
+    'applications_accepted': ('company', 'location'),
+    'applications_rejected': ('company', 'location'),
+    'registrations': ('role',),
+}
+
+
+def _as_date(value):
+    # func.date() mengembalikan date di MySQL tetapi string di SQLite
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def db_today():
+    # Tanggal menurut jam database (kolom waktu diisi func.now() di sisi DB)
+    return _as_date(db.session.scalar(select(func.current_date())))
+
+
+def mark_rollup_days_dirty(session, days, connection=None):
+    """Mundurkan watermark ke hari paling awal di `days` agar hari itu dihitung ulang.
+
+    UPDATE bersyarat di transaksi pemanggil: watermark hanya bisa mundur di
+    sini, dan run_rollup() tidak memajukannya lagi bila watermark berubah
+    selama run berlangsung.
+    """
+    days = [_as_date(day) for day in days if day is not None]
+    if not days:
+        return
+    day = min(days)
+    connection = connection if connection is not None else session.connection()
+    table = RollupWatermark.__table__
+    connection.execute(
+        update(table).where(table.c.name == WATERMARK_NAME, table.c.day > day).values(day=day)
+    )
+
+
+def _track_changed_days(session, flush_context):
+    days = []
+    for obj in session.dirty:
+        if isinstance(obj, Application) and inspect(obj).attrs.status.history.deleted:
+            # Tanpa lazy load; responded_at yang baru diisi func.now() jatuh hari ini dan sudah tercakup
+            responded_at = inspect(obj).dict.get('responded_at')
+            if isinstance(responded_at, datetime):
+                days.append(responded_at)
+        elif isinstance(obj, JobListing):
+            # Dibuka lagi (closed_at -> None) atau ditutup ulang: hari penutupan lama ikut berubah
+            days.extend(value for value in inspect(obj).attrs.closed_at.history.deleted
+                        if isinstance(value, datetime))
+    if days:
+        mark_rollup_days_dirty(session, days, connection=session.connection())
+
+
+def _location_key(name, text):
+    return name or normalize_location(text)
+
+
+def _job_events(timestamp, since, *where, joined=False):
+    """(hari, id_company, nama lokasi kanonik, teks lokasi, jumlah) per kombinasi, untuk kolom waktu `timestamp`."""
+    day = func.date(timestamp)
+    query = select(day, JobListing.id_company, Location.name, JobListing.location, func.count())
+    if joined:
+        query = query.select_from(Application).join(JobListing, JobListing.id == Application.id_job)
+    query = query.outerjoin(Location, Location.id == JobListing.id_location)
+    query = query.where(timestamp.isnot(None), *where)
+    if since is not None:
+        query = query.where(timestamp >= since)
+    return db.session.execute(
+        query.group_by(day, JobListing.id_company, Location.name, JobListing.location)
+    ).all()
+
+
+def _collect(since):
+    counts = Counter()
+
+    def add_job_rows(metric, rows):
+        for day, company_id, location_name, location, count in rows:
+            day = _as_date(day)
+            counts[(day, metric, 'all', '')] += count
+            counts[(day, metric, 'company', str(company_id))] += count
+            counts[(day, metric, 'location', _location_key(location_name, location))] += count
+
+    add_job_rows('jobs_posted', _job_events(JobListing.posted_at, since))
+    add_job_rows('jobs_closed', _job_events(JobListing.closed_at, since))
+    add_job_rows('applications_submitted', _job_events(Application.applied_at, since, joined=True))
+    add_job_rows('applications_accepted', _job_events(
+        Application.responded_at, since, Application.status == 'Diterima', joined=True))
+    add_job_rows('applications_rejected', _job_events(
+        Application.responded_at, since, Application.status == 'Ditolak', joined=True))
+
+    day = func.date(User.created_at)
+    query = select(day, User.role, func.count()).where(User.created_at.isnot(None))
+    if since is not None:
+        query = query.where(User.created_at >= since)
+    for day, role, count in db.session.execute(query.group_by(day, User.role)):
+        day = _as_date(day)
+        counts[(day, 'registrations', 'all', '')] += count
+        counts[(day, 'registrations', 'role', role)] += count
+
+    return counts
+
+
+def run_rollup(full=False):
+    """Perbarui daily_rollups sejak watermark (atau semuanya jika `full`).
+
+    Mengembalikan (hari_mulai, jumlah_baris_ditulis, watermark_baru).
+    """
+    watermark = db.session.get(RollupWatermark, WATERMARK_NAME)
+    start_day = None if full or watermark is None else watermark.day
+    since = datetime.combine(start_day, time.min) if start_day else None
+
+    counts = _collect(since)
+
+    stale = delete(DailyRollup)
+    if start_day is not None:
+        stale = stale.where(DailyRollup.day >= start_day)
+    db.session.execute(stale)
+
+    rows = [
+        {'day': day, 'metric': metric, 'dimension': dimension, 'dimension_key': key, 'value': value}
+        for (day, metric, dimension, key), value in counts.items()
+    ]
+    if rows:
+        db.session.execute(insert(DailyRollup), rows)
+
+    # Watermark tidak boleh melewati hari ini, agar baris bertanggal masa depan
+    # tidak membuat hari-hari berikutnya terlewat
+    latest_day = max((day for day, *_ in counts), default=start_day)
+    if latest_day is not None:
+        latest_day = min(latest_day, db_today())
+    if latest_day is not None:
+        if watermark is None:
+            db.session.add(RollupWatermark(name=WATERMARK_NAME, day=latest_day))
+        else:
+            # Bersyarat: bila mark_rollup_days_dirty() memundurkannya selama run ini,
+            # hari itu belum tentu terhitung dengan status terbaru, jadi biarkan mundur
+            table = RollupWatermark.__table__
+            db.session.execute(
+                update(table)
+                .where(table.c.name == WATERMARK_NAME, table.c.day == watermark.day)
+                .values(day=latest_day, updated_at=func.now())
+            )
+    db.session.commit()
+    return start_day, len(rows), latest_day
+
+
+def trend_series(metric, dimension='all', key='', days=365, end=None):
+    """Deret harian (zero-filled) satu metrik: [{'day': 'YYYY-MM-DD', 'value': n}, ...]."""
+    end = end or db_today()
+    start = end - timedelta(days=days - 1)
+    values = dict(db.session.execute(
+        select(DailyRollup.day, DailyRollup.value)
+        .where(DailyRollup.metric == metric,
+               DailyRollup.dimension == dimension,
+               DailyRollup.dimension_key == key,
+               DailyRollup.day.between(start, end))
+    ).all())
+    return [
+        {'day': (start + timedelta(days=i)).isoformat(), 'value': values.get(start + timedelta(days=i), 0)}
+        for i in range(days)
+    ]
+
+
+def top_dimension_keys(metric, dimension, days=365, end=None, limit=10):
+    """Kunci dimensi dengan total terbesar dalam rentang: [(key, total), ...]."""
+    end = end or db_today()
+    start = end - timedelta(days=days - 1)
+    total = func.sum(DailyRollup.value)
+    return db.session.execute(
+        select(DailyRollup.dimension_key, total)
+        .where(DailyRollup.metric == metric,
+               DailyRollup.dimension == dimension,
+               DailyRollup.day.between(start, end))
+        .group_by(DailyRollup.dimension_key)
+        .order_by(total.desc())
+        .limit(limit)
+    ).all()
+
+
+def init_rollup(app):
+    # Listener tingkat kelas session; didaftarkan sekali walau create_app() dipanggil berulang
+    if not event.contains(RoutingSession, 'after_flush', _track_changed_days):
+        event.listen(RoutingSession, 'after_flush', _track_changed_days)
@@ -0,0 +1,53 @@
+import time
+from functools import wraps
+
+from flask import current_app, g, has_app_context, request, session
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = 'replica'
+# Kunci session (cookie) yang menandai user baru saja menulis ke primary
+STICKY_SESSION_KEY = '_primary_until'
+
+
+class RoutingSession(Session):
+    """Session yang mengarahkan SELECT ke bind 'replica' untuk route read-only.
+
+    Route harus ditandai dengan `@read_replica`. Flush (INSERT/UPDATE/DELETE)
+    selalu ke primary, dan jika bind 'replica' tidak dikonfigurasi semua query
+    tetap ke primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context() and g.get('use_read_replica'):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _is_sticky_to_primary():
+    return session.get(STICKY_SESSION_KEY, 0) > time.time()
+
+
+def read_replica(f):
+    """Tandai view sebagai read-only: query-nya boleh dibaca dari replica.
+
+    Setelah user melakukan POST sendiri, request berikutnya tetap dibaca dari
+    primary selama READ_YOUR_WRITES_SECONDS (read-your-writes).
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.use_read_replica = not _is_sticky_to_primary()
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def init_routing(app):
+    @app.after_request
+    def mark_primary_after_write(response):
+        # Hanya perlu stickiness jika memang ada replica yang bisa tertinggal
+        if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+            return response
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            session[STICKY_SESSION_KEY] = time.time() + current_app.config['READ_YOUR_WRITES_SECONDS']
+        return response
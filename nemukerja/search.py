@@ -0,0 +1,77 @@
+from flask_sqlalchemy.pagination import Pagination
+from sqlalchemy import and_, or_, select
+
+from nemukerja.models import Company, JobListing, Location
+
+# Jumlah kartu job per halaman di index()
+JOBS_PER_PAGE = 9
+
+
+class PrefetchedPagination(Pagination):
+    # Pagination Flask-SQLAlchemy dengan item/total yang sudah diambil di luar query
+    # (jalur async di asgi.py, atau halaman dari snapshot.py)
+    def _query_items(self):
+        return self._query_args['items']
+
+    def _query_count(self):
+        return self._query_args['total']
+
+
+def parse_job_search_args(args):
+    """Ambil parameter pencarian/filter index() dari request.args."""
+    return {
+        'search': args.get('search', '', type=str).strip(),
+        'location': args.get('location', '', type=str).strip(),
+        # Diisi dari link facet/autocomplete, atau dari teks lokasi lewat resolve_search_location()
+        'location_id': args.get('location_id', type=int),
+        'salary_min': args.get('salary_min', type=int),
+        'company': args.get('company', '', type=str).strip(),
+    }
+
+
+def job_search_filters(params):
+    """Daftar kondisi WHERE untuk lowongan terbuka sesuai parameter pencarian.
+
+    Dipakai bersama oleh index() (Flask-SQLAlchemy) dan jalur async (asgi.py),
+    jadi hanya memakai ekspresi SQLAlchemy Core/ORM biasa.
+    """
+    filters = [JobListing.is_open.is_(True)]
+
+    # Search Judul atau Kualifikasi
+    if params['search']:
+        filters.append(or_(
+            JobListing.title.ilike(f"%{params['search']}%"),
+            JobListing.qualifications.ilike(f"%{params['search']}%")
+        ))
+
+    # Filter Lokasi: ID lokasi (provinsi mencakup semua kotanya) memakai indeks
+    # ix_job_listings_id_location; teks yang tidak dikenali tetap dicari dengan ilike.
+    # Lowongan yang teks lokasinya belum terpetakan (id_location NULL, mis. tidak
+    # dikenali oleh locations-backfill) tetap dicocokkan dengan teksnya
+    if params.get('location_id'):
+        location_ids = select(Location.id).where(or_(
+            Location.id == params['location_id'],
+            Location.id_parent == params['location_id'],
+        ))
+        by_id = JobListing.id_location.in_(location_ids)
+        if params['location']:
+            by_id = or_(by_id, and_(JobListing.id_location.is_(None),
+                                    JobListing.location.ilike(f"%{params['location']}%")))
+        filters.append(by_id)
+    elif params['location']:
+        filters.append(JobListing.location.ilike(f"%{params['location']}%"))
+
+    # Filter Gaji Minimum
+    salary_min = params['salary_min']
+    if salary_min is not None and salary_min > 0:
+        # Cari lowongan yang gaji_min-nya lebih besar atau sama dengan filter
+        filters.append(JobListing.salary_min >= salary_min)
+        # ATAU cari lowongan yang rentang gajinya mencakup nilai filter
+        filters.append(JobListing.salary_max >= salary_min)
+
+    # Filter Perusahaan (subquery nama perusahaan)
+    if params['company']:
+        company_ids = select(Company.id).where(Company.company_name.ilike(f"%{params['company']}%"))
+        filters.append(JobListing.id_company.in_(company_ids))
+
+    return filters
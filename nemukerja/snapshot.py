@@ -0,0 +1,340 @@
+"""Snapshot in-process lowongan terbuka dalam kolom array untuk filter index().
+
+Aktif bila JOB_SNAPSHOT_ENABLED=1 dan NumPy terpasang. Setiap worker memegang
+salinannya sendiri: kolom `array` ringkas (id, posted_at, gaji, perusahaan,
+lokasi) yang dibaca NumPy tanpa salinan, plus indeks token judul/kualifikasi.
+Snapshot diperbarui inkremental dari delta `updated_at`, dibangun ulang penuh
+secara berkala (untuk menangkap lowongan yang dihapus), dan jika terlalu lama
+tidak berhasil diperbarui index() kembali memakai SQL.
+"""
+import logging
+import re
+import sys
+import threading
+import time
+from array import array
+from datetime import timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from nemukerja.facets import (SALARY_BAND_FLOORS, TOP_FACETS, build_facets, cumulative_band_counts,
+                              salary_band_label)
+from nemukerja.models import Company, JobListing, Location
+
+# NumPy opsional dan baru diimpor oleh init_snapshot() bila snapshot aktif,
+# agar startup worker tanpa snapshot tidak membayar waktu impornya
+np = None
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r'[0-9a-z]+')
+# Baris yang dibaca ulang sedikit sebelum watermark, untuk commit yang terlambat
+DELTA_OVERLAP = timedelta(seconds=2)
+# Bangun ulang kolom bila proporsi baris mati (diubah/ditutup) melebihi batas ini
+COMPACT_DEAD_RATIO = 0.25
+
+JOB_COLUMNS = (
+    JobListing.id, JobListing.posted_at, JobListing.salary_min, JobListing.salary_max,
+    JobListing.id_company, JobListing.id_location, JobListing.title, JobListing.qualifications,
+    JobListing.is_open, JobListing.updated_at,
+)
+
+
+class _Columns:
+    """Kolom append-only; baris lama ditandai mati saat lowongan berubah/ditutup."""
+
+    def __init__(self):
+        self.ids = array('q')
+        self.posted_at = array('d')
+        self.updated_at = array('d')
+        self.salary_min = array('q')
+        self.salary_max = array('q')
+        self.company = array('q')
+        self.location = array('q')
+        self.alive = array('b')
+        self.texts = []      # "judul\nkualifikasi" huruf kecil, untuk cek substring persis
+        self.row_of = {}     # id lowongan -> baris hidup
+        self.tokens = {}     # token -> array baris (bisa berisi baris mati)
+        self.dead = 0
+        self._token_matches = {}
+        self._order = None   # semua baris urut posted_at DESC, id DESC; dihitung ulang setelah append
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def is_current(self, job_id, updated_at):
+        # Baris di jendela DELTA_OVERLAP yang sudah dimuat tidak perlu ditambahkan ulang
+        row = self.row_of.get(job_id)
+        return row is not None and updated_at is not None and self.updated_at[row] == updated_at.timestamp()
+
+    def append(self, job_id, posted_at, salary_min, salary_max, company_id, location_id, title, qualifications,
+               updated_at=None):
+        self.kill(job_id)
+        row = len(self.ids)
+        self.ids.append(job_id)
+        self.posted_at.append(posted_at.timestamp() if posted_at else 0.0)
+        self.updated_at.append(updated_at.timestamp() if updated_at else 0.0)
+        self.salary_min.append(salary_min or 0)
+        self.salary_max.append(salary_max or 0)
+        self.company.append(company_id)
+        self.location.append(location_id if location_id is not None else -1)
+        self.alive.append(1)
+        text = f'{title or ""}\n{qualifications or ""}'.lower()
+        self.texts.append(text)
+        for token in set(_TOKEN_RE.findall(text)):
+            self.tokens.setdefault(token, array('q')).append(row)
+        self.row_of[job_id] = row
+        self._token_matches.clear()
+        self._order = None
+
+    def kill(self, job_id):
+        row = self.row_of.pop(job_id, None)
+        if row is not None:
+            self.alive[row] = 0
+            self.texts[row] = ''
+            self.dead += 1
+
+    def ordered_rows(self):
+        if self._order is None:
+            ids = np.frombuffer(self.ids, dtype=np.int64)
+            posted_at = np.frombuffer(self.posted_at, dtype=np.float64)
+            self._order = np.lexsort((-ids, -posted_at))
+        return self._order
+
+    def search_rows(self, query):
+        """Baris yang judul/kualifikasinya mengandung `query` (setara ilike '%query%')."""
+        words = _TOKEN_RE.findall(query)
+        if words:
+            # Kandidat dari token kosakata yang memuat kata terpanjang, lalu cek substring
+            word = max(words, key=len)
+            candidates = self._token_matches.get(word)
+            if candidates is None:
+                matched = [self.tokens[token] for token in self.tokens if word in token]
+                candidates = (np.unique(np.concatenate([np.frombuffer(rows, dtype=np.int64) for rows in matched]))
+                              if matched else np.empty(0, dtype=np.int64))
+                self._token_matches[word] = candidates
+        else:
+            candidates = np.arange(len(self.texts))
+        return np.fromiter((row for row in candidates.tolist() if query in self.texts[row]), dtype=np.int64)
+
+    def memory_report(self):
+        arrays = {name: getattr(self, name) for name in
+                  ('ids', 'posted_at', 'updated_at', 'salary_min', 'salary_max', 'company', 'location', 'alive')}
+        report = {f'column:{name}': col.buffer_info()[1] * col.itemsize for name, col in arrays.items()}
+        report['texts'] = sys.getsizeof(self.texts) + sum(sys.getsizeof(text) for text in self.texts)
+        report['token_index'] = sys.getsizeof(self.tokens) + sum(
+            sys.getsizeof(token) + sys.getsizeof(rows) for token, rows in self.tokens.items())
+        report['row_of'] = sys.getsizeof(self.row_of) + len(self.row_of) * 2 * 28
+        return report
+
+
+class JobSnapshot:
+    """Snapshot lowongan terbuka + metadata perusahaan/lokasi untuk satu proses."""
+
+    def __init__(self, refresh_seconds=5, max_age=30, full_refresh_seconds=300):
+        self.refresh_seconds = refresh_seconds
+        self.max_age = max_age
+        self.full_refresh_seconds = full_refresh_seconds
+        self.columns = _Columns()
+        self.company_names = {}
+        self.location_parent = {}
+        self.location_names = {}
+        self.watermark = None
+        self.company_watermark = None
+        self.refreshed_at = None
+        self.full_refreshed_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    # --- Pemuatan ---------------------------------------------------------------
+
+    def full_refresh(self, session):
+        columns = _Columns()
+        watermark = None
+        for row in session.execute(select(*JOB_COLUMNS).where(JobListing.is_open.is_(True))):
+            columns.append(*row[:8], row.updated_at)
+            if row.updated_at and (watermark is None or row.updated_at > watermark):
+                watermark = row.updated_at
+
+        companies = session.execute(select(Company.id, Company.company_name, Company.updated_at)).all()
+        locations = session.execute(select(Location.id, Location.name, Location.id_parent)).all()
+
+        with self._lock:
+            self.columns = columns
+            self.company_names = {company_id: (name or '').lower() for company_id, name, _ in companies}
+            self.company_watermark = max((updated for _, _, updated in companies if updated), default=None)
+            self.location_names = {location_id: name for location_id, name, _ in locations}
+            self.location_parent = {location_id: parent for location_id, _, parent in locations}
+            self.watermark = watermark
+            self.refreshed_at = self.full_refreshed_at = time.monotonic()
+
+    def refresh(self, session):
+        """Terapkan perubahan sejak watermark; bangun ulang penuh bila ada yang hilang."""
+        query = select(*JOB_COLUMNS)
+        if self.watermark is not None:
+            query = query.where(JobListing.updated_at >= self.watermark - DELTA_OVERLAP)
+        changed = session.execute(query).all()
+
+        company_query = select(Company.id, Company.company_name, Company.updated_at)
+        if self.company_watermark is not None:
+            company_query = company_query.where(Company.updated_at >= self.company_watermark - DELTA_OVERLAP)
+        companies = session.execute(company_query).all()
+        open_count = session.scalar(select(func.count(JobListing.id)).where(JobListing.is_open.is_(True)))
+
+        with self._lock:
+            columns = self.columns
+            for row in changed:
+                if row.is_open:
+                    if not columns.is_current(row.id, row.updated_at):
+                        columns.append(*row[:8], row.updated_at)
+                else:
+                    columns.kill(row.id)
+                if row.updated_at and (self.watermark is None or row.updated_at > self.watermark):
+                    self.watermark = row.updated_at
+            for company_id, name, updated in companies:
+                self.company_names[company_id] = (name or '').lower()
+                if updated and (self.company_watermark is None or updated > self.company_watermark):
+                    self.company_watermark = updated
+            needs_rebuild = (open_count != len(columns)
+                             or columns.dead > COMPACT_DEAD_RATIO * max(len(columns.ids), 1))
+            self.refreshed_at = time.monotonic()
+
+        # Lowongan yang dihapus tidak muncul di delta: jumlah berbeda -> bangun ulang
+        if needs_rebuild:
+            self.full_refresh(session)
+
+    def maybe_refresh(self, session):
+        now = time.monotonic()
+        due_full = self.full_refreshed_at is None or now - self.full_refreshed_at >= self.full_refresh_seconds
+        due_delta = self.refreshed_at is None or now - self.refreshed_at >= self.refresh_seconds
+        if not (due_full or due_delta):
+            return
+        # Hanya satu thread yang memperbarui; yang lain memakai snapshot yang ada
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if due_full:
+                self.full_refresh(session)
+            else:
+                self.refresh(session)
+        except SQLAlchemyError:
+            logger.exception('Gagal memperbarui snapshot lowongan; index() memakai SQL sampai berhasil')
+            session.rollback()
+        finally:
+            self._refresh_lock.release()
+
+    def is_fresh(self):
+        return self.refreshed_at is not None and time.monotonic() - self.refreshed_at <= self.max_age
+
+    # --- Query ------------------------------------------------------------------
+
+    def search(self, params, page, per_page, session=None):
+        """Filter/urut/paginasi dari snapshot: (id_halaman, total, facets) atau None.
+
+        None berarti pakai SQL: snapshot basi, atau filter yang tidak didukung
+        (teks lokasi yang tidak dikenali sebagai alias, atau teks lokasi selagi
+        ada lowongan yang lokasinya belum terpetakan: snapshot tidak menyimpan
+        teks lokasi untuk dicocokkan).
+        """
+        if session is not None:
+            self.maybe_refresh(session)
+        if not self.is_fresh() or (params['location'] and not params.get('location_id')):
+            return None
+
+        with self._lock:
+            columns = self.columns
+            if not columns.ids:
+                return [], 0, build_facets([])
+
+            ids = np.frombuffer(columns.ids, dtype=np.int64)
+            posted_at = np.frombuffer(columns.posted_at, dtype=np.float64)
+            salary_min = np.frombuffer(columns.salary_min, dtype=np.int64)
+            salary_max = np.frombuffer(columns.salary_max, dtype=np.int64)
+            company = np.frombuffer(columns.company, dtype=np.int64)
+            location = np.frombuffer(columns.location, dtype=np.int64)
+
+            mask = np.frombuffer(columns.alive, dtype=np.int8).astype(bool)
+            if params['location'] and np.any(mask & (location < 0)):
+                return None
+            if params['search']:
+                matched = np.zeros(mask.shape, dtype=bool)
+                matched[columns.search_rows(params['search'].lower())] = True
+                mask &= matched
+            if params['salary_min'] is not None and params['salary_min'] > 0:
+                mask &= (salary_min >= params['salary_min']) & (salary_max >= params['salary_min'])
+            if params.get('location_id'):
+                wanted = [params['location_id']] + [location_id for location_id, parent in self.location_parent.items()
+                                                    if parent == params['location_id']]
+                mask &= np.isin(location, wanted)
+            if params['company']:
+                needle = params['company'].lower()
+                mask &= np.isin(company, [company_id for company_id, name in self.company_names.items()
+                                          if needle in name])
+
+            # ORDER BY posted_at DESC, id DESC: urutan semua baris sudah di-cache,
+            # cukup saring dengan mask tanpa mengurutkan ulang
+            order = columns.ordered_rows()
+            rows = order[mask[order]]
+            start = (page - 1) * per_page
+            page_ids = ids[rows[start:start + per_page]].tolist()
+            facets = self._facets(rows, location, company, np.minimum(salary_min, salary_max))
+            del ids, posted_at, salary_min, salary_max, company, location
+        return page_ids, int(rows.size), facets
+
+    def _facets(self, rows, location, company, salary_lower, top=TOP_FACETS):
+        # Format sama dengan facets.build_facets(), dihitung per kolom dengan np.unique
+        def most_common(values):
+            keys, counts = np.unique(values, return_counts=True)
+            best = np.argsort(-counts, kind='stable')[:top]
+            return zip(keys[best].tolist(), counts[best].tolist())
+
+        locations = location[rows]
+        # Predikat sama dengan filter salary_min: min(salary_min, salary_max) >= floor
+        bands = np.clip(np.searchsorted(SALARY_BAND_FLOORS, salary_lower[rows], side='right') - 1, 0, None)
+        band_counts = cumulative_band_counts(np.bincount(bands, minlength=len(SALARY_BAND_FLOORS)).tolist())
+        return {
+            'total': int(rows.size),
+            'locations': [
+                {'id': location_id, 'name': self.location_names.get(location_id), 'count': count}
+                for location_id, count in most_common(locations[locations >= 0])
+            ],
+            'companies': list(most_common(company[rows])),
+            'salary_bands': [
+                {'floor': floor, 'label': salary_band_label(index), 'count': band_counts[index]}
+                for index, floor in enumerate(SALARY_BAND_FLOORS)
+            ],
+        }
+
+    def memory_report(self):
+        with self._lock:
+            report = self.columns.memory_report()
+            report['company_names'] = sys.getsizeof(self.company_names) + sum(
+                sys.getsizeof(name) for name in self.company_names.values())
+            return report, len(self.columns)
+
+
+def _import_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+def init_snapshot(app):
+    if not app.config.get('JOB_SNAPSHOT_ENABLED'):
+        return None
+    if _import_numpy() is None:
+        app.logger.warning('JOB_SNAPSHOT_ENABLED=1 tetapi NumPy tidak terpasang; index() tetap memakai SQL.')
+        return None
+    snapshot = JobSnapshot(
+        refresh_seconds=app.config['JOB_SNAPSHOT_REFRESH_SECONDS'],
+        max_age=app.config['JOB_SNAPSHOT_MAX_AGE'],
+        full_refresh_seconds=app.config['JOB_SNAPSHOT_FULL_REFRESH_SECONDS'],
+    )
+    app.extensions['job_snapshot'] = snapshot
+    return snapshot
@@ -169,32 +169,68 @@ function loadNotifications() {
         })
         .then(notifications => {
             updateNotificationUI(notifications);
+            refreshUnreadCount();
         })
         .catch(error => console.error('Error loading notifications:', error));
 }
 
+let lastUnreadCount = null;
+
 /**
- * Memperbarui UI notifikasi (Dropdown).
- * DIPERBARUI: Disesuaikan untuk dropdown Tailwind baru.
+ * Ambil jumlah belum-dibaca dari penghitung server (bukan dari 10 notifikasi
+ * terakhir). Endpoint memakai ETag, jadi poll yang tidak berubah hanya 304.
+ * Mengembalikan true bila jumlahnya berubah sejak cek sebelumnya.
  */
-function updateNotificationUI(notifications) {
-    const listContainer = document.getElementById('notification-menu'); 
+function refreshUnreadCount() {
+    return fetch('/notifications/unread-count')
+        .then(response => {
+            if (!response.ok) throw new Error('Network response was not ok');
+            return response.json();
+        })
+        .then(data => {
+            const changed = data.unread !== lastUnreadCount;
+            lastUnreadCount = data.unread;
+            updateNotificationBadge(data.unread);
+            return changed;
+        })
+        .catch(error => {
+            console.error('Error loading unread count:', error);
+            return false;
+        });
+}
+
+/**
+ * Polling: cek penghitung saja, daftar notifikasi dimuat ulang hanya bila berubah.
+ */
+function pollNotifications() {
+    refreshUnreadCount().then(changed => changed && loadNotifications());
+}
+
+function updateNotificationBadge(unreadCount) {
     const badge = document.getElementById('notificationBadge');
     const badgeDot = document.getElementById('notificationBadgeDot');
-    
-    if (!listContainer || !badge || !badgeDot) return;
-    
-    const unreadCount = notifications.filter(n => !n.is_read).length;
-    
-    // Update badge
+    if (!badge || !badgeDot) return;
+
     if (unreadCount > 0) {
-        badge.textContent = unreadCount;
+        badge.textContent = unreadCount > 99 ? '99+' : unreadCount;
         badge.classList.remove('tw-hidden');
         badgeDot.classList.remove('tw-hidden');
     } else {
         badge.classList.add('tw-hidden');
         badgeDot.classList.add('tw-hidden');
     }
+}
+
+/**
+ * Memperbarui UI notifikasi (Dropdown).
+ * DIPERBARUI: Disesuaikan untuk dropdown Tailwind baru.
+ */
+function updateNotificationUI(notifications) {
+    const listContainer = document.getElementById('notification-menu'); 
+    
+    if (!listContainer) return;
+    
+    // Badge diisi refreshUnreadCount() dari penghitung server
 
     // Header Dropdown
     let html = `
@@ -252,6 +288,145 @@ function updateNotificationUI(notifications) {
     window.toggleLang(currentLang);
 }
 
+// ======================================================================================
+// --- CACHE & PREFETCH DETAIL PEKERJAAN ---
+// ======================================================================================
+
+const JOB_CACHE_LIMIT = 100;          // Jumlah maksimum detail job yang disimpan
+const JOB_CACHE_TTL_MS = 60000;       // Detail dianggap basi setelah 1 menit (applied_count bisa berubah)
+const JOB_BATCH_SIZE = 50;            // Sama dengan MAX_BATCH_JOB_IDS di views/api.py
+
+const jobDetailCache = new Map();     // jobId -> { data, fetchedAt }
+const jobDetailInFlight = new Map();  // jobId -> Promise (agar tidak fetch ganda)
+
+function cacheJobDetail(job) {
+    const key = String(job.id);
+    jobDetailCache.delete(key); // Pindahkan ke posisi terbaru
+    jobDetailCache.set(key, { data: job, fetchedAt: Date.now() });
+    // Buang entri paling lama (Map menyimpan urutan penyisipan)
+    while (jobDetailCache.size > JOB_CACHE_LIMIT) {
+        jobDetailCache.delete(jobDetailCache.keys().next().value);
+    }
+}
+
+function getCachedJobDetail(jobId) {
+    const entry = jobDetailCache.get(String(jobId));
+    if (!entry) return null;
+    if (Date.now() - entry.fetchedAt > JOB_CACHE_TTL_MS) {
+        jobDetailCache.delete(String(jobId));
+        return null;
+    }
+    return entry.data;
+}
+
+/**
+ * Mengambil detail banyak pekerjaan sekaligus lewat /api/jobs?ids=...
+ * ID yang sudah ada di cache atau sedang di-fetch dilewati.
+ * @param {Array<number|string>} jobIds
+ */
+function prefetchJobDetails(jobIds) {
+    const pending = [...new Set(jobIds.map(String))]
+        .filter(id => id && !getCachedJobDetail(id) && !jobDetailInFlight.has(id));
+
+    for (let i = 0; i < pending.length; i += JOB_BATCH_SIZE) {
+        const chunk = pending.slice(i, i + JOB_BATCH_SIZE);
+        const request = fetch(`/api/jobs?ids=${chunk.join(',')}`)
+            .then(response => {
+                if (!response.ok) throw new Error('Network response was not ok');
+                return response.json();
+            })
+            .then(jobs => {
+                Object.values(jobs).forEach(cacheJobDetail);
+                return jobs;
+            })
+            .catch(error => {
+                console.error('Error prefetching job details:', error);
+                return {};
+            })
+            .finally(() => chunk.forEach(id => jobDetailInFlight.delete(id)));
+
+        chunk.forEach(id => {
+            jobDetailInFlight.set(id, request.then(jobs => jobs[id] || null));
+        });
+    }
+}
+
+/**
+ * Mengambil detail satu pekerjaan: cache -> prefetch yang sedang berjalan -> /job/<id>.
+ * @param {number|string} jobId
+ * @returns {Promise<Object>}
+ */
+function fetchJobDetail(jobId) {
+    const key = String(jobId);
+    const cached = getCachedJobDetail(key);
+    if (cached) return Promise.resolve(cached);
+
+    const inFlight = jobDetailInFlight.has(key) ? jobDetailInFlight.get(key) : Promise.resolve(null);
+    return inFlight.then(job => {
+        if (job) return job;
+        return fetch(`/job/${key}`)
+            .then(response => {
+                if (!response.ok) throw new Error('Network response was not ok');
+                return response.json();
+            })
+            .then(data => {
+                cacheJobDetail(data);
+                return data;
+            });
+    });
+}
+
+/**
+ * Prefetch detail semua kartu pekerjaan yang tampil di halaman (atribut data-job-id)
+ * saat browser sedang idle, supaya modal terbuka tanpa menunggu jaringan.
+ */
+function prefetchVisibleJobDetails() {
+    const ids = Array.from(document.querySelectorAll('[data-job-id]'))
+        .map(el => el.getAttribute('data-job-id'));
+    if (ids.length === 0) return;
+
+    const run = () => prefetchJobDetails(ids);
+    if ('requestIdleCallback' in window) {
+        window.requestIdleCallback(run, { timeout: 2000 });
+    } else {
+        setTimeout(run, 200);
+    }
+}
+
+/**
+ * Autocomplete lokasi untuk input ber-atribut data-location-autocomplete:
+ * saran diambil dari /api/locations?q=... dan diisi ke <datalist>.
+ */
+function initLocationAutocomplete() {
+    document.querySelectorAll('input[data-location-autocomplete]').forEach((input, index) => {
+        const datalist = document.createElement('datalist');
+        datalist.id = `location-suggestions-${index}`;
+        input.after(datalist);
+        input.setAttribute('list', datalist.id);
+
+        let timer = null;
+        input.addEventListener('input', () => {
+            clearTimeout(timer);
+            const query = input.value.trim();
+            if (query.length < 2) return;
+            timer = setTimeout(() => {
+                fetch(`/api/locations?q=${encodeURIComponent(query)}`)
+                    .then(response => response.ok ? response.json() : [])
+                    .then(locations => {
+                        datalist.innerHTML = '';
+                        locations.forEach(location => {
+                            const option = document.createElement('option');
+                            option.value = location.name;
+                            if (location.parent) option.label = location.parent;
+                            datalist.appendChild(option);
+                        });
+                    })
+                    .catch(error => console.error('Error loading locations:', error));
+            }, 150);
+        });
+    });
+}
+
 // ======================================================================================
 // --- FUNGSI MODAL (DIPERBARUI: Tanpa Bootstrap JS) ---
 // ======================================================================================
@@ -276,11 +451,8 @@ window.showJobDetail = function(jobId) {
         return;
     }
 
-    fetch(`/job/${jobId}`)
-        .then(response => {
-            // ... (Logika fetch dan error handling tetap sama)
-            return response.json();
-        })
+    // DIPERBARUI: Ambil dari cache/prefetch dulu, baru ke jaringan jika belum ada
+    fetchJobDetail(jobId)
         .then(job => {
             const modalTitleElement = document.getElementById('jobDetailTitle');
             const modalBodyElement = document.getElementById('jobDetailBody');
@@ -332,8 +504,7 @@ function showApplicationDetail(jobId) {
         return;
     }
 
-    fetch(`/job/${jobId}`)
-        .then(response => response.json())
+    fetchJobDetail(jobId)
         .then(job => {
             // ... (Logika pengisian modal body tetap sama)
 
@@ -555,7 +726,7 @@ document.addEventListener('DOMContentLoaded', function() {
         loadNotifications(); // Muat saat awal
         
         // Setup polling
-        notificationCheckInterval = setInterval(loadNotifications, 30000);
+        notificationCheckInterval = setInterval(pollNotifications, 30000);
 
         // Event delegation untuk klik item notifikasi
         document.getElementById('notification-menu')?.addEventListener('click', function(e) {
@@ -594,6 +765,12 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // Prefetch detail pekerjaan untuk kartu yang tampil di halaman
+    prefetchVisibleJobDetails();
+
+    // Saran lokasi untuk input pencarian/form lowongan
+    initLocationAutocomplete();
+
     // Cleanup on page unload
     window.addEventListener('beforeunload', function() {
         if (notificationCheckInterval) {
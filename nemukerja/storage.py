@@ -0,0 +1,279 @@
+"""Penyimpanan file CV yang bisa diganti: filesystem lokal bersharding atau S3.
+
+Nilai `Applicant.cv_path` adalah *key* storage, bukan path file. Key baru
+berbentuk `ab/cd/<uuid32>.pdf` (dua level direktori dari awal uuid, 65.536
+shard) sehingga tidak ada satu direktori pun yang berisi jutaan file. Key lama
+yang datar (`<uuid32>.pdf`) tetap dikenali; `flask cv-storage-migrate`
+memindahkannya ke layout baru.
+
+Backend dipilih lewat CV_STORAGE_BACKEND:
+- 'local' : file di CV_STORAGE_ROOT. Dengan CV_X_ACCEL_PREFIX, unduhan
+            diserahkan ke nginx (X-Accel-Redirect) sehingga byte tidak lewat worker.
+- 's3'    : bucket S3/MinIO (butuh boto3). Upload dialirkan per chunk multipart,
+            unduhan di-redirect ke presigned URL yang berlaku CV_PRESIGN_SECONDS.
+            CV_S3_ENDPOINT_URL mengarahkan ke MinIO/moto untuk pengujian lokal.
+"""
+import mimetypes
+import os
+import re
+import shutil
+import uuid
+
+from flask import Response, abort, current_app, redirect, send_file
+from werkzeug.utils import secure_filename
+
+from nemukerja.metrics import observe, timed
+from nemukerja.uow import on_commit, on_rollback
+
+CV_CONTENT_TYPE = 'application/pdf'
+CV_DOWNLOAD_NAME = 'CV_Applicant.pdf'
+COPY_CHUNK = 1024 * 1024
+
+# Sharded (ab/cd/<uuid>.ext) atau key lama yang datar (<uuid>.ext). Upload lama menyimpan
+# ekstensi apa adanya (FileAllowed menerima .PDF), jadi huruf besar di ekstensi tetap valid
+_KEY_RE = re.compile(r'^(?:[0-9a-f]{2}/[0-9a-f]{2}/)?([0-9a-f]{32})\.[A-Za-z0-9]{1,8}$')
+
+boto3 = None
+
+
+def _import_boto3():
+    global boto3
+    if boto3 is None:
+        try:
+            import boto3 as module
+        except ImportError:
+            return None
+        boto3 = module
+    return boto3
+
+
+def new_cv_key(filename):
+    ext = os.path.splitext(secure_filename(filename or ''))[1].lower() or '.pdf'
+    name = uuid.uuid4().hex
+    return f'{name[:2]}/{name[2:4]}/{name}{ext}'
+
+
+def sharded_key(key):
+    """Key lama yang datar -> key bersharding dengan nama file yang sama."""
+    match = _KEY_RE.match(key or '')
+    if match is None or '/' in key:
+        return key
+    name = match.group(1)
+    return f'{name[:2]}/{name[2:4]}/{key}'
+
+
+def is_valid_key(key):
+    return bool(key) and _KEY_RE.match(key) is not None
+
+
+def content_type(key):
+    return mimetypes.guess_type(key)[0] or 'application/octet-stream'
+
+
+def _disposition(key, download):
+    # CV selalu diunduh dengan nama netral; file turunan (thumbnail) memakai nama key-nya
+    name = CV_DOWNLOAD_NAME if content_type(key) == CV_CONTENT_TYPE else os.path.basename(key)
+    return f'{"attachment" if download else "inline"}; filename="{name}"'
+
+
+def _stream_size(stream):
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell() - position
+    stream.seek(position)
+    return size
+
+
+class CVStorage:
+    """Antarmuka bersama; subclass mengisi _put, read, delete, exists dan response."""
+
+    def save(self, file_storage):
+        """Simpan FileStorage upload; kembalikan key untuk Applicant.cv_path."""
+        key = new_cv_key(file_storage.filename)
+        stream = file_storage.stream
+        size = _stream_size(stream)
+        with timed('nemukerja_cv_upload_duration_seconds'):
+            self._put(key, stream, size)
+        observe('nemukerja_cv_upload_bytes', size)
+        return key
+
+    def put(self, key, stream):
+        """Tulis stream ke key tertentu (dipakai migrasi dan preview CV)."""
+        self._put(key, stream, _stream_size(stream))
+
+    def _put(self, key, stream, size):
+        raise NotImplementedError
+
+    def read(self, key):
+        """Isi file sebagai bytes; FileNotFoundError jika tidak ada."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def response(self, key, download=False):
+        raise NotImplementedError
+
+
+class LocalStorage(CVStorage):
+    def __init__(self, root, x_accel_prefix=''):
+        self.root = root
+        self.x_accel_prefix = x_accel_prefix.rstrip('/')
+
+    def path(self, key):
+        if not is_valid_key(key):
+            raise ValueError(f'Key CV tidak valid: {key!r}')
+        return os.path.join(self.root, *key.split('/'))
+
+    def _put(self, key, stream, size):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Tulis ke file sementara lalu rename: pembaca tidak pernah melihat file setengah jadi
+        tmp = f'{path}.part'
+        with open(tmp, 'wb') as f:
+            shutil.copyfileobj(stream, f, COPY_CHUNK)
+        os.replace(tmp, path)
+
+    def read(self, key):
+        with open(self.path(key), 'rb') as f:
+            return f.read()
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def exists(self, key):
+        return is_valid_key(key) and os.path.isfile(self.path(key))
+
+    def response(self, key, download=False):
+        if not self.exists(key):
+            abort(404)
+        if self.x_accel_prefix:
+            # nginx melayani file dari location internal; worker hanya mengirim header
+            response = Response(mimetype=content_type(key))
+            response.headers['X-Accel-Redirect'] = f'{self.x_accel_prefix}/{key}'
+            response.headers['Content-Disposition'] = _disposition(key, download)
+            return response
+        response = send_file(self.path(key), mimetype=content_type(key), conditional=True)
+        response.headers['Content-Disposition'] = _disposition(key, download)
+        return response
+
+
+class S3Storage(CVStorage):
+    def __init__(self, bucket, prefix='', endpoint_url=None, region=None, presign_seconds=300,
+                 chunk_size=8 * 1024 * 1024):
+        if _import_boto3() is None:
+            raise RuntimeError('CV_STORAGE_BACKEND=s3 membutuhkan paket boto3')
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.endpoint_url = endpoint_url or None
+        self.region = region or None
+        self.presign_seconds = presign_seconds
+        # Part minimum S3 = 5 MB; CV <= MAX_CONTENT_LENGTH jadi paling banyak beberapa part
+        self.transfer_config = TransferConfig(multipart_threshold=chunk_size, multipart_chunksize=chunk_size,
+                                              max_concurrency=2)
+        self._client = None
+        self._client_pid = None
+
+    @property
+    def client(self):
+        # Client boto3 dibuat ulang setelah fork (koneksi HTTP tidak boleh dibagi antar proses)
+        if self._client is None or self._client_pid != os.getpid():
+            self._client = boto3.client('s3', endpoint_url=self.endpoint_url, region_name=self.region)
+            self._client_pid = os.getpid()
+        return self._client
+
+    def object_key(self, key):
+        if not is_valid_key(key):
+            raise ValueError(f'Key CV tidak valid: {key!r}')
+        return f'{self.prefix}{key}'
+
+    def _put(self, key, stream, size):
+        self.client.upload_fileobj(stream, self.bucket, self.object_key(key),
+                                   ExtraArgs={'ContentType': content_type(key)},
+                                   Config=self.transfer_config)
+
+    def read(self, key):
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))
+        except self.client.exceptions.NoSuchKey:
+            raise FileNotFoundError(key) from None
+        return obj['Body'].read()
+
+    def delete(self, key):
+        if is_valid_key(key):
+            self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+
+    def exists(self, key):
+        if not is_valid_key(key):
+            return False
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+        except self.client.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        return True
+
+    def response(self, key, download=False):
+        if not is_valid_key(key):
+            abort(404)
+        url = self.client.generate_presigned_url('get_object', Params={
+            'Bucket': self.bucket,
+            'Key': self.object_key(key),
+            'ResponseContentType': content_type(key),
+            'ResponseContentDisposition': _disposition(key, download),
+        }, ExpiresIn=self.presign_seconds)
+        response = redirect(url, code=302)
+        # URL bertanda tangan berumur pendek: jangan di-cache browser/proxy
+        response.headers['Cache-Control'] = 'private, no-store'
+        return response
+
+
+def legacy_cv_root(app):
+    return os.path.join(app.root_path, 'static', 'uploads', 'cv')
+
+
+def get_cv_storage():
+    return current_app.extensions['cv_storage']
+
+
+def save_cv(session, file_storage):
+    """Simpan CV sebagai bagian transaksi session: file dihapus lagi bila transaksi tidak di-commit."""
+    storage = get_cv_storage()
+    key = storage.save(file_storage)
+    on_rollback(session, storage.delete, key)
+    return key
+
+
+def delete_cv_after_commit(session, key):
+    """Hapus CV lama hanya setelah commit yang menggantinya berhasil."""
+    if key:
+        on_commit(session, get_cv_storage().delete, key)
+
+
+def init_storage(app):
+    backend = app.config['CV_STORAGE_BACKEND']
+    if backend == 'local':
+        storage = LocalStorage(app.config['CV_STORAGE_ROOT'] or legacy_cv_root(app),
+                               x_accel_prefix=app.config['CV_X_ACCEL_PREFIX'])
+    elif backend == 's3':
+        storage = S3Storage(
+            bucket=app.config['CV_S3_BUCKET'],
+            prefix=app.config['CV_S3_PREFIX'],
+            endpoint_url=app.config['CV_S3_ENDPOINT_URL'],
+            region=app.config['CV_S3_REGION'],
+            presign_seconds=app.config['CV_PRESIGN_SECONDS'],
+            chunk_size=app.config['CV_UPLOAD_CHUNK_MB'] * 1024 * 1024,
+        )
+    else:
+        raise RuntimeError(f'CV_STORAGE_BACKEND tidak dikenal: {backend}')
+    app.extensions['cv_storage'] = storage
+    return storage
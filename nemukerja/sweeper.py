@@ -0,0 +1,119 @@
+"""Penutupan otomatis lowongan: slot penuh atau melewati expires_at.
+
+Dijalankan oleh worker `flask sweeper` (loop) atau `flask sweeper --once`
+(mis. dari cron). Semua langkah berjalan per batch dengan keyset pada indeks,
+dan setiap batch di-commit sendiri sehingga lock singkat dan worker bisa
+dihentikan kapan saja.
+
+Penutupan memakai UPDATE massal yang juga mengisi closed_at (rollup
+"jobs_closed") dan updated_at. Fragment cache kartu job (job.version) dan delta
+snapshot.py diturunkan dari baris itu sendiri; query cache index() dibuang lewat
+versi tag di backend bersama (QUERY_CACHE_BACKEND=sqlite, default), dan facet
+ber-TTL pendek. close_jobs() menandai tag job_listings dan funnel perusahaan
+yang terdampak secara eksplisit, tidak bergantung pada listener DML massal. Dengan backend 'local' perintah ini hanya menaikkan tag di
+prosesnya sendiri dan worker web menunggu QUERY_CACHE_TTL.
+"""
+import logging
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import func, select, update
+
+from nemukerja.funnel import mark_company_funnel_dirty
+from nemukerja.models import Application, JobListing
+from nemukerja.querycache import mark_query_cache_dirty
+
+logger = logging.getLogger(__name__)
+
+SWEEP_BATCH_SIZE = 500
+# Status lamaran yang memakai slot (sama dengan cek slot di apply())
+SLOT_STATUSES = ('Pending', 'Diterima')
+
+
+def expiry_from_date(day):
+    """Tanggal terakhir lowongan dibuka -> expires_at (awal hari berikutnya)."""
+    if day is None:
+        return None
+    return datetime.combine(day + timedelta(days=1), time.min)
+
+
+def expiry_to_date(expires_at):
+    """Kebalikan expiry_from_date(), untuk mengisi form edit."""
+    if expires_at is None:
+        return None
+    return (expires_at - timedelta(days=1)).date()
+
+
+def close_jobs(session, job_ids):
+    """Tutup lowongan terbuka di `job_ids`; cache yang bergantung dibuang setelah commit pemanggil."""
+    if not job_ids:
+        return 0
+    company_ids = session.scalars(
+        select(JobListing.id_company).distinct()
+        .where(JobListing.id.in_(job_ids), JobListing.is_open.is_(True))
+    ).all()
+    if not company_ids:
+        return 0
+    result = session.execute(
+        update(JobListing)
+        .where(JobListing.id.in_(job_ids), JobListing.is_open.is_(True))
+        .values(is_open=False, closed_at=func.now(), updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    mark_query_cache_dirty(session, {JobListing.__tablename__})
+    for company_id in company_ids:
+        mark_company_funnel_dirty(session, company_id)
+    return result.rowcount
+
+
+def sweep_expired(session, batch_size=SWEEP_BATCH_SIZE):
+    """Tutup lowongan terbuka yang expires_at-nya sudah lewat (indeks is_open, expires_at)."""
+    closed = 0
+    while True:
+        job_ids = session.scalars(
+            select(JobListing.id)
+            .where(JobListing.is_open.is_(True), JobListing.expires_at <= func.now())
+            .order_by(JobListing.expires_at)
+            .limit(batch_size)
+        ).all()
+        if not job_ids:
+            return closed
+        closed += close_jobs(session, job_ids)
+        session.commit()
+
+
+def sweep_full(session, batch_size=SWEEP_BATCH_SIZE):
+    """Tutup lowongan terbuka yang slotnya sudah terisi lamaran Pending/Diterima.
+
+    Lowongan terbuka dibaca per batch lewat keyset primary key; jumlah lamaran
+    per batch dihitung dengan satu GROUP BY yang tercakup indeks
+    ix_applications_job_status_applied.
+    """
+    closed = 0
+    last_id = 0
+    while True:
+        jobs = session.execute(
+            select(JobListing.id, JobListing.slots)
+            .where(JobListing.is_open.is_(True), JobListing.id > last_id)
+            .order_by(JobListing.id)
+            .limit(batch_size)
+        ).all()
+        if not jobs:
+            return closed
+        last_id = jobs[-1].id
+
+        used = dict(session.execute(
+            select(Application.id_job, func.count())
+            .where(Application.id_job.in_([job.id for job in jobs]),
+                   Application.status.in_(SLOT_STATUSES))
+            .group_by(Application.id_job)
+        ).all())
+        full = [job.id for job in jobs if used.get(job.id, 0) >= job.slots]
+        closed += close_jobs(session, full)
+        session.commit()
+
+
+def run_sweep(session, batch_size=SWEEP_BATCH_SIZE):
+    return {
+        'expired': sweep_expired(session, batch_size),
+        'full': sweep_full(session, batch_size),
+    }
@@ -0,0 +1,68 @@
+"""Efek samping di luar database (file CV) yang mengikuti nasib transaksi session.
+
+Route tulis melakukan satu commit di akhir; file yang ditulis sebelum commit
+didaftarkan di sini agar:
+- `on_rollback`: dijalankan bila transaksi gagal/di-rollback (mis. hapus CV baru),
+- `on_commit`: dijalankan hanya setelah commit berhasil (mis. hapus CV lama).
+
+Transaksi yang berakhir tanpa commit (rollback eksplisit, exception, atau
+session ditutup teardown request) menjalankan hook rollback. Hook dijalankan
+setelah database selesai; kegagalannya dicatat di log, tidak dilempar lagi.
+"""
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session
+
+from nemukerja.routing import RoutingSession
+
+logger = logging.getLogger(__name__)
+
+COMMIT_HOOKS = 'uow_on_commit'
+ROLLBACK_HOOKS = 'uow_on_rollback'
+
+
+def _current_session(session):
+    # db.session adalah scoped_session; hook terikat ke session (dan transaksi) yang sedang berjalan
+    if isinstance(session, scoped_session):
+        session = session()
+    if not session.in_transaction():
+        session.begin()
+    return session
+
+
+def on_commit(session, fn, *args):
+    _current_session(session).info.setdefault(COMMIT_HOOKS, []).append((fn, args))
+
+
+def on_rollback(session, fn, *args):
+    _current_session(session).info.setdefault(ROLLBACK_HOOKS, []).append((fn, args))
+
+
+def _run(hooks):
+    for fn, args in hooks or ():
+        try:
+            fn(*args)
+        except Exception:
+            logger.exception('Hook transaksi %s gagal', getattr(fn, '__qualname__', fn))
+
+
+def _after_commit(session):
+    session.info.pop(ROLLBACK_HOOKS, None)
+    _run(session.info.pop(COMMIT_HOOKS, None))
+
+
+def _after_transaction_end(session, transaction):
+    if transaction.parent is not None:
+        return
+    # Setelah commit kedua daftar sudah kosong; sisanya berarti transaksi berakhir tanpa commit
+    session.info.pop(COMMIT_HOOKS, None)
+    _run(session.info.pop(ROLLBACK_HOOKS, None))
+
+
+def init_unit_of_work(app):
+    # Listener tingkat kelas session; didaftarkan sekali walau create_app() dipanggil berulang
+    for name, listener in (('after_commit', _after_commit),
+                           ('after_transaction_end', _after_transaction_end)):
+        if not event.contains(RoutingSession, name, listener):
+            event.listen(RoutingSession, name, listener)
@@ -0,0 +1,17 @@
+import importlib
+
+# Blueprint diimpor lewat nama modul saat create_app() dipanggil, bukan saat
+# paket nemukerja diimpor, sehingga form/model/view hanya dimuat bila dipakai.
+BLUEPRINT_MODULES = (
+    'nemukerja.views.public',
+    'nemukerja.views.applicant',
+    'nemukerja.views.company',
+    'nemukerja.views.admin',
+    'nemukerja.views.notifications',
+    'nemukerja.views.api',
+)
+
+
+def register_blueprints(app, modules=BLUEPRINT_MODULES):
+    for module_name in modules:
+        app.register_blueprint(importlib.import_module(module_name).bp)
@@ -0,0 +1,183 @@
+from flask import Blueprint, current_app, render_template, request, jsonify
+from flask_login import login_required
+from sqlalchemy.orm import joinedload
+from nemukerja.activity import ACTIVITY_TYPES, activity_page, parse_activity_args
+from nemukerja.decorators import admin_required
+from nemukerja.extensions import db
+from nemukerja.models import User, Company, JobListing, Application
+from nemukerja.querycache import query_cache_stats
+from nemukerja.rollup import ROLLUP_METRICS, top_dimension_keys, trend_series
+from nemukerja.routing import read_replica
+
+bp = Blueprint('admin', __name__)
+
+@bp.route('/admin/dashboard')
+@login_required
+@admin_required
+@read_replica
+def admin_dashboard():
+    # Get statistics for admin dashboard
+    total_users = User.query.count()
+    total_companies = Company.query.count()
+    total_jobs = JobListing.query.count()
+    total_applications = Application.query.count()
+    
+    # Get user counts by role
+    user_count = User.query.filter_by(role='applicant').count()
+    company_user_count = User.query.filter_by(role='company').count()
+    
+    # Get job statistics
+    jobs = JobListing.query.all()
+    open_jobs = len([job for job in jobs if getattr(job, 'is_open', True)])
+    closed_jobs = len([job for job in jobs if not getattr(job, 'is_open', True)])
+    
+    # RECENT ACTIVITY LOGIC
+    # Satu query ke log append-only activity_events (activity.py); filter tipe dan
+    # scroll-back lewat cursor `before`, biayanya tetap walau riwayat terus bertambah
+    activity_args = parse_activity_args(request.args)
+    recent_activity, next_cursor = activity_page(db.session, activity_args['types'],
+                                                 activity_args['before'], activity_args['limit'])
+    # END RECENT ACTIVITY LOGIC
+    
+    return render_template('admin_dashboard.html',
+                         total_users=total_users,
+                         total_companies=total_companies,
+                         total_jobs=total_jobs,
+                         total_applications=total_applications,
+                         user_count=user_count,
+                         company_user_count=company_user_count,
+                         open_jobs=open_jobs,
+                         closed_jobs=closed_jobs,
+                         recent_activity=recent_activity,
+                         activity_types=ACTIVITY_TYPES,
+                         activity_filter=activity_args['types'],
+                         activity_next_cursor=next_cursor)
+
+
+@bp.route('/admin/users')
+@login_required
+@admin_required
+@read_replica
+def admin_users():
+    users = User.query.options(joinedload(User.applicant_profile), joinedload(User.company_profile)).all()
+    return render_template('admin_users.html', users=users)
+
+
+@bp.route('/admin/companies')
+@login_required
+@admin_required
+@read_replica
+def admin_companies():
+    companies = Company.query.all()
+    return render_template('admin_companies.html', companies=companies)
+
+
+@bp.route('/admin/jobs')
+@login_required
+@admin_required
+@read_replica
+def admin_jobs():
+    jobs = JobListing.query.all()
+    return render_template('admin_jobs.html', jobs=jobs)
+
+
+# Rentang yang ditawarkan di halaman tren (hari)
+TREND_RANGES = (30, 90, 365)
+
+
+def _parse_trend_args(args):
+    metric = args.get('metric', 'applications_submitted', type=str)
+    if metric not in ROLLUP_METRICS:
+        metric = 'applications_submitted'
+    dimension = args.get('dimension', 'all', type=str)
+    if dimension not in ('all',) + ROLLUP_METRICS[metric]:
+        dimension = 'all'
+    days = args.get('days', 90, type=int)
+    return {
+        'metric': metric,
+        'dimension': dimension,
+        'key': args.get('key', '', type=str) if dimension != 'all' else '',
+        'days': min(max(days, 1), 366 * 3),
+    }
+
+
+def _svg_points(values, width=800, height=200):
+    # Koordinat polyline SVG; grafik digambar di server tanpa library JS
+    peak = max(values) or 1
+    step = width / max(len(values) - 1, 1)
+    return ' '.join(f'{i * step:.1f},{height - value / peak * height:.1f}' for i, value in enumerate(values))
+
+
+@bp.route('/admin/trends')
+@login_required
+@admin_required
+@read_replica
+def admin_trends():
+    # Hanya membaca tabel daily_rollups (diisi `flask rollup`), bukan tabel sumber
+    params = _parse_trend_args(request.args)
+    series = trend_series(params['metric'], params['dimension'], params['key'], params['days'])
+    values = [point['value'] for point in series]
+
+    breakdown = []
+    if params['dimension'] != 'all':
+        breakdown = top_dimension_keys(params['metric'], params['dimension'], params['days'])
+    company_names = {}
+    if params['dimension'] == 'company':
+        company_ids = [int(key) for key, _ in breakdown if key.isdigit()]
+        if params['key'].isdigit():
+            company_ids.append(int(params['key']))
+        company_names = {str(company_id): name for company_id, name in
+                         Company.query.with_entities(Company.id, Company.company_name)
+                         .filter(Company.id.in_(company_ids))}
+
+    return render_template('admin_trends.html',
+                           params=params,
+                           series=series,
+                           total=sum(values),
+                           peak=max(values, default=0),
+                           points=_svg_points(values),
+                           breakdown=breakdown,
+                           company_names=company_names,
+                           metrics=ROLLUP_METRICS,
+                           ranges=TREND_RANGES)
+
+
+@bp.route('/api/admin/trends')
+@login_required
+@admin_required
+@read_replica
+def admin_trends_api():
+    params = _parse_trend_args(request.args)
+    return jsonify({
+        **params,
+        'series': trend_series(params['metric'], params['dimension'], params['key'], params['days']),
+    })
+
+
+@bp.route('/api/admin/activity')
+@login_required
+@admin_required
+@read_replica
+def admin_activity_feed():
+    """Scroll-back JSON untuk Recent Activity: ?type=job&type=status&before=<id>&limit=20."""
+    params = parse_activity_args(request.args)
+    events, next_cursor = activity_page(db.session, params['types'], params['before'], params['limit'])
+    return jsonify({'events': [event.to_dict() for event in events], 'next_cursor': next_cursor})
+
+
+@bp.route('/admin/cache')
+@login_required
+@admin_required
+def admin_cache():
+    # Query cache: gabungan semua worker (lewat /metrics); cache LRU lain: worker ini saja
+    query_cache = current_app.extensions.get('query_cache')
+    lru_caches = [
+        ('Facet', current_app.extensions.get('facet_cache')),
+        ('Funnel', current_app.extensions.get('funnel_cache')),
+        ('Template fragment', current_app.jinja_env.fragment_cache),
+    ]
+    return render_template('admin_cache.html',
+                           query_cache=query_cache,
+                           query_stats=query_cache_stats(current_app) if query_cache else [],
+                           query_entries=len(query_cache.backend) if query_cache else 0,
+                           lru_caches=[(name, cache) for name, cache in lru_caches if cache is not None])
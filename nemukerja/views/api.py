@@ -0,0 +1,85 @@
+from flask import Blueprint, jsonify, request
+from flask_login import login_required, current_user
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from nemukerja.extensions import db
+from nemukerja.locations import autocomplete_locations
+from nemukerja.models import JobListing, Application
+from nemukerja.routing import read_replica
+
+bp = Blueprint('api', __name__)
+
+# Batas jumlah ID per request /api/jobs (satu halaman kartu + cadangan)
+MAX_BATCH_JOB_IDS = 50
+
+# NEW API: Mendapatkan Job ID dari Application ID (untuk navigasi notifikasi)
+@bp.route('/api/get_job_id/<int:application_id>')
+@login_required
+def get_job_id_from_application(application_id):
+    application = Application.query.get(application_id)
+    if not application:
+        return jsonify({'job_id': None}), 404
+    
+    # Jika pengguna adalah Pelamar, pastikan aplikasi ini miliknya
+    if current_user.role == 'applicant' and application.id_applicant != current_user.applicant_profile.id:
+         return jsonify({'job_id': None}), 403
+    
+    # Jika pengguna adalah Perusahaan, pastikan aplikasi ini untuk lowongan mereka
+    if current_user.role == 'company' and application.job.company.user.id != current_user.id:
+        return jsonify({'job_id': None}), 403
+
+    return jsonify({'job_id': application.id_job})
+
+
+@bp.route('/job/<int:job_id>')
+@read_replica
+def job_detail(job_id):
+    # Lowongan + perusahaannya dalam satu query yang di-cache (querycache.py)
+    job = JobListing.query.options(joinedload(JobListing.company)) \
+        .execution_options(query_cache='job_detail').filter(JobListing.id == job_id).first_or_404()
+    
+    # Hitung pelamar aktif (Pending atau Diterima)
+    used_slots = Application.query.filter_by(id_job=job.id).filter(
+        Application.status.in_(['Pending', 'Diterima'])
+    ).execution_options(query_cache='job_used_slots').count()
+    
+    data = job.to_dict(used_slots)
+    return jsonify(data)
+
+
+@bp.route('/api/jobs')
+@read_replica
+def job_details_batch():
+    # Detail banyak lowongan sekaligus (?ids=1,2,3) untuk prefetch kartu di script.js.
+    # Satu query: lowongan + company (eager) + jumlah pelamar aktif dari subquery group by.
+    job_ids = []
+    for part in request.args.get('ids', '', type=str).split(','):
+        part = part.strip()
+        if part.isdigit():
+            job_ids.append(int(part))
+    job_ids = list(dict.fromkeys(job_ids))[:MAX_BATCH_JOB_IDS]
+    if not job_ids:
+        return jsonify({})
+
+    used_slots = db.session.query(
+        Application.id_job.label('id_job'),
+        func.count(Application.id).label('used')
+    ).filter(
+        Application.id_job.in_(job_ids),
+        Application.status.in_(['Pending', 'Diterima'])
+    ).group_by(Application.id_job).subquery()
+
+    rows = db.session.query(JobListing, func.coalesce(used_slots.c.used, 0)) \
+        .options(joinedload(JobListing.company)) \
+        .outerjoin(used_slots, used_slots.c.id_job == JobListing.id) \
+        .filter(JobListing.id.in_(job_ids)) \
+        .all()
+
+    return jsonify({str(job.id): job.to_dict(used) for job, used in rows})
+
+
+@bp.route('/api/locations')
+@read_replica
+def location_autocomplete():
+    # Autocomplete input lokasi: prefix alias -> lokasi kanonik (provinsi/kota)
+    return jsonify(autocomplete_locations(db.session, request.args.get('q', '', type=str)))
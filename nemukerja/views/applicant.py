@@ -0,0 +1,215 @@
+from flask import Blueprint, render_template, redirect, url_for, flash
+from flask_login import login_required, current_user
+from nemukerja.extensions import db
+from nemukerja.models import JobListing, Application, Notification
+from nemukerja.forms import ApplyForm, ApplicantProfileForm
+from nemukerja.activity import record_activity
+from nemukerja.ratelimit import rate_limit
+from nemukerja.storage import delete_cv_after_commit, save_cv
+
+bp = Blueprint('applicant', __name__)
+
+@bp.route('/my-applications')
+@login_required
+def my_applications():
+    if current_user.role != 'applicant':
+        flash('Only applicants can access this page.', 'danger')
+        return redirect(url_for('public.dashboard'))
+    
+    applicant = current_user.applicant_profile
+    if not applicant:
+        flash('Applicant profile not found.', 'danger')
+        return redirect(url_for('public.dashboard'))
+    
+    applications = Application.query.filter_by(id_applicant=applicant.id).order_by(Application.applied_at.desc()).all()
+    
+    return render_template('my_applications.html', applications=applications, title_suffix="All Applications")
+
+
+@bp.route('/my-pending')
+@login_required
+def my_pending_applications():
+    if current_user.role != 'applicant':
+        flash('Only applicants can access this page.', 'danger')
+        return redirect(url_for('public.dashboard'))
+    
+    applicant = current_user.applicant_profile
+    if not applicant:
+        flash('Applicant profile not found.', 'danger')
+        return redirect(url_for('public.dashboard'))
+    
+    # Filter hanya yang Pending
+    applications = Application.query.filter_by(
+        id_applicant=applicant.id,
+        status='Pending'
+    ).order_by(Application.applied_at.desc()).all()
+    
+    return render_template('my_applications.html', applications=applications, title_suffix="Pending Applications")
+
+
+@bp.route('/my-accepted')
+@login_required
+def my_accepted_applications():
+    if current_user.role != 'applicant':
+        flash('Only applicants can access this page.', 'danger')
+        return redirect(url_for('public.dashboard'))
+    
+    applicant = current_user.applicant_profile
+    if not applicant:
+        flash('Applicant profile not found.', 'danger')
+        return redirect(url_for('public.dashboard'))
+    
+    # Filter hanya yang Diterima
+    applications = Application.query.filter_by(
+        id_applicant=applicant.id,
+        status='Diterima'
+    ).order_by(Application.applied_at.desc()).all()
+    
+    return render_template('my_applications.html', applications=applications, title_suffix="Accepted Applications")
+
+
+# RUTE BARU: Untuk MELIHAT profil pelamar
+@bp.route('/profile/applicant/view')
+@login_required
+def view_applicant_profile():
+    if current_user.role != 'applicant':
+        flash('Hanya akun pelamar yang dapat mengakses halaman ini.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    applicant = current_user.applicant_profile
+    if not applicant:
+        flash('Profil pelamar tidak ditemukan.', 'danger')
+        return redirect(url_for('public.dashboard'))
+    
+    # Render template untuk MELIHAT profil
+    return render_template('view_applicant_profile.html', applicant=applicant)
+
+
+# RUTE DIPERBARUI: Untuk MENGEDIT profil pelamar
+# (Menggantikan @app.route('/profile/applicant', ...))
+@bp.route('/profile/applicant/edit', methods=['GET', 'POST'])
+@login_required
+def edit_applicant_profile():
+    if current_user.role != 'applicant':
+        flash('Hanya akun pelamar yang dapat mengakses halaman ini.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    applicant = current_user.applicant_profile
+    if not applicant:
+        flash('Profil pelamar tidak ditemukan.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    # Gunakan ApplicantProfileForm dari forms.py
+    form = ApplicantProfileForm(obj=applicant)
+    
+    if form.validate_on_submit():
+        # 1. Update data dasar (nama dan skills)
+        applicant.full_name = form.full_name.data
+        applicant.skills = form.skills.data
+
+        # 2. Handle upload CV jika ada file baru
+        cv_file = form.cv_file.data
+        if cv_file:
+            try:
+                # Simpan file baru dengan key unik; CV lama baru dihapus setelah commit berhasil
+                delete_cv_after_commit(db.session, applicant.cv_path)
+                applicant.cv_path = save_cv(db.session, cv_file)
+                
+            except Exception as e:
+                flash(f'Error mengunggah file CV: {e}', 'danger')
+                db.session.rollback()
+                return redirect(url_for('applicant.edit_applicant_profile'))
+
+        db.session.commit()
+        flash('Profil berhasil disimpan!', 'success')
+        # Redirect ke halaman MELIHAT profil setelah selesai edit
+        return redirect(url_for('applicant.view_applicant_profile'))
+
+    # Render template untuk MENGEDIT profil
+    return render_template('edit_applicant_profile.html', form=form, applicant=applicant)
+
+
+
+@bp.route('/apply/<int:job_id>', methods=['GET', 'POST'])
+@login_required
+@rate_limit('apply', methods=('POST',))
+def apply(job_id):
+    if current_user.role != 'applicant':
+        flash('Only applicants can apply for jobs.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    job = JobListing.query.get_or_404(job_id)
+    applicant = current_user.applicant_profile
+    
+    # --- NEW SLOT CHECK LOGIC ---
+    # Lowongan tertutup (termasuk yang ditutup sweeper karena penuh) ditolak tanpa COUNT
+    if not job.is_open:
+        flash(f'Pekerjaan "{job.title}" saat ini tidak terbuka untuk lamaran.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    # Hitung slot yang terpakai (Pending atau Diterima)
+    used_slots = Application.query.filter_by(id_job=job.id).filter(
+        Application.status.in_(['Pending', 'Diterima'])
+    ).count()
+    
+    if used_slots >= job.slots:
+        flash('Slot lamaran untuk pekerjaan ini sudah penuh.', 'danger')
+        return redirect(url_for('public.dashboard'))
+    # --- END NEW SLOT CHECK LOGIC ---
+
+    if not applicant:
+        flash('Applicant profile not found.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    # Check if already applied
+    existing_application = Application.query.filter_by(
+        id_applicant=applicant.id, 
+        id_job=job.id
+    ).first()
+    if existing_application:
+        flash('You have already applied for this job.', 'warning')
+        return redirect(url_for('public.dashboard'))
+
+    form = ApplyForm()
+    if form.validate_on_submit():
+        # Handle CV upload
+        cv_file = form.cv_file.data
+        if cv_file:
+            try:
+                # Save file to the configured CV storage (local or S3); the file is removed
+                # again if the transaction below does not commit, the old CV only after it does
+                delete_cv_after_commit(db.session, applicant.cv_path)
+                applicant.cv_path = save_cv(db.session, cv_file)
+
+            except Exception as e:
+                db.session.rollback()
+                flash('Error uploading CV file.', 'danger')
+                return redirect(url_for('applicant.apply', job_id=job_id))
+
+        # Create application (flush only to get its id; everything commits once below)
+        application = Application(
+            id_applicant=applicant.id,
+            id_job=job.id,
+            notes=form.cover_letter.data
+        )
+        db.session.add(application)
+        db.session.flush()
+        
+        # Create notification for company when application is received
+        notification = Notification(
+            id_user=job.company.id_user,
+            title="New Application Received",
+            message=f"{current_user.applicant_profile.full_name} applied for {job.title}",
+            type='application_received',
+            related_id=application.id
+        )
+        db.session.add(notification)
+        record_activity(db.session, 'application',
+                        f"New Application for '{job.title}' by {applicant.full_name}.",
+                        id_user=current_user.id, related_id=application.id)
+        db.session.commit()
+        
+        flash('Application submitted successfully! Wait for company response.', 'success')
+        return redirect(url_for('public.dashboard'))
+    
+    return render_template('apply.html', form=form, job=job)
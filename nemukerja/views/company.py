@@ -0,0 +1,439 @@
+from flask import Blueprint, current_app, render_template, redirect, url_for, flash, request, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy import func
+from nemukerja.extensions import db
+from nemukerja.models import Company, JobListing, Application, Applicant, Notification
+from nemukerja.forms import CompanyProfileForm, AddJobForm
+from nemukerja.activity import record_activity
+from nemukerja.funnel import EMPTY_STATS, get_company_funnel
+from nemukerja.jobremoval import remove_job
+from nemukerja.locations import resolve_location_id
+from nemukerja.metrics import observe
+from nemukerja.previews import thumbnail_key
+from nemukerja.rollup import db_today
+from nemukerja.storage import get_cv_storage
+from nemukerja.sweeper import expiry_from_date, expiry_to_date
+from nemukerja.inbox import (APPLICATION_STATUSES, BULK_STATUS_ACTIONS, INBOX_SORTS, apply_cursor,
+                             bulk_set_application_status, company_inbox_query, encode_cursor, parse_inbox_args)
+
+bp = Blueprint('company', __name__)
+
+# RUTE BARU: Untuk MELIHAT profil perusahaan
+@bp.route('/profile/company/view')
+@login_required
+def view_company_profile():
+    if current_user.role != 'company':
+        flash('Hanya akun perusahaan yang dapat mengakses halaman ini.', 'danger')
+        return redirect(url_for('public.index'))
+
+    company = current_user.company_profile
+    if not company:
+        flash('Profil perusahaan tidak ditemukan. Harap lengkapi.', 'warning')
+        return redirect(url_for('company.edit_company_profile'))
+
+    # Ambil data statistik untuk ditampilkan di halaman lihat profil
+    jobs = JobListing.query.filter_by(id_company=company.id, archived_at=None).order_by(JobListing.posted_at.desc()).all()
+    total_jobs = len(jobs)
+    open_jobs = len([job for job in jobs if getattr(job, 'is_open', True)])
+    # Hitungan per status dari funnel (satu query agregat, di-cache) alih-alih memuat job.applications
+    funnel = get_company_funnel(company.id)
+    total_applications = funnel['overall']['total']
+    
+    # Ambil 5 lamaran terbaru (sesuai template view_company_profile.html)
+    recent_applications = db.session.query(Application).join(JobListing).filter(JobListing.id_company == company.id, JobListing.archived_at.is_(None)).order_by(Application.applied_at.desc()).limit(5).all()
+
+    # Render template MELIHAT profil
+    return render_template('view_company_profile.html', 
+                           company=company,
+                           jobs=jobs, # Kirim daftar pekerjaan
+                           recent_applications=recent_applications, # Kirim lamaran terbaru
+                           total_jobs=total_jobs,
+                           open_jobs=open_jobs,
+                           total_applications=total_applications,
+                           funnel=funnel,
+                           empty_stats=EMPTY_STATS)
+
+
+# RUTE DIPERBARUI: Untuk MENGEDIT profil perusahaan
+# (Menggantikan @app.route('/company-profile', ...))
+@bp.route('/profile/company/edit', methods=['GET', 'POST'])
+@login_required
+def edit_company_profile():
+    if current_user.role != 'company':
+        flash('Hanya akun perusahaan yang dapat mengakses halaman ini.', 'danger')
+        return redirect(url_for('public.index'))
+
+    company = current_user.company_profile
+    if not company:
+        # Jika profil belum ada (kasus jarang terjadi), buat baru
+        company = Company(id_user=current_user.id, company_name="New Company")
+        db.session.add(company)
+        db.session.commit()
+        flash('Harap lengkapi profil perusahaan Anda.', 'info')
+
+    # Gunakan CompanyProfileForm dari forms.py
+    form = CompanyProfileForm(obj=company)
+    
+    if form.validate_on_submit():
+        # Mengisi objek company dengan data dari form
+        form.populate_obj(company)
+        db.session.commit()
+        flash('Profil perusahaan berhasil disimpan!', 'success')
+        # Redirect ke halaman MELIHAT profil setelah selesai edit
+        return redirect(url_for('company.view_company_profile'))
+
+    # Render template MENGEDIT profil
+    return render_template('edit_company_profile.html', form=form)
+
+
+# ADD new route for viewing CV
+@bp.route('/cv/<path:filename>')
+@login_required
+def view_cv(filename):
+    # Security check - only company can view CV
+    if current_user.role != 'company':
+        flash('Unauthorized access.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    # filename = key storage; local -> send_file/X-Accel-Redirect, S3 -> redirect ke presigned URL
+    return get_cv_storage().response(filename, download=request.args.get('download') == '1')
+
+
+@bp.route('/cv-preview/<path:filename>')
+@login_required
+def view_cv_preview(filename):
+    if current_user.role != 'company':
+        flash('Unauthorized access.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    # Thumbnail halaman pertama yang dibuat previews.py di samping file CV
+    return get_cv_storage().response(thumbnail_key(filename))
+
+
+@bp.route('/company/job/<int:job_id>/close', methods=['POST'])
+@login_required
+def close_job(job_id):
+    job = JobListing.query.filter_by(id=job_id, archived_at=None).first_or_404()
+    if current_user.role != 'company' or job.company.user.id != current_user.id:
+        flash('You are not authorized to manage this job.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    job.is_open = False
+    job.closed_at = func.now()
+    db.session.commit()
+    flash(f'Job "{job.title}" has been closed. You may now delete it.', 'warning')
+    return redirect(url_for('public.dashboard'))
+
+
+@bp.route('/company/job/<int:job_id>/open', methods=['POST'])
+@login_required
+def open_job(job_id):
+    job = JobListing.query.filter_by(id=job_id, archived_at=None).first_or_404()
+    if current_user.role != 'company' or job.company.user.id != current_user.id:
+        flash('You are not authorized to manage this job.', 'danger')
+        return redirect(url_for('public.dashboard'))
+    
+    job.is_open = True
+    job.closed_at = None
+    # Batas waktu yang sudah lewat akan langsung ditutup lagi oleh sweeper
+    if job.expires_at is not None and job.expires_at.date() <= db_today():
+        job.expires_at = None
+    db.session.commit()
+    flash(f'Job "{job.title}" has been reopened. It is now visible to applicants.', 'success')
+    return redirect(url_for('public.dashboard'))
+
+
+@bp.route('/company/job/<int:job_id>/delete', methods=['POST'])
+@login_required
+def delete_job(job_id):
+    job = JobListing.query.filter_by(id=job_id, archived_at=None).first_or_404()
+    if current_user.role != 'company' or job.company.user.id != current_user.id:
+        flash('You are not authorized to manage this job.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    if job.is_open:
+        flash('Job must be closed before deletion.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    job_title = job.title
+    archive = current_app.config['JOB_DELETE_MODE'] == 'archive'
+
+    # Hapus (cascade di database) atau arsipkan lowongan dan beri tahu pelamarnya dalam satu transaksi
+    remove_job(db.session, job, archive=archive)
+    db.session.commit()
+
+    flash(f'Job "{job_title}" has been successfully {"archived" if archive else "deleted"}.', 'success')
+    return redirect(url_for('public.dashboard'))
+
+
+@bp.route('/company/add-job', methods=['GET', 'POST'])
+@login_required
+def add_job():
+    if current_user.role != 'company':
+        flash('Only companies can add jobs.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    company = current_user.company_profile
+    if not company:
+        flash('Please complete your company profile first.', 'warning')
+        return redirect(url_for('company.edit_company_profile'))
+
+    form = AddJobForm()
+    if form.validate_on_submit():
+        new_job = JobListing(
+            title=form.title.data,
+            location=form.location.data,
+            id_location=resolve_location_id(db.session, form.location.data),
+            salary_min=form.salary_min.data, # BARU
+            salary_max=form.salary_max.data, # BARU
+            description=form.description.data,
+            qualifications=form.qualifications.data,
+            slots=form.slots.data,
+            expires_at=expiry_from_date(form.expires_on.data),
+            id_company=company.id
+        )
+        db.session.add(new_job)
+        # Flush saja untuk mendapatkan id lowongan; lowongan + notifikasi di-commit sekali di bawah
+        db.session.flush()
+        
+        # Create notifications for all applicants when new job is posted
+        applicants = Applicant.query.all()
+        observe('nemukerja_job_notification_fanout', len(applicants))
+        for applicant in applicants:
+            notification = Notification(
+                id_user=applicant.id_user,
+                title="New Job Posted",
+                message=f"A new job '{new_job.title}' has been posted by {company.company_name}",
+                type='job_posted',
+                related_id=new_job.id
+            )
+            db.session.add(notification)
+        record_activity(db.session, 'job', f"New Job: '{new_job.title}' posted by {company.company_name}.",
+                        id_user=current_user.id, related_id=new_job.id)
+        db.session.commit()
+        
+        flash('Job added successfully.', 'success')
+        return redirect(url_for('public.dashboard'))
+    return render_template('add_job.html', form=form)
+
+
+@bp.route('/company/job/<int:job_id>/edit', methods=['GET', 'POST'])
+@login_required
+def edit_job(job_id):
+    if current_user.role != 'company':
+        return redirect(url_for('public.dashboard'))
+    job = JobListing.query.filter_by(id=job_id, archived_at=None).first_or_404()
+
+    if job.company.user.id != current_user.id:
+        flash('You are not authorized to edit this job.', 'danger')
+        return redirect(url_for('public.dashboard'))
+
+    form = AddJobForm(obj=job)
+    if request.method == 'GET':
+        form.expires_on.data = expiry_to_date(job.expires_at)
+    if form.validate_on_submit():
+        form.populate_obj(job)
+        job.id_location = resolve_location_id(db.session, job.location)
+        job.expires_at = expiry_from_date(form.expires_on.data)
+        db.session.commit()
+        flash('Job updated.', 'success')
+        return redirect(url_for('public.dashboard'))
+
+    return render_template('edit_job.html', form=form, job=job)
+
+
+@bp.route('/company/applications')
+@login_required
+def company_applications():
+    if current_user.role != 'company':
+        return redirect(url_for('public.dashboard'))
+    company = current_user.company_profile
+    if not company:
+        return redirect(url_for('public.dashboard'))
+
+    # Inbox dipaginasi di server dengan filter job/status/tanggal (lihat nemukerja/inbox.py)
+    params = parse_inbox_args(request.args)
+    page = request.args.get('page', 1, type=int)
+    pagination = company_inbox_query(Application.query, company.id, params) \
+        .paginate(page=page, per_page=params['per_page'], error_out=False)
+
+    # Dropdown filter job: cukup id + judul, tanpa memuat seluruh objek
+    jobs = db.session.query(JobListing.id, JobListing.title) \
+        .filter(JobListing.id_company == company.id, JobListing.archived_at.is_(None)) \
+        .order_by(JobListing.title).all()
+    filter_args = {key: value for key, value in request.args.items() if key != 'page' and value}
+
+    return render_template('company_applications.html',
+                           applications=pagination.items,
+                           pagination=pagination,
+                           jobs=jobs,
+                           filters=params,
+                           filter_args=filter_args,
+                           statuses=APPLICATION_STATUSES,
+                           sorts=INBOX_SORTS)
+
+
+@bp.route('/api/company/applications')
+@login_required
+def company_applications_feed():
+    """Varian JSON inbox untuk infinite scroll.
+
+    Urutan newest/oldest memakai cursor keyset (`cursor` dari respons
+    sebelumnya) agar halaman jauh tetap memakai indeks; urutan lain memakai `page`.
+    """
+    if current_user.role != 'company' or not current_user.company_profile:
+        return jsonify({'error': 'Unauthorized'}), 403
+    company = current_user.company_profile
+
+    params = parse_inbox_args(request.args)
+    per_page = params['per_page']
+    query = company_inbox_query(Application.query, company.id, params)
+
+    keyset = params['sort'] in ('newest', 'oldest')
+    page = max(request.args.get('page', 1, type=int), 1)
+    if keyset and request.args.get('cursor'):
+        query = apply_cursor(query, request.args['cursor'], params['sort'])
+    elif not keyset:
+        query = query.offset((page - 1) * per_page)
+
+    # Ambil satu baris ekstra untuk tahu apakah masih ada halaman berikutnya
+    applications = query.limit(per_page + 1).all()
+    has_more = len(applications) > per_page
+    applications = applications[:per_page]
+
+    return jsonify({
+        'applications': [application.to_dict() for application in applications],
+        'has_more': has_more,
+        'next_cursor': encode_cursor(applications[-1]) if keyset and has_more else None,
+        'next_page': page + 1 if not keyset and has_more else None,
+    })
+
+
+@bp.route('/company/applications/status', methods=['POST'])
+@login_required
+def bulk_application_status():
+    # Aksi massal dari checkbox inbox: satu transaksi untuk semua lamaran terpilih
+    if current_user.role != 'company' or not current_user.company_profile:
+        return redirect(url_for('public.dashboard'))
+    action = request.form.get('action', '')
+    application_ids = request.form.getlist('application_ids', type=int)
+    if action not in BULK_STATUS_ACTIONS or not application_ids:
+        flash('Select at least one application and an action.', 'warning')
+        return redirect(url_for('company.company_applications'))
+
+    changed, skipped = bulk_set_application_status(
+        db.session, current_user.company_profile.id, application_ids, action, actor_id=current_user.id)
+    db.session.commit()
+
+    flash(f'{len(changed)} application(s) {BULK_STATUS_ACTIONS[action][1]}.', 'success')
+    if skipped:
+        flash(f'{len(skipped)} application(s) skipped (not found, not yours, or already {BULK_STATUS_ACTIONS[action][1]}).', 'info')
+    next_url = request.form.get('next', '')
+    # Kembali ke halaman/filter inbox asal; hanya path lokal
+    if not next_url.startswith('/') or next_url.startswith('//'):
+        next_url = url_for('company.company_applications')
+    return redirect(next_url)
+
+
+@bp.route('/api/company/applications/status', methods=['POST'])
+@login_required
+def bulk_application_status_api():
+    """Varian JSON: {"action": "accept"|"reject", "application_ids": [...]}."""
+    if current_user.role != 'company' or not current_user.company_profile:
+        return jsonify({'error': 'Unauthorized'}), 403
+    payload = request.get_json(silent=True) or {}
+    action = payload.get('action')
+    try:
+        application_ids = [int(application_id) for application_id in payload.get('application_ids', [])]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'application_ids must be a list of integers'}), 400
+    if action not in BULK_STATUS_ACTIONS or not application_ids:
+        return jsonify({'error': 'action and application_ids are required'}), 400
+
+    changed, skipped = bulk_set_application_status(
+        db.session, current_user.company_profile.id, application_ids, action, actor_id=current_user.id)
+    db.session.commit()
+    return jsonify({'updated': changed, 'skipped': skipped})
+
+
+@bp.route('/company/application/<int:application_id>/accept', methods=['POST'])
+@login_required
+def accept_application(application_id):
+    if current_user.role != 'company':
+        return redirect(url_for('public.dashboard'))
+    # Lamaran untuk lowongan yang diarsipkan tidak bisa diubah lagi (sama dengan aksi massal inbox)
+    application = Application.query.join(Application.job) \
+        .filter(Application.id == application_id, JobListing.archived_at.is_(None)).first_or_404()
+
+    if application.job.company.user.id != current_user.id:
+        flash('You are not authorized to manage this application.', 'danger')
+        return redirect(url_for('company.company_applications'))
+    
+    application.status = 'Diterima'
+    if application.responded_at is None:
+        application.responded_at = func.now()
+
+    # Create notification for applicant when application is accepted
+    notification = Notification(
+        id_user=application.applicant.id_user,
+        title="Application Status Updated",
+        message=f"Your application for {application.job.title} has been accepted",
+        type='application_status',
+        related_id=application.id
+    )
+    db.session.add(notification)
+    record_activity(db.session, 'status',
+                    f"Application for '{application.job.title}' by {application.applicant.full_name} accepted.",
+                    id_user=current_user.id, related_id=application.id)
+    db.session.commit()
+    
+    flash('Application accepted.', 'success')
+    return redirect(url_for('company.view_application', application_id=application_id))
+
+
+@bp.route('/company/application/<int:application_id>/reject', methods=['POST'])
+@login_required
+def reject_application(application_id):
+    if current_user.role != 'company':
+        return redirect(url_for('public.dashboard'))
+    # Lamaran untuk lowongan yang diarsipkan tidak bisa diubah lagi (sama dengan aksi massal inbox)
+    application = Application.query.join(Application.job) \
+        .filter(Application.id == application_id, JobListing.archived_at.is_(None)).first_or_404()
+
+    if application.job.company.user.id != current_user.id:
+        flash('You are not authorized to manage this application.', 'danger')
+        return redirect(url_for('company.company_applications'))
+    
+    application.status = 'Ditolak'
+    if application.responded_at is None:
+        application.responded_at = func.now()
+
+    # Create notification for applicant when application is rejected
+    notification = Notification(
+        id_user=application.applicant.id_user,
+        title="Application Status Updated",
+        message=f"Your application for {application.job.title} has been rejected",
+        type='application_status',
+        related_id=application.id
+    )
+    db.session.add(notification)
+    record_activity(db.session, 'status',
+                    f"Application for '{application.job.title}' by {application.applicant.full_name} rejected.",
+                    id_user=current_user.id, related_id=application.id)
+    db.session.commit()
+    
+    flash('Application rejected.', 'info')
+    return redirect(url_for('company.view_application', application_id=application_id))
+
+
+@bp.route('/company/application/<int:application_id>')
+@login_required
+def view_application(application_id):
+    if current_user.role != 'company':
+        return redirect(url_for('public.dashboard'))
+    application = Application.query.get_or_404(application_id)
+
+    if application.job.company.user.id != current_user.id:
+        flash('You are not authorized to view this application.', 'danger')
+        return redirect(url_for('company.company_applications'))
+    return render_template('view_application.html', application=application)
@@ -0,0 +1,59 @@
+from flask import Blueprint, jsonify, request
+from flask_login import login_required, current_user
+from nemukerja.extensions import db
+from nemukerja.models import Notification
+from nemukerja.notify import delete_all, get_unread_count, mark_all_read
+from nemukerja.ratelimit import rate_limit
+from nemukerja.routing import read_replica
+
+bp = Blueprint('notifications', __name__)
+
+@bp.route('/notifications')
+@login_required
+@rate_limit('notifications')
+@read_replica
+def get_notifications():
+    notifications = Notification.query.filter_by(id_user=current_user.id).order_by(Notification.created_at.desc()).limit(10).all()
+    return jsonify([n.to_dict() for n in notifications])
+
+
+@bp.route('/notifications/unread-count')
+@login_required
+@rate_limit('notifications')
+@read_replica
+def unread_count():
+    # Penghitung server (satu lookup primary key); ETag agar poll yang tidak berubah cukup 304
+    unread = get_unread_count(db.session, current_user.id)
+    response = jsonify({'unread': unread})
+    response.set_etag(f'unread-{current_user.id}-{unread}')
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@bp.route('/notifications/read/<int:notification_id>', methods=['POST'])
+@login_required
+def mark_notification_read(notification_id):
+    notification = Notification.query.get_or_404(notification_id)
+    if notification.id_user != current_user.id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    notification.is_read = True
+    db.session.commit()
+    return jsonify({'success': True})
+
+
+@bp.route('/notifications/read-all', methods=['POST'])
+@login_required
+def mark_all_notifications_read():
+    mark_all_read(db.session, current_user.id)
+    db.session.commit()
+    return jsonify({'success': True})
+
+
+@bp.route('/notifications/clear-all', methods=['POST'])
+@login_required
+def clear_all_notifications():
+    # Menghapus semua notifikasi milik pengguna (penghitung dikurangi sebanyak yang belum dibaca)
+    delete_all(db.session, current_user.id)
+    db.session.commit()
+    return jsonify({'success': True})
@@ -0,0 +1,201 @@
+from flask import Blueprint, current_app, render_template, redirect, url_for, flash, request
+from flask_login import login_user, login_required, logout_user, current_user
+from sqlalchemy.orm import joinedload
+from nemukerja.extensions import db, bcrypt
+from nemukerja.models import User, Company, JobListing, Application, Applicant
+from nemukerja.activity import record_activity, registration_activity
+from nemukerja.facets import get_facets
+from nemukerja.forms import RegisterForm, LoginForm, ReactiveForm
+from nemukerja.locations import resolve_search_location
+from nemukerja.funnel import get_company_funnel
+from nemukerja.ratelimit import rate_limit
+from nemukerja.routing import read_replica
+from nemukerja.search import JOBS_PER_PAGE, PrefetchedPagination, job_search_filters, parse_job_search_args
+
+bp = Blueprint('public', __name__)
+
+@bp.route('/')
+@read_replica
+def index():
+    # Parameter untuk Pencarian dan Filter (lihat nemukerja/search.py)
+    params = parse_job_search_args(request.args)
+    # Teks lokasi -> ID lokasi ternormalisasi (alias), agar filter memakai indeks
+    resolve_search_location(params, db.session)
+    
+    # Pagination Parameters
+    page = request.args.get('page', 1, type=int)
+    per_page = JOBS_PER_PAGE # Jumlah item per halaman
+
+    # 0. Snapshot kolumnar in-process (snapshot.py), bila aktif dan masih segar:
+    #    filter/urut/paginasi + facet tanpa query; hanya halaman yang diambil by id
+    snapshot = current_app.extensions.get('job_snapshot')
+    result = snapshot.search(params, page, per_page, db.session) if snapshot else None
+    if result is not None:
+        page_ids, total, facets = result
+        by_id = {job.id: job for job in JobListing.query.options(joinedload(JobListing.company))
+                 .filter(JobListing.id.in_(page_ids))} if page_ids else {}
+        jobs = [by_id[job_id] for job_id in page_ids if job_id in by_id]
+        jobs_pagination = PrefetchedPagination(page=page, per_page=per_page, error_out=False,
+                                               items=jobs, total=total)
+    else:
+        # 1. Implementasi Filter & Search (lowongan terbuka saja)
+        query = JobListing.query.options(joinedload(JobListing.company)) \
+            .filter(*job_search_filters(params)) \
+            .order_by(JobListing.posted_at.desc(), JobListing.id.desc()) \
+            .execution_options(query_cache='open_jobs')  # Halaman yang sama dibagi semua tamu
+
+        # 2. Facet count (lokasi, perusahaan, gaji minimum) dari satu query GROUP BY yang
+        #    di-cache per worker (FACET_CACHE_TTL)
+        facets = get_facets(params, db.session)
+
+        # 3. Implementasi Pagination. Total dihitung dari query yang sama dengan item halaman,
+        #    bukan dari facet yang di-cache, agar jumlah halaman tidak basi setelah ada perubahan
+        jobs_pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        jobs = jobs_pagination.items
+
+    # Perlu list semua perusahaan untuk dropdown filter
+    companies = Company.query.execution_options(query_cache='companies').all()
+
+    return render_template('index.html', 
+                           jobs=jobs, 
+                           pagination=jobs_pagination, # BARU
+                           companies=companies,       # BARU
+                           search_query=params['search'], # BARU
+                           facets=facets,
+                           guest=True)
+
+
+@bp.route('/login', methods=['GET', 'POST'])
+@rate_limit('login', methods=('POST',), per_ip=True)  # Setiap percobaan = satu cek bcrypt
+def login():
+    if current_user.is_authenticated:
+        return redirect(url_for('public.dashboard'))
+    form = LoginForm()
+    if form.validate_on_submit():
+        user = User.query.filter_by(email=form.email.data.lower()).first()
+        if user and bcrypt.check_password_hash(user.password, form.password.data):
+            login_user(user, remember=form.remember.data)
+            return redirect(url_for('public.dashboard'))
+        flash('Invalid email or password.', 'danger')
+    return render_template('login.html', form=form)
+
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if current_user.is_authenticated:
+        return redirect(url_for('public.dashboard'))
+    form = RegisterForm()
+    if form.validate_on_submit():
+        if User.query.filter_by(email=form.email.data.lower()).first():
+            flash('Email already registered.', 'danger')
+            return redirect(url_for('public.register'))
+
+        pw_hash = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+        new_user = User(
+            email=form.email.data.lower(),
+            password=pw_hash,
+            role=form.role.data
+        )
+        db.session.add(new_user)
+        db.session.commit()
+
+        if form.role.data == 'applicant':
+            profile = Applicant(id_user=new_user.id, full_name=form.name.data)
+            db.session.add(profile)
+        elif form.role.data == 'company':
+            profile = Company(
+                id_user=new_user.id,
+                company_name=form.company_name.data,
+                description=form.description.data,
+                contact_email=new_user.email,
+                phone=form.phone.data
+            )
+            db.session.add(profile)
+
+        name = form.company_name.data if form.role.data == 'company' else form.name.data
+        activity_type, description = registration_activity(new_user, name or new_user.email)
+        record_activity(db.session, activity_type, description, id_user=new_user.id, related_id=new_user.id)
+        db.session.commit()
+        flash('Account created successfully! Please login.', 'success')
+        return redirect(url_for('public.login'))
+    return render_template('register.html', form=form)
+
+
+@bp.route('/reactivate', methods=['GET', 'POST'])
+def reactivate():
+    if current_user.is_authenticated:
+        return redirect(url_for('public.dashboard'))
+    form = ReactiveForm()
+    if form.validate_on_submit():
+        flash('If your email exists in our system, a reactivation link has been sent.', 'info')
+        return redirect(url_for('public.login'))
+    return render_template('reactive.html', form=form)
+
+
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    return redirect(url_for('public.index'))
+
+
+@bp.route('/dashboard')
+@login_required
+def dashboard():
+    if current_user.role == 'admin':
+        return redirect(url_for('admin.admin_dashboard'))
+    elif current_user.role == 'company':
+        company = current_user.company_profile
+        if not company or not company.company_name or company.company_name == "New Company":
+            flash('Please complete your company profile first.', 'warning')
+            # PERBARUI INI: Arahkan ke rute edit yang baru
+            return redirect(url_for('company.edit_company_profile'))
+
+        # Lowongan yang diarsipkan (JOB_DELETE_MODE=archive) tidak ditampilkan lagi
+        jobs = JobListing.query.filter_by(id_company=company.id, archived_at=None).order_by(JobListing.posted_at.desc()).all()
+        total_jobs = len(jobs)
+        # Funnel per job dari satu query agregat yang di-cache (lihat nemukerja/funnel.py);
+        # jumlah pelamar per job juga dipakai sebagai kunci fragment cache kartu
+        funnel = get_company_funnel(company.id)
+        application_counts = {job_id: stats['total'] for job_id, stats in funnel['jobs'].items()}
+        total_applications = funnel['overall']['total']
+        recent_applications = db.session.query(Application).join(JobListing).filter(JobListing.id_company == company.id, JobListing.archived_at.is_(None)).order_by(Application.applied_at.desc()).limit(5).all()
+
+        return render_template('dashboard_company.html',
+                                 jobs=jobs,
+                                 company=company,
+                                 total_jobs=total_jobs,
+                                 total_applications=total_applications,
+                                 application_counts=application_counts,
+                                 funnel=funnel,
+                                 recent_applications=recent_applications)
+    else: 
+        # (Logika dashboard applicant/user)
+        jobs = JobListing.query.options(joinedload(JobListing.company)).filter_by(is_open=True).order_by(JobListing.posted_at.desc()).all()
+        
+        applicant_profile = current_user.applicant_profile
+        total_app = applicant_profile.applications if applicant_profile else []
+        pending_app_count = len([app for app in total_app if app.status == 'Pending'])
+        accepted_app_count = len([app for app in total_app if app.status == 'Diterima'])
+
+        return render_template('dashboard_user.html', 
+                               jobs=jobs, 
+                               guest=False,
+                               total_app_count=len(total_app),
+                               pending_app_count=pending_app_count,
+                               accepted_app_count=accepted_app_count)
+
+
+@bp.route('/about')
+def about():
+    return render_template('about.html')
+
+
+@bp.route('/contact')
+def contact():
+    return render_template('contact.html')
+
+
+@bp.route('/address')
+def address():
+    return render_template('address.html')
@@ -0,0 +1,71 @@
+"""Fixture bersama: aplikasi dengan database SQLite sementara berisi satu
+perusahaan (company@example.com), satu pelamar (applicant@example.com) dan
+tiga lowongan terbuka di Bandung. Password semua user: 'secret'.
+"""
+import pytest
+
+from nemukerja.app import create_app
+from nemukerja.config import Config
+from nemukerja.extensions import bcrypt, db
+from nemukerja.models import Applicant, Company, JobListing, User
+
+PASSWORD = 'secret'
+
+
+def _seed():
+    password = bcrypt.generate_password_hash(PASSWORD).decode()
+    company_user = User(email='company@example.com', password=password, role='company')
+    applicant_user = User(email='applicant@example.com', password=password, role='applicant')
+    db.session.add_all([company_user, applicant_user])
+    db.session.flush()
+    company = Company(id_user=company_user.id, company_name='Acme', description='Acme Corp')
+    db.session.add_all([company, Applicant(id_user=applicant_user.id, full_name='Ann', skills='python sql')])
+    db.session.flush()
+    db.session.add_all([
+        JobListing(id_company=company.id, title=f'Job {i}', description='desc ' * 30, qualifications='python',
+                   location='Bandung', salary_min=1_000_000, salary_max=2_000_000, slots=3)
+        for i in range(3)
+    ])
+    db.session.commit()
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Pabrik aplikasi; setiap panggilan seperti satu worker gunicorn di atas database yang sama."""
+    apps = []
+
+    def factory(**overrides):
+        class TestConfig(Config):
+            TESTING = True
+            WTF_CSRF_ENABLED = False
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "test.db"}'
+            SQLALCHEMY_ENGINE_OPTIONS = {}
+            SQLALCHEMY_BINDS = {}
+            RATE_LIMIT_ENABLED = False
+            METRICS_ENABLED = False
+            QUERY_CACHE_DB = str(tmp_path / 'querycache.db')
+            CV_STORAGE_BACKEND = 'local'
+            CV_STORAGE_ROOT = str(tmp_path / 'cv')
+            CV_PREVIEW_ENABLED = False
+            JINJA_BYTECODE_CACHE_DIR = str(tmp_path)
+
+        for name, value in overrides.items():
+            setattr(TestConfig, name, value)
+        app = create_app(TestConfig)
+        with app.app_context():
+            if not apps:
+                db.create_all()
+                _seed()
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
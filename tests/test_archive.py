@@ -0,0 +1,49 @@
+"""JOB_DELETE_MODE=archive: lamaran lowongan yang diarsipkan tetap ada tetapi tidak bisa diubah."""
+import io
+
+import pytest
+
+from nemukerja.extensions import db
+from nemukerja.models import Application, JobListing, Notification
+
+PASSWORD = 'secret'
+
+
+def login(app, email):
+    client = app.test_client()
+    client.post('/login', data={'email': email, 'password': PASSWORD})
+    return client
+
+
+@pytest.fixture
+def archived_application(make_app):
+    app = make_app(JOB_DELETE_MODE='archive')
+    with app.app_context():
+        job_id = db.session.scalar(db.select(JobListing.id).order_by(JobListing.id))
+    login(app, 'applicant@example.com').post(f'/apply/{job_id}', data={
+        'cover_letter': 'I would like to apply. ' * 6,
+        'cv_file': (io.BytesIO(b'%PDF-1.4 test'), 'cv.pdf'),
+    }, content_type='multipart/form-data')
+    company = login(app, 'company@example.com')
+    assert company.post(f'/company/job/{job_id}/close').status_code == 302
+    assert company.post(f'/company/job/{job_id}/delete').status_code == 302
+    with app.app_context():
+        assert db.session.get(JobListing, job_id).archived_at is not None
+        application_id = db.session.scalar(db.select(Application.id))
+    return app, company, application_id
+
+
+def notification_count(app):
+    with app.app_context():
+        return db.session.scalar(db.select(db.func.count()).select_from(Notification))
+
+
+@pytest.mark.parametrize('action', ['accept', 'reject'])
+def test_status_change_on_archived_job_is_404(archived_application, action):
+    app, company, application_id = archived_application
+    notifications = notification_count(app)
+
+    assert company.post(f'/company/application/{application_id}/{action}').status_code == 404
+    with app.app_context():
+        assert db.session.get(Application, application_id).status == 'Pending'
+    assert notification_count(app) == notifications
@@ -0,0 +1,115 @@
+"""Setiap route tulis melakukan tepat satu COMMIT ke database.
+
+Route yang menulis beberapa tabel (lamaran + notifikasi + log aktivitas, dst.)
+harus menyelesaikannya dalam satu transaksi; commit di tengah jalan berarti
+kegagalan setelahnya meninggalkan data setengah jadi. Commit dihitung di
+tingkat Engine, jadi commit dari session mana pun ikut terhitung.
+"""
+import io
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from nemukerja.extensions import db
+from nemukerja.models import Application, JobListing, Notification
+
+PASSWORD = 'secret'
+
+
+@pytest.fixture
+def commits():
+    counted = []
+
+    def count(conn):
+        counted.append(conn)
+
+    event.listen(Engine, 'commit', count)
+    yield counted
+    event.remove(Engine, 'commit', count)
+
+
+def login(app, email):
+    client = app.test_client()
+    client.post('/login', data={'email': email, 'password': PASSWORD})
+    return client
+
+
+def apply(client, job_id):
+    return client.post(f'/apply/{job_id}', data={
+        'cover_letter': 'I would like to apply. ' * 6,
+        'cv_file': (io.BytesIO(b'%PDF-1.4 test'), 'cv.pdf'),
+    }, content_type='multipart/form-data')
+
+
+def job_ids(app):
+    with app.app_context():
+        return db.session.scalars(db.select(JobListing.id).order_by(JobListing.id)).all()
+
+
+def application_ids(app):
+    with app.app_context():
+        return db.session.scalars(db.select(Application.id).order_by(Application.id)).all()
+
+
+def test_apply_commits_once(app, commits):
+    client = login(app, 'applicant@example.com')
+    first, second = job_ids(app)[:2]
+
+    commits.clear()
+    assert apply(client, first).status_code == 302
+    assert len(commits) == 1
+
+    # Lamaran kedua mengganti CV: file lama dihapus setelah commit, bukan dengan commit tambahan
+    commits.clear()
+    assert apply(client, second).status_code == 302
+    assert len(commits) == 1
+    assert len(application_ids(app)) == 2
+
+
+@pytest.mark.parametrize('action, status', [('accept', 'Diterima'), ('reject', 'Ditolak')])
+def test_status_change_commits_once(app, commits, action, status):
+    apply(login(app, 'applicant@example.com'), job_ids(app)[0])
+    client = login(app, 'company@example.com')
+    application_id = application_ids(app)[0]
+
+    commits.clear()
+    assert client.post(f'/company/application/{application_id}/{action}').status_code == 302
+    assert len(commits) == 1
+    with app.app_context():
+        application = db.session.get(Application, application_id)
+        assert application.status == status
+        assert application.responded_at is not None
+        assert db.session.scalar(db.select(db.func.count()).select_from(Notification)
+                                 .where(Notification.type == 'application_status')) == 1
+
+
+def test_add_job_commits_once(app, commits):
+    client = login(app, 'company@example.com')
+
+    commits.clear()
+    response = client.post('/company/add-job', data={
+        'title': 'Data Engineer', 'location': 'Jakarta', 'salary_min': 5_000_000, 'salary_max': 9_000_000,
+        'description': 'Build pipelines. ' * 5, 'qualifications': 'python sql', 'slots': 2,
+    })
+    assert response.status_code == 302
+    assert len(commits) == 1
+    assert len(job_ids(app)) == 4
+
+
+def test_delete_job_commits_once(app, commits):
+    job_id = job_ids(app)[0]
+    apply(login(app, 'applicant@example.com'), job_id)
+    client = login(app, 'company@example.com')
+    with app.app_context():
+        db.session.get(JobListing, job_id).is_open = False
+        db.session.commit()
+
+    commits.clear()
+    assert client.post(f'/company/job/{job_id}/delete').status_code == 302
+    assert len(commits) == 1
+    with app.app_context():
+        assert db.session.get(JobListing, job_id) is None
+        assert application_ids(app) == []
+        assert db.session.scalar(db.select(db.func.count()).select_from(Notification)
+                                 .where(Notification.title == 'Job Posting Removed')) == 1
@@ -0,0 +1,26 @@
+"""Fragment cache kartu lowongan: kunci tidak boleh bentrok saat id baris dipakai ulang."""
+from datetime import timedelta
+
+from nemukerja.extensions import db
+from nemukerja.models import JobListing
+
+
+def test_reused_job_id_does_not_render_old_card(app):
+    client = app.test_client()
+    assert b'Job 2' in client.get('/').data
+
+    with app.app_context():
+        old = db.session.scalar(db.select(JobListing).order_by(JobListing.id.desc()))
+        job_id, company_id, posted_at = old.id, old.id_company, old.posted_at
+        db.session.delete(old)
+        db.session.commit()
+        # SQLite tanpa AUTOINCREMENT memakai ulang rowid terbesar yang dihapus
+        job = JobListing(id_company=company_id, title='Fresh job', description='new ' * 30, qualifications='go',
+                         location='Bandung', slots=1, posted_at=posted_at + timedelta(minutes=5))
+        db.session.add(job)
+        db.session.commit()
+        assert (job.id, job.version) == (job_id, 0)
+
+    body = client.get('/').data
+    assert b'Fresh job' in body
+    assert b'Job 2' not in body
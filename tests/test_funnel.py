@@ -0,0 +1,49 @@
+"""Cache funnel per worker diinvalidasi lewat tag store query cache yang dibagi."""
+import io
+
+from nemukerja.extensions import db
+from nemukerja.funnel import get_company_funnel
+from nemukerja.models import Company, JobListing
+
+PASSWORD = 'secret'
+
+
+def apply(app, job_id):
+    client = app.test_client()
+    client.post('/login', data={'email': 'applicant@example.com', 'password': PASSWORD})
+    return client.post(f'/apply/{job_id}', data={
+        'cover_letter': 'I would like to apply. ' * 6,
+        'cv_file': (io.BytesIO(b'%PDF-1.4 test'), 'cv.pdf'),
+    }, content_type='multipart/form-data')
+
+
+def funnel_total(app):
+    with app.app_context():
+        company_id = db.session.scalar(db.select(Company.id))
+        return get_company_funnel(company_id)['overall']['total']
+
+
+def first_job_id(app):
+    with app.app_context():
+        return db.session.scalar(db.select(JobListing.id).order_by(JobListing.id))
+
+
+def test_commit_in_one_worker_invalidates_funnel_in_another(make_app):
+    writer = make_app(QUERY_CACHE_BACKEND='sqlite')
+    reader = make_app(QUERY_CACHE_BACKEND='sqlite')
+    assert funnel_total(reader) == 0  # Ter-cache di worker pembaca
+
+    assert apply(writer, first_job_id(writer)).status_code == 302
+
+    assert funnel_total(reader) == 1
+    assert funnel_total(writer) == 1
+
+
+def test_funnel_cache_hit_without_commit(make_app):
+    app = make_app(QUERY_CACHE_BACKEND='sqlite')
+    funnel_total(app)
+    cache = app.extensions['funnel_cache']
+    hits = cache.hits
+
+    funnel_total(app)
+    assert cache.hits == hits + 1
@@ -0,0 +1,113 @@
+"""Penghitung notifikasi belum-dibaca: selalu diubah dengan delta, tidak pernah di-set ulang."""
+import pytest
+
+from nemukerja.extensions import db
+from nemukerja.models import Notification, NotificationCounter, User
+from nemukerja.notify import bump_unread, delete_all, get_unread_count, mark_all_read, notify_many
+
+PASSWORD = 'secret'
+
+
+def notification(user_id, **values):
+    return {'id_user': user_id, 'title': 'Hi', 'message': 'Hello', 'type': 'job_posted', 'related_id': None, **values}
+
+
+@pytest.fixture
+def user_id(app):
+    with app.app_context():
+        return db.session.scalar(db.select(User.id).where(User.email == 'applicant@example.com'))
+
+
+def unread(app, user_id):
+    with app.app_context():
+        return get_unread_count(db.session, user_id)
+
+
+def set_counter(app, user_id, value):
+    # Simulasi penghitung yang sudah memuat +1 dari notifikasi request lain yang sedang berjalan
+    with app.app_context():
+        db.session.merge(NotificationCounter(id_user=user_id, unread=value))
+        db.session.commit()
+
+
+def test_notify_many_and_orm_inserts_bump_counter(app, user_id):
+    with app.app_context():
+        notify_many(db.session, [notification(user_id), notification(user_id), notification(user_id, is_read=True)])
+        db.session.add(Notification(**notification(user_id)))
+        db.session.commit()
+
+    assert unread(app, user_id) == 3
+
+
+def test_mark_all_read_subtracts_rows_changed(app, user_id):
+    with app.app_context():
+        notify_many(db.session, [notification(user_id), notification(user_id)])
+        db.session.commit()
+    set_counter(app, user_id, 3)
+
+    with app.app_context():
+        assert mark_all_read(db.session, user_id) == 2
+        db.session.commit()
+
+    assert unread(app, user_id) == 1
+
+
+def test_delete_all_subtracts_only_unread_rows(app, user_id):
+    with app.app_context():
+        notify_many(db.session, [notification(user_id), notification(user_id), notification(user_id, is_read=True)])
+        db.session.commit()
+    set_counter(app, user_id, 3)
+
+    with app.app_context():
+        assert delete_all(db.session, user_id) == 3
+        db.session.commit()
+
+    assert unread(app, user_id) == 1
+
+
+def test_routes_keep_counter_in_sync(app, user_id):
+    with app.app_context():
+        notify_many(db.session, [notification(user_id) for _ in range(3)])
+        db.session.commit()
+        first_id = db.session.scalar(db.select(Notification.id).order_by(Notification.id))
+    client = app.test_client()
+    client.post('/login', data={'email': 'applicant@example.com', 'password': PASSWORD})
+
+    for _ in range(2):  # Menandai yang sudah dibaca tidak mengurangi lagi
+        assert client.post(f'/notifications/read/{first_id}').status_code == 200
+    assert client.get('/notifications/unread-count').get_json() == {'unread': 2}
+
+    assert client.post('/notifications/read-all').status_code == 200
+    assert client.get('/notifications/unread-count').get_json() == {'unread': 0}
+
+    with app.app_context():
+        notify_many(db.session, [notification(user_id)])
+        db.session.commit()
+    assert client.post('/notifications/clear-all').status_code == 200
+    assert client.get('/notifications/unread-count').get_json() == {'unread': 0}
+
+
+def test_bump_unread_clamps_at_zero(app, user_id):
+    set_counter(app, user_id, 1)
+    with app.app_context():
+        bump_unread(db.session, {user_id: -3, 999: -2})
+        db.session.commit()
+
+    assert unread(app, user_id) == 0
+    assert unread(app, 999) == 0
+
+
+def test_notifications_repair(app, user_id):
+    with app.app_context():
+        notify_many(db.session, [notification(user_id), notification(user_id)])
+        db.session.commit()
+    set_counter(app, user_id, 7)
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=['notifications-repair', '--dry-run'])
+    assert f'user {user_id}: 7 -> 2' in result.output
+    assert unread(app, user_id) == 7
+
+    result = runner.invoke(args=['notifications-repair'])
+    assert result.output.endswith('1 penghitung menyimpang diperbaiki.\n')
+    assert unread(app, user_id) == 2
@@ -0,0 +1,26 @@
+"""Query cache: invalidasi dari proses lain (worker gunicorn, perintah CLI) lewat backend bersama."""
+from nemukerja.config import Config
+from nemukerja.extensions import db
+from nemukerja.models import JobListing
+from nemukerja.sweeper import close_jobs
+
+
+def test_default_backend_is_shared():
+    assert Config.QUERY_CACHE_BACKEND == 'sqlite'
+
+
+def test_cli_writer_invalidates_index_cached_by_web_worker(make_app):
+    web = make_app()
+    cli = make_app()
+    client = web.test_client()
+    assert 'Job 0' in client.get('/').get_data(as_text=True)
+    stats = web.extensions['query_cache'].stats['open_jobs']
+    assert 'Job 0' in client.get('/').get_data(as_text=True)
+    assert stats['hit'] >= 1
+
+    with cli.app_context():
+        job_id = db.session.scalar(db.select(JobListing.id).where(JobListing.title == 'Job 0'))
+        assert close_jobs(db.session, [job_id]) == 1
+        db.session.commit()
+
+    assert 'Job 0' not in client.get('/').get_data(as_text=True)
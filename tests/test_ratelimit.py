@@ -0,0 +1,73 @@
+"""Token bucket SQLite: parse_rate, isi ulang dengan waktu yang disuntikkan, dan 429 di /login."""
+import pytest
+
+from nemukerja.ratelimit import RateLimiter, parse_rate
+
+PASSWORD = 'secret'
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('10/60', (10, 60.0)),
+    ('5/0.5', (5, 0.5)),
+    ('3', (3, 1.0)),
+])
+def test_parse_rate(value, expected):
+    assert parse_rate(value) == expected
+
+
+@pytest.mark.parametrize('value', ['0/60', '-1/60', '10/0', '10/-5', 'abc/60', '10/x', '', '1.5/60'])
+def test_parse_rate_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_rate(value)
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    return RateLimiter(str(tmp_path / 'ratelimit.db'), {'login': '3/60', 'apply': '1/10'})
+
+
+def test_burst_then_retry_after(limiter):
+    assert [limiter.hit('login', 'ip:1', now=1000.0) for _ in range(3)] == [(True, 0)] * 3
+    # Token habis; satu token kembali setelah 60/3 = 20 detik
+    assert limiter.hit('login', 'ip:1', now=1000.0) == (False, 20)
+    assert limiter.hit('login', 'ip:1', now=1015.0) == (False, 5)
+
+
+def test_refill_is_proportional_and_capped(limiter):
+    for _ in range(3):
+        limiter.hit('login', 'ip:1', now=1000.0)
+
+    assert limiter.hit('login', 'ip:1', now=1020.0) == (True, 0)
+    assert limiter.hit('login', 'ip:1', now=1020.0)[0] is False
+
+    # Lama tidak dipakai: bucket penuh lagi, tetapi tidak melebihi kapasitas
+    assert [limiter.hit('login', 'ip:1', now=5000.0)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_clock_going_backwards_does_not_refill(limiter):
+    limiter.hit('apply', 'user:1', now=1000.0)
+
+    assert limiter.hit('apply', 'user:1', now=900.0) == (False, 10)
+    assert limiter.hit('apply', 'user:1', now=1010.0) == (True, 0)
+
+
+def test_buckets_are_per_policy_and_identity(limiter):
+    assert limiter.hit('apply', 'user:1', now=1000.0) == (True, 0)
+    assert limiter.hit('apply', 'user:2', now=1000.0) == (True, 0)
+    assert limiter.hit('login', 'user:1', now=1000.0) == (True, 0)
+    assert limiter.hit('apply', 'user:1', now=1000.0)[0] is False
+
+
+def test_login_returns_429_with_retry_after(make_app, tmp_path):
+    app = make_app(RATE_LIMIT_ENABLED=True, RATE_LIMIT_DB=str(tmp_path / 'ratelimit.db'),
+                   RATE_LIMITS={'login': '2/60', 'apply': '5/60', 'notifications': '30/60'})
+    client = app.test_client()
+    data = {'email': 'company@example.com', 'password': 'wrong'}
+
+    assert [client.post('/login', data=data).status_code for _ in range(2)] == [200, 200]
+    response = client.post('/login', data=data)
+    assert response.status_code == 429
+    assert 1 <= int(response.headers['Retry-After']) <= 30
+
+    # GET halaman login tidak memakai kuota
+    assert client.get('/login').status_code == 200
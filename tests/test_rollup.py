@@ -0,0 +1,143 @@
+"""Rollup harian: kunci lokasi kanonik dan hitung ulang hari lama yang berubah."""
+import io
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from nemukerja.extensions import db
+from nemukerja.locations import backfill_job_locations, seed_locations
+from nemukerja.models import Application, Company, DailyRollup, JobListing, RollupWatermark
+from nemukerja.rollup import db_today, run_rollup
+
+PASSWORD = 'secret'
+
+
+def login(app, email):
+    client = app.test_client()
+    client.post('/login', data={'email': email, 'password': PASSWORD})
+    return client
+
+
+def rollup_values(metric, dimension='all'):
+    return {(row.day, row.dimension_key): row.value for row in db.session.scalars(
+        db.select(DailyRollup).where(DailyRollup.metric == metric, DailyRollup.dimension == dimension))}
+
+
+def watermark_day():
+    db.session.expire_all()
+    return db.session.get(RollupWatermark, 'daily').day
+
+
+@pytest.fixture
+def past_day(app):
+    with app.app_context():
+        return db_today() - timedelta(days=3)
+
+
+@pytest.fixture
+def accepted_in_past(app, past_day):
+    """Dua lamaran diterima tiga hari lalu; rollup sudah berjalan sampai hari ini."""
+    applicant = login(app, 'applicant@example.com')
+    company = login(app, 'company@example.com')
+    with app.app_context():
+        job_ids = db.session.scalars(db.select(JobListing.id).order_by(JobListing.id)).all()[:2]
+    for job_id in job_ids:
+        applicant.post(f'/apply/{job_id}', data={
+            'cover_letter': 'I would like to apply. ' * 6,
+            'cv_file': (io.BytesIO(b'%PDF-1.4 test'), 'cv.pdf'),
+        }, content_type='multipart/form-data')
+    with app.app_context():
+        application_ids = db.session.scalars(db.select(Application.id).order_by(Application.id)).all()
+    for application_id in application_ids:
+        company.post(f'/company/application/{application_id}/accept')
+    with app.app_context():
+        db.session.execute(db.update(Application).values(responded_at=datetime.combine(past_day, time(10))))
+        db.session.commit()
+        run_rollup(full=True)
+        assert rollup_values('applications_accepted') == {(past_day, ''): 2}
+        assert watermark_day() == db_today()
+    return company, application_ids
+
+
+def test_location_dimension_uses_canonical_names(app):
+    with app.app_context():
+        seed_locations(db.session)
+        company = db.session.scalar(db.select(Company))
+        for location in ['Jaksel', 'Kota Jakarta Selatan', '  KOTA Atlantis ', 'atlantis']:
+            db.session.add(JobListing(id_company=company.id, title='t', description='d', qualifications='q',
+                                      location=location, slots=1))
+        db.session.commit()
+        backfill_job_locations(db.session)
+
+        run_rollup(full=True)
+
+        keys = {key: value for (_, key), value in rollup_values('jobs_posted', 'location').items()}
+        assert keys == {'Bandung': 3, 'Jakarta Selatan': 2, 'atlantis': 2}
+
+
+def test_single_status_change_recomputes_old_day(app, accepted_in_past, past_day):
+    company, application_ids = accepted_in_past
+
+    company.post(f'/company/application/{application_ids[0]}/reject')
+
+    with app.app_context():
+        assert watermark_day() == past_day
+        run_rollup()
+        assert rollup_values('applications_accepted') == {(past_day, ''): 1}
+        assert rollup_values('applications_rejected') == {(past_day, ''): 1}
+
+
+def test_bulk_status_change_recomputes_old_day(app, accepted_in_past, past_day):
+    company, application_ids = accepted_in_past
+
+    company.post('/company/applications/status', data={'action': 'reject', 'application_ids': application_ids})
+
+    with app.app_context():
+        assert watermark_day() == past_day
+        run_rollup()
+        incremental = rollup_values('applications_rejected'), rollup_values('applications_accepted')
+        run_rollup(full=True)
+        assert incremental == (rollup_values('applications_rejected'), rollup_values('applications_accepted'))
+        assert incremental == ({(past_day, ''): 2}, {})
+
+
+def test_reopened_job_recomputes_old_close_day(app, past_day):
+    company = login(app, 'company@example.com')
+    with app.app_context():
+        job_id = db.session.scalar(db.select(JobListing.id).order_by(JobListing.id))
+    company.post(f'/company/job/{job_id}/close')
+    with app.app_context():
+        db.session.execute(db.update(JobListing).where(JobListing.id == job_id)
+                           .values(closed_at=datetime.combine(past_day, time(9))))
+        db.session.commit()
+        run_rollup(full=True)
+        assert rollup_values('jobs_closed') == {(past_day, ''): 1}
+
+    company.post(f'/company/job/{job_id}/open')
+
+    with app.app_context():
+        assert watermark_day() == past_day
+        run_rollup()
+        assert rollup_values('jobs_closed') == {}
+
+
+def test_watermark_moved_back_during_run_is_kept(app, accepted_in_past, past_day, monkeypatch):
+    import nemukerja.rollup as rollup
+
+    collect = rollup._collect
+
+    def collect_then_concurrent_write(since):
+        counts = collect(since)
+        # Request lain commit perubahan status hari lama selagi rollup menghitung
+        with db.engine.begin() as connection:
+            rollup.mark_rollup_days_dirty(None, [past_day], connection=connection)
+        return counts
+
+    monkeypatch.setattr(rollup, '_collect', collect_then_concurrent_write)
+    with app.app_context():
+        run_rollup()
+        assert watermark_day() == past_day
+
+        monkeypatch.setattr(rollup, '_collect', collect)
+        run_rollup()
+        assert watermark_day() == db_today()
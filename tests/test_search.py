@@ -0,0 +1,56 @@
+"""Filter lokasi index(): ID lokasi ternormalisasi dengan teks sebagai cadangan."""
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from nemukerja.extensions import db
+from nemukerja.locations import backfill_job_locations, resolve_location_id, seed_locations
+from nemukerja.models import Company, JobListing
+from nemukerja.search import parse_job_search_args
+from nemukerja.snapshot import init_snapshot
+
+
+@pytest.fixture
+def jakarta_jobs(app):
+    with app.app_context():
+        seed_locations(db.session)
+        company = db.session.scalars(db.select(Company)).first()
+        for title, location in [('Mapped Job', 'Jakarta Selatan'), ('Unmapped Job', 'Jakarta Raya')]:
+            db.session.add(JobListing(id_company=company.id, title=title, description='desc ' * 30,
+                                      qualifications='python', location=location, slots=1))
+        db.session.commit()
+        mapped, unmatched = backfill_job_locations(db.session)
+        assert ('Jakarta Raya', 1) in unmatched
+        assert resolve_location_id(db.session, 'jakarta') is not None
+    return app
+
+
+def test_location_text_still_matches_unmapped_jobs(jakarta_jobs):
+    html = jakarta_jobs.test_client().get('/?location=jakarta').get_data(as_text=True)
+
+    assert 'Mapped Job' in html
+    assert 'Unmapped Job' in html
+    assert 'Job 0' not in html  # Bandung
+
+
+def test_location_id_link_without_text_uses_id_only(jakarta_jobs):
+    with jakarta_jobs.app_context():
+        location_id = resolve_location_id(db.session, 'jakarta')
+    html = jakarta_jobs.test_client().get(f'/?location_id={location_id}').get_data(as_text=True)
+
+    assert 'Mapped Job' in html
+    assert 'Unmapped Job' not in html
+
+
+def test_snapshot_falls_back_to_sql_for_unmapped_locations(jakarta_jobs):
+    jakarta_jobs.config['JOB_SNAPSHOT_ENABLED'] = True
+    snapshot = init_snapshot(jakarta_jobs)
+    with jakarta_jobs.app_context():
+        snapshot.full_refresh(db.session)
+        params = parse_job_search_args(MultiDict({'location': 'jakarta'}))
+        params['location_id'] = resolve_location_id(db.session, 'jakarta')
+
+        assert snapshot.search(params, 1, 9) is None
+
+        params = parse_job_search_args(MultiDict({'location_id': str(params['location_id'])}))
+        page_ids, total, _ = snapshot.search(params, 1, 9)
+        assert total == 1
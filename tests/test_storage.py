@@ -0,0 +1,171 @@
+"""Storage CV: validasi key, layout bersharding dan key lama dari upload sebelum storage.py."""
+import io
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import NotFound
+
+from nemukerja.extensions import db
+from nemukerja.models import Applicant
+from nemukerja.storage import LocalStorage, S3Storage, is_valid_key, new_cv_key, sharded_key
+
+PASSWORD = 'secret'
+LEGACY_KEY = '0123456789abcdef0123456789abcdef.PDF'
+
+
+def _upload(data=b'%PDF-1.4 test', filename='cv.pdf'):
+    return FileStorage(stream=io.BytesIO(data), filename=filename, content_type='application/pdf')
+
+
+@pytest.mark.parametrize('key, valid', [
+    ('ab/cd/abcd456789abcdef0123456789abcdef.pdf', True),
+    ('0123456789abcdef0123456789abcdef.pdf', True),
+    (LEGACY_KEY, True),
+    ('../0123456789abcdef0123456789abcdef.pdf', False),
+    ('ab/cd/../../etc/passwd', False),
+    ('AB/CD/0123456789abcdef0123456789abcdef.pdf', False),
+    ('0123456789abcdef0123456789abcdef', False),
+    ('', False),
+    (None, False),
+])
+def test_is_valid_key(key, valid):
+    assert is_valid_key(key) is valid
+
+
+def test_new_key_is_sharded_by_uuid_prefix():
+    key = new_cv_key('My CV.PDF')
+    shard1, shard2, name = key.split('/')
+    assert name.startswith(shard1 + shard2)
+    assert name.endswith('.pdf')
+    assert is_valid_key(key)
+
+
+def test_sharded_key_keeps_legacy_file_name():
+    assert sharded_key(LEGACY_KEY) == f'01/23/{LEGACY_KEY}'
+    assert sharded_key('01/23/' + LEGACY_KEY) == '01/23/' + LEGACY_KEY
+
+
+def test_local_storage_shards_files(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    key = storage.save(_upload())
+
+    assert (tmp_path / key).is_file()
+    assert storage.read(key) == b'%PDF-1.4 test'
+    storage.delete(key)
+    assert not storage.exists(key)
+    with pytest.raises(ValueError):
+        storage.path('../escape.pdf')
+
+
+def test_view_cv_serves_legacy_uppercase_extension(app, tmp_path):
+    (tmp_path / 'cv').mkdir(exist_ok=True)
+    (tmp_path / 'cv' / LEGACY_KEY).write_bytes(b'%PDF-1.4 legacy')
+    client = app.test_client()
+    client.post('/login', data={'email': 'company@example.com', 'password': PASSWORD})
+
+    response = client.get(f'/cv/{LEGACY_KEY}')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+    assert response.get_data() == b'%PDF-1.4 legacy'
+
+
+# --- S3 (moto sebagai pengganti S3/MinIO) --------------------------------------
+
+BUCKET = 'nemukerja-cv'
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    moto = pytest.importorskip('moto')
+    boto3 = pytest.importorskip('boto3')
+    for name, value in (('AWS_ACCESS_KEY_ID', 'testing'), ('AWS_SECRET_ACCESS_KEY', 'testing'),
+                        ('AWS_SESSION_TOKEN', 'testing'), ('AWS_DEFAULT_REGION', 'us-east-1')):
+        monkeypatch.setenv(name, value)
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def test_s3_save_read_delete(s3):
+    storage = S3Storage(BUCKET, prefix='cv/', region='us-east-1')
+    key = storage.save(_upload())
+
+    head = s3.head_object(Bucket=BUCKET, Key=f'cv/{key}')
+    assert head['ContentType'] == 'application/pdf'
+    assert storage.exists(key)
+    assert storage.read(key) == b'%PDF-1.4 test'
+
+    storage.delete(key)
+    assert not storage.exists(key)
+    with pytest.raises(FileNotFoundError):
+        storage.read(key)
+    with pytest.raises(ValueError):
+        storage.object_key('../escape.pdf')
+
+
+def test_s3_large_upload_uses_multipart(s3):
+    chunk = 5 * 1024 * 1024
+    storage = S3Storage(BUCKET, region='us-east-1', chunk_size=chunk)
+    data = b'%PDF-1.4 ' + b'x' * (chunk + 1024)
+    key = storage.save(_upload(data))
+
+    # ETag objek multipart berakhiran -<jumlah part>
+    assert s3.head_object(Bucket=BUCKET, Key=key)['ETag'].strip('"').endswith('-2')
+    assert storage.read(key) == data
+
+
+def test_s3_response_redirects_to_presigned_url(s3):
+    storage = S3Storage(BUCKET, prefix='cv/', region='us-east-1', presign_seconds=120)
+    key = '01/23/' + LEGACY_KEY
+    storage.put(key, io.BytesIO(b'%PDF-1.4 test'))
+
+    response = storage.response(key, download=True)
+    url = urlsplit(response.headers['Location'])
+    query = parse_qs(url.query)
+    assert response.status_code == 302
+    assert response.headers['Cache-Control'] == 'private, no-store'
+    assert url.path == f'/cv/{key}'
+    assert 0 < int(query['Expires'][0]) - time.time() <= 120
+    assert query['response-content-type'] == ['application/pdf']
+    assert query['response-content-disposition'] == ['attachment; filename="CV_Applicant.pdf"']
+    assert query['Signature']
+
+    with pytest.raises(NotFound):
+        storage.response('../escape.pdf')
+
+
+def test_view_cv_with_s3_backend(s3, make_app):
+    app = make_app(CV_STORAGE_BACKEND='s3', CV_S3_BUCKET=BUCKET, CV_S3_REGION='us-east-1')
+    key = app.extensions['cv_storage'].save(_upload())
+    client = app.test_client()
+    client.post('/login', data={'email': 'company@example.com', 'password': PASSWORD})
+
+    response = client.get(f'/cv/{key}')
+    assert response.status_code == 302
+    assert key in response.headers['Location']
+
+
+@pytest.mark.parametrize('backend', ['s3', 'local'])
+def test_cv_storage_migrate(s3, make_app, tmp_path, monkeypatch, backend):
+    legacy_root = tmp_path / 'legacy'
+    legacy_root.mkdir()
+    (legacy_root / LEGACY_KEY).write_bytes(b'%PDF-1.4 legacy')
+    monkeypatch.setattr('nemukerja.storage.legacy_cv_root', lambda app: str(legacy_root))
+    app = make_app(CV_STORAGE_BACKEND=backend, CV_S3_BUCKET=BUCKET, CV_S3_REGION='us-east-1')
+    with app.app_context():
+        applicant = db.session.scalars(db.select(Applicant)).first()
+        applicant.cv_path = LEGACY_KEY
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['cv-storage-migrate'])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith('1 CV dipindahkan')
+
+    new_key = f'01/23/{LEGACY_KEY}'
+    with app.app_context():
+        assert db.session.scalars(db.select(Applicant.cv_path)).first() == new_key
+        assert app.extensions['cv_storage'].read(new_key) == b'%PDF-1.4 legacy'
+    assert not (legacy_root / LEGACY_KEY).exists()
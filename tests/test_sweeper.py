@@ -0,0 +1,39 @@
+"""Sweeper: lowongan yang ditutup langsung hilang dari cache worker web."""
+from datetime import datetime, timedelta
+
+from nemukerja.extensions import db
+from nemukerja.funnel import FUNNEL_TAG
+from nemukerja.models import JobListing
+from nemukerja.sweeper import run_sweep
+
+
+def test_sweep_bumps_shared_tags_for_closed_jobs(make_app):
+    web = make_app()
+    cli = make_app()
+    client = web.test_client()
+    assert 'Job 1' in client.get('/').get_data(as_text=True)
+
+    with cli.app_context():
+        job = db.session.scalar(db.select(JobListing).where(JobListing.title == 'Job 1'))
+        job.expires_at = datetime.now() - timedelta(days=1)
+        db.session.commit()
+        company_tag = FUNNEL_TAG.format(job.id_company)
+        before = dict(web.extensions['query_cache'].tag_versions({'job_listings', company_tag}))
+
+        assert run_sweep(db.session) == {'expired': 1, 'full': 0}
+
+    after = dict(web.extensions['query_cache'].tag_versions({'job_listings', company_tag}))
+    assert after['job_listings'] > before['job_listings']
+    assert after[company_tag] > before[company_tag]
+    assert 'Job 1' not in client.get('/').get_data(as_text=True)
+
+
+def test_sweep_without_closures_leaves_tags_alone(make_app):
+    app = make_app()
+    query_cache = app.extensions['query_cache']
+    before = query_cache.tag_versions({'job_listings'})
+
+    with app.app_context():
+        assert run_sweep(db.session) == {'expired': 0, 'full': 0}
+
+    assert query_cache.tag_versions({'job_listings'}) == before